@@ -0,0 +1 @@
+"""Offline performance benchmarks for Pydantic Graph Studio."""
@@ -0,0 +1,113 @@
+"""Timing helpers and JSON reporting shared by the benchmark suites."""
+
+from __future__ import annotations
+
+import gc
+import json
+import platform
+import statistics
+import sys
+import time
+from collections.abc import Callable
+from dataclasses import asdict, dataclass, field
+from datetime import UTC, datetime
+from importlib import metadata
+from pathlib import Path
+from typing import Any
+
+
+class SuiteUnavailable(RuntimeError):
+    """Raised by a suite whose external prerequisites are missing from this machine."""
+
+
+@dataclass(slots=True)
+class BenchmarkConfig:
+    """Warmup and repetition settings applied to every measurement."""
+
+    warmup: int = 2
+    repeat: int = 7
+    quick: bool = False
+
+
+@dataclass(slots=True)
+class BenchmarkResult:
+    """Timing samples and derived statistics for a single benchmark case."""
+
+    suite: str
+    name: str
+    params: dict[str, Any]
+    samples: list[float]
+    unit: str = "s"
+    extra: dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def min(self) -> float:
+        return min(self.samples)
+
+    @property
+    def median(self) -> float:
+        return statistics.median(self.samples)
+
+    def to_dict(self) -> dict[str, Any]:
+        payload = asdict(self)
+        payload.update(
+            min=self.min,
+            median=self.median,
+            mean=statistics.fmean(self.samples),
+            stdev=statistics.stdev(self.samples) if len(self.samples) > 1 else 0.0,
+        )
+        return payload
+
+
+def measure(func: Callable[[], Any], config: BenchmarkConfig) -> list[float]:
+    """Time `func` after warming it up, with the garbage collector paused per sample."""
+
+    for _ in range(config.warmup):
+        func()
+    samples: list[float] = []
+    gc_was_enabled = gc.isenabled()
+    try:
+        for _ in range(config.repeat):
+            gc.collect()
+            gc.disable()
+            started = time.perf_counter()
+            func()
+            samples.append(time.perf_counter() - started)
+            if gc_was_enabled:
+                gc.enable()
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+    return samples
+
+
+def environment() -> dict[str, Any]:
+    """Describe the interpreter and package versions the results were produced with."""
+
+    return {
+        "timestamp": datetime.now(UTC).isoformat(),
+        "python": sys.version.split()[0],
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "pydantic_graph_studio": _version("pydantic-graph-studio"),
+        "pydantic_graph": _version("pydantic-graph"),
+    }
+
+
+def write_results(results: list[BenchmarkResult], path: Path) -> dict[str, Any]:
+    """Write benchmark results as JSON and return the written payload."""
+
+    payload = {
+        "environment": environment(),
+        "results": [result.to_dict() for result in results],
+    }
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(payload, indent=2) + "\n", encoding="utf-8")
+    return payload
+
+
+def _version(distribution: str) -> str | None:
+    try:
+        return metadata.version(distribution)
+    except metadata.PackageNotFoundError:
+        return None
@@ -0,0 +1,46 @@
+"""Run the benchmark suites and write the results as JSON.
+
+Usage: `python -m benchmarks.run [--quick] [--suite NAME ...] [--output PATH]`
+"""
+
+from __future__ import annotations
+
+import argparse
+from pathlib import Path
+
+from .harness import BenchmarkConfig, BenchmarkResult, SuiteUnavailable, write_results
+from .suites import SUITES
+
+DEFAULT_OUTPUT = Path("benchmarks/results.json")
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(prog="benchmarks.run", description="Run the studio benchmark suites.")
+    parser.add_argument("--suite", action="append", choices=sorted(SUITES), help="Suite to run (repeatable)")
+    parser.add_argument("--output", type=Path, default=DEFAULT_OUTPUT, help="JSON results path")
+    parser.add_argument("--warmup", type=int, default=2, help="Warmup iterations per case (default: 2)")
+    parser.add_argument("--repeat", type=int, default=7, help="Timed iterations per case (default: 7)")
+    parser.add_argument("--quick", action="store_true", help="Use small graph sizes for a fast smoke run")
+    args = parser.parse_args(argv)
+
+    config = BenchmarkConfig(warmup=args.warmup, repeat=args.repeat, quick=args.quick)
+    results: list[BenchmarkResult] = []
+    for name in args.suite or list(SUITES):
+        try:
+            suite_results = SUITES[name](config)
+        except SuiteUnavailable as exc:
+            print(f"{name:<16} skipped: {exc}")
+            continue
+        for result in suite_results:
+            print(f"{result.suite:<16} {result.name:<26} {_format_params(result.params):<40} {result.median:.6f}s")
+        results.extend(suite_results)
+    write_results(results, args.output)
+    print(f"Wrote {len(results)} results to {args.output}")
+
+
+def _format_params(params: dict[str, object]) -> str:
+    return " ".join(f"{key}={value}" for key, value in params.items())
+
+
+if __name__ == "__main__":
+    main()
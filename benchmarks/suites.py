@@ -0,0 +1,401 @@
+"""Benchmark suites for introspection, instrumentation, event streaming, traces, compression, the server and the UI."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import shutil
+import subprocess
+import tempfile
+import time
+import tracemalloc
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any
+
+from pydantic_graph_studio.compression import StreamCompressor
+from pydantic_graph_studio.examples import streaming_events
+from pydantic_graph_studio.examples.synthetic import build_synthetic_graph
+from pydantic_graph_studio.introspection import build_graph_model, serialize_graph, serialize_graph_json
+from pydantic_graph_studio.runtime import RunHooks, iter_instrumented, iter_run_events
+from pydantic_graph_studio.schemas import Event
+from pydantic_graph_studio.trace import RunTrace
+
+from .harness import BenchmarkConfig, BenchmarkResult, SuiteUnavailable, measure
+
+GRAPH_SIZES = (10, 100, 1000, 10000)
+QUICK_GRAPH_SIZES = (10, 100)
+LOOP_ITERATIONS = 2000
+QUICK_LOOP_ITERATIONS = 100
+UI_GRAPH_SIZE = 2000
+QUICK_UI_GRAPH_SIZE = 200
+UI_EVENTS_PER_FRAME = 256
+UI_REPLAY_SCRIPT = Path(__file__).with_name("ui_replay.js")
+STREAMING_TICKS = 2000
+QUICK_STREAMING_TICKS = 200
+COMPRESSION_LEVELS = (1, 6, 9)
+COMPRESSION_FLUSH_EVERY = (1, 32)
+
+
+def bench_introspection(config: BenchmarkConfig) -> list[BenchmarkResult]:
+    """Time graph model building and serialization on synthetic chains and broadcasts."""
+
+    results: list[BenchmarkResult] = []
+    sizes = QUICK_GRAPH_SIZES if config.quick else GRAPH_SIZES
+    for beta in (False, True):
+        for shape in ("chain", "broadcast"):
+            for size in sizes:
+                graph = build_synthetic_graph(shape, size, beta=beta)
+                params = {"shape": shape, "size": size, "beta": beta}
+                node_count = len(build_graph_model(graph).nodes)
+                cases = (
+                    ("build_graph_model", build_graph_model),
+                    ("serialize_graph", serialize_graph),
+                    ("serialize_graph_json_cached", serialize_graph_json),
+                    ("compute_layout", lambda graph: build_graph_model(graph, layout=True)),
+                )
+                for name, func in cases:
+                    samples = measure(lambda func=func, graph=graph: func(graph), config)
+                    results.append(
+                        BenchmarkResult(
+                            suite="introspection",
+                            name=name,
+                            params=params,
+                            samples=samples,
+                            extra={"nodes": node_count},
+                        )
+                    )
+    return results
+
+
+def bench_instrumentation(config: BenchmarkConfig) -> list[BenchmarkResult]:
+    """Compare a bare `graph.iter` loop with the same loop under `instrument_graph_run`."""
+
+    iterations = QUICK_LOOP_ITERATIONS if config.quick else LOOP_ITERATIONS
+    graph = build_synthetic_graph("loop", iterations)
+    start_node = _v1_start_node(graph)
+    steps = iterations + 2
+    hooks = RunHooks(
+        on_node_start=_noop,
+        on_node_end=_noop,
+        on_edge_taken=_noop,
+        on_run_end=_noop,
+        on_error=_noop,
+    )
+
+    async def bare() -> None:
+        async with graph.iter(start_node, infer_name=True) as graph_run:
+            async for _node in graph_run:
+                pass
+
+    async def instrumented() -> None:
+        async with iter_instrumented(graph, start_node, hooks=hooks) as graph_run:
+            async for _node in graph_run:
+                pass
+
+    params = {"shape": "loop", "iterations": iterations, "steps": steps}
+    bare_samples = _measure_async(bare, config)
+    instrumented_samples = _measure_async(instrumented, config)
+    overhead = (min(instrumented_samples) - min(bare_samples)) / steps
+    return [
+        BenchmarkResult(suite="instrumentation", name="graph_iter_bare", params=params, samples=bare_samples),
+        BenchmarkResult(
+            suite="instrumentation",
+            name="graph_iter_instrumented",
+            params=params,
+            samples=instrumented_samples,
+            extra={"per_step_overhead_s": overhead},
+        ),
+    ]
+
+
+def bench_event_stream(config: BenchmarkConfig) -> list[BenchmarkResult]:
+    """Measure `iter_run_events` throughput in events per second."""
+
+    iterations = QUICK_LOOP_ITERATIONS if config.quick else LOOP_ITERATIONS
+    results: list[BenchmarkResult] = []
+    for beta in (False, True):
+        graph = build_synthetic_graph("loop", iterations, beta=beta)
+        start_node = None if beta else _v1_start_node(graph)
+        counter = {"events": 0}
+
+        async def consume(graph: Any = graph, start_node: Any = start_node, counter: dict[str, int] = counter) -> None:
+            count = 0
+            async for _event in iter_run_events(graph, start_node):
+                count += 1
+            counter["events"] = count
+
+        samples = _measure_async(consume, config)
+        events = counter["events"]
+        results.append(
+            BenchmarkResult(
+                suite="event_stream",
+                name="iter_run_events",
+                params={"shape": "loop", "iterations": iterations, "beta": beta},
+                samples=samples,
+                extra={"events": events, "events_per_s": events / min(samples)},
+            )
+        )
+    return results
+
+
+def bench_trace(config: BenchmarkConfig) -> list[BenchmarkResult]:
+    """Compare keeping a recorded loop run as a `RunTrace` with keeping the list of event models."""
+
+    from pydantic import TypeAdapter
+
+    iterations = QUICK_LOOP_ITERATIONS if config.quick else LOOP_ITERATIONS
+    graph = build_synthetic_graph("loop", iterations)
+    start_node = _v1_start_node(graph)
+
+    async def record() -> list[Event]:
+        return [event async for event in iter_run_events(graph, start_node)]
+
+    events = asyncio.run(record())
+    run_id = events[0].run_id
+    adapter: TypeAdapter[Event] = TypeAdapter(Event)
+    dumped = [event.model_dump() for event in events]
+
+    def build_models() -> list[Event]:
+        return [adapter.validate_python(payload) for payload in dumped]
+
+    def build_trace() -> RunTrace:
+        trace = RunTrace(run_id)
+        for event in events:
+            trace.append(event)
+        return trace
+
+    trace = build_trace()
+    params = {"shape": "loop", "iterations": iterations}
+    return [
+        BenchmarkResult(
+            suite="trace",
+            name=name,
+            params=params,
+            samples=measure(func, config),
+            extra={"events": len(events), "bytes_per_event": retained / len(events)},
+        )
+        for name, func, retained in (
+            ("event_models_build", build_models, _retained_bytes(build_models)),
+            ("run_trace_append", build_trace, _retained_bytes(build_trace)),
+            ("run_trace_iterate", lambda: sum(1 for _ in trace), trace.nbytes),
+        )
+    ]
+
+
+def bench_compression(config: BenchmarkConfig) -> list[BenchmarkResult]:
+    """Compare bytes on the wire and compressor CPU time for the SSE stream of the streaming example.
+
+    The run is recorded once (without its chunk delay) and its frames are pushed through the same
+    `StreamCompressor` the server uses, sync-flushing after every event or after every 32 events.
+    """
+
+    from pydantic_graph_studio.server import _sse_frame
+
+    ticks = QUICK_STREAMING_TICKS if config.quick else STREAMING_TICKS
+    with _streaming_example(ticks):
+
+        async def record() -> list[Event]:
+            return [event async for event in iter_run_events(streaming_events.graph, streaming_events.Start())]
+
+        events = asyncio.run(record())
+    frames = [_sse_frame(seq, event) for seq, event in enumerate(events, start=1)]
+    raw_bytes = sum(len(frame) for frame in frames)
+
+    results: list[BenchmarkResult] = []
+    for level in COMPRESSION_LEVELS:
+        for flush_every in COMPRESSION_FLUSH_EVERY:
+            wire = {"bytes": 0, "cpu_s": 0.0}
+
+            def stream_once(level: int = level, flush_every: int = flush_every, wire: dict[str, Any] = wire) -> None:
+                compressor = StreamCompressor("gzip", level)
+                sent = 0
+                started = time.process_time()
+                for index, frame in enumerate(frames, start=1):
+                    sent += len(compressor.compress(frame))
+                    if index % flush_every == 0:
+                        sent += len(compressor.flush())
+                sent += len(compressor.finish())
+                wire["cpu_s"] = time.process_time() - started
+                wire["bytes"] = sent
+
+            samples = measure(stream_once, config)
+            best = min(samples)
+            results.append(
+                BenchmarkResult(
+                    suite="compression",
+                    name=f"gzip_level_{level}",
+                    params={"example": "streaming_events", "ticks": ticks, "flush_every": flush_every},
+                    samples=samples,
+                    extra={
+                        "events": len(frames),
+                        "raw_bytes": raw_bytes,
+                        "wire_bytes": wire["bytes"],
+                        "ratio": raw_bytes / wire["bytes"],
+                        "cpu_s": wire["cpu_s"],
+                        "raw_bytes_per_cpu_s": raw_bytes / max(wire["cpu_s"], 1e-9),
+                        "raw_bytes_per_s": raw_bytes / best,
+                    },
+                )
+            )
+    return results
+
+
+def bench_server(config: BenchmarkConfig) -> list[BenchmarkResult]:
+    """Measure `/api/run` plus `/api/events` end to end through the ASGI app."""
+
+    from fastapi.testclient import TestClient
+
+    from pydantic_graph_studio.server import create_app
+
+    iterations = QUICK_LOOP_ITERATIONS if config.quick else LOOP_ITERATIONS
+    graph = build_synthetic_graph("loop", iterations)
+    app = create_app(graph, _v1_start_node(graph))
+    counter = {"events": 0, "bytes": 0}
+
+    with TestClient(app) as client:
+
+        def run_once() -> None:
+            run_id = client.post("/api/run").json()["run_id"]
+            events = 0
+            received = 0
+            with client.stream("GET", f"/api/events?run_id={run_id}") as response:
+                for line in response.iter_lines():
+                    received += len(line) + 1
+                    if line.startswith("data: "):
+                        events += 1
+            counter["events"] = events
+            counter["bytes"] = received
+
+        samples = measure(run_once, config)
+
+    best = min(samples)
+    return [
+        BenchmarkResult(
+            suite="server",
+            name="run_and_stream",
+            params={"shape": "loop", "iterations": iterations},
+            samples=samples,
+            extra={
+                "events": counter["events"],
+                "bytes": counter["bytes"],
+                "events_per_s": counter["events"] / best,
+                "bytes_per_s": counter["bytes"] / best,
+            },
+        )
+    ]
+
+
+def bench_ui(config: BenchmarkConfig) -> list[BenchmarkResult]:
+    """Replay a recorded run of a 2k-node chain through the UI event reducer under Node.js.
+
+    Events are applied in frame-sized batches through the indexed run state and, for comparison,
+    one by one with the per-event `map`/`findIndex` updates the UI used before.
+    """
+
+    node = shutil.which("node")
+    if node is None:
+        raise SuiteUnavailable("the ui suite needs Node.js on PATH")
+
+    size = QUICK_UI_GRAPH_SIZE if config.quick else UI_GRAPH_SIZE
+    graph = build_synthetic_graph("chain", size)
+    model = build_graph_model(graph)
+    start_node = _v1_start_node(graph)
+
+    async def record() -> list[dict[str, Any]]:
+        return [event.model_dump(mode="json") async for event in iter_run_events(graph, start_node)]
+
+    events = asyncio.run(record())
+    replay_input = {
+        "nodes": [node.node_id for node in model.nodes],
+        "edges": [[edge.source_node_id, edge.target_node_id] for edge in model.edges],
+        "events": events,
+        "events_per_frame": UI_EVENTS_PER_FRAME,
+        "warmup": config.warmup,
+        "repeat": config.repeat,
+    }
+    with tempfile.TemporaryDirectory() as tmp:
+        input_path = Path(tmp) / "replay.json"
+        input_path.write_text(json.dumps(replay_input), encoding="utf-8")
+        completed = subprocess.run(
+            [node, str(UI_REPLAY_SCRIPT), str(input_path)],
+            check=True,
+            capture_output=True,
+            text=True,
+        )
+    timings = json.loads(completed.stdout)
+    indexed, naive = timings["indexed"], timings["naive"]
+    if (indexed["done_nodes"], indexed["animated_edges"]) != (naive["done_nodes"], naive["animated_edges"]):
+        raise RuntimeError("Indexed UI replay diverged from the per-event reference")
+
+    params = {"shape": "chain", "size": size, "events_per_frame": UI_EVENTS_PER_FRAME}
+    return [
+        BenchmarkResult(
+            suite="ui",
+            name=f"apply_events_{name}",
+            params=params,
+            samples=result["samples"],
+            extra={
+                "events": len(events),
+                "frames": result["frames"],
+                "done_nodes": result["done_nodes"],
+                "events_per_s": len(events) / min(result["samples"]),
+            },
+        )
+        for name, result in (("indexed", indexed), ("naive", naive))
+    ]
+
+
+SUITES: dict[str, Callable[[BenchmarkConfig], list[BenchmarkResult]]] = {
+    "introspection": bench_introspection,
+    "instrumentation": bench_instrumentation,
+    "event_stream": bench_event_stream,
+    "trace": bench_trace,
+    "compression": bench_compression,
+    "server": bench_server,
+    "ui": bench_ui,
+}
+
+
+def _measure_async(factory: Callable[[], Any], config: BenchmarkConfig) -> list[float]:
+    loop = asyncio.new_event_loop()
+    try:
+        return measure(lambda: loop.run_until_complete(factory()), config)
+    finally:
+        loop.close()
+
+
+def _retained_bytes(factory: Callable[[], Any]) -> int:
+    """Return the memory still allocated by `factory()`'s result once it returns."""
+
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        result = factory()
+        retained = tracemalloc.get_traced_memory()[0] - before
+    finally:
+        tracemalloc.stop()
+    del result
+    return retained
+
+
+@contextmanager
+def _streaming_example(ticks: int) -> Iterator[None]:
+    """Run the streaming example for `ticks` ticks without its per-chunk delay."""
+
+    saved = streaming_events.MAX_TICKS, streaming_events.CHUNK_DELAY_SECONDS
+    streaming_events.MAX_TICKS, streaming_events.CHUNK_DELAY_SECONDS = ticks, 0.0
+    try:
+        yield
+    finally:
+        streaming_events.MAX_TICKS, streaming_events.CHUNK_DELAY_SECONDS = saved
+
+
+def _v1_start_node(graph: Any) -> Any:
+    entry_nodes = build_graph_model(graph).entry_nodes
+    return graph.node_defs[entry_nodes[0]].node()
+
+
+def _noop(*_args: Any) -> None:
+    return None
@@ -0,0 +1,32 @@
+"""Pytest entrypoint: `pytest benchmarks` runs every suite in quick mode and writes JSON results."""
+
+from __future__ import annotations
+
+import json
+import os
+from pathlib import Path
+
+import pytest
+
+from .harness import BenchmarkConfig, SuiteUnavailable, write_results
+from .suites import SUITES
+
+
+@pytest.mark.parametrize("suite", sorted(SUITES))
+def test_benchmark_suite(suite: str, tmp_path: Path) -> None:
+    quick = os.getenv("PGRAPH_BENCH_FULL") is None
+    config = BenchmarkConfig(warmup=1, repeat=3, quick=quick) if quick else BenchmarkConfig()
+    try:
+        results = SUITES[suite](config)
+    except SuiteUnavailable as exc:
+        pytest.skip(str(exc))
+    assert results
+
+    output_dir = Path(os.getenv("PGRAPH_BENCH_OUTPUT", tmp_path))
+    payload = write_results(results, output_dir / f"{suite}.json")
+    written = json.loads((output_dir / f"{suite}.json").read_text(encoding="utf-8"))
+    assert written["results"] == payload["results"]
+    for result in written["results"]:
+        assert result["suite"] == suite
+        assert len(result["samples"]) == config.repeat
+        assert result["min"] <= result["median"]
@@ -0,0 +1,103 @@
+// Replay a recorded event stream against the studio's run-state reducer, frame by frame, and against
+// the previous per-event `map`/`findIndex` updates. Driven by `bench_ui` in `suites.py`:
+//
+//   node benchmarks/ui_replay.js input.json
+//
+// `input.json` holds `{nodes, edges, events, events_per_frame, warmup, repeat}`; timings (seconds) are
+// printed as JSON on stdout.
+const fs = require("fs");
+const path = require("path");
+
+const RunState = require(path.join(__dirname, "..", "src", "pydantic_graph_studio", "ui", "assets", "run-state.js"));
+
+const activeStyle = { stroke: "#0ea5e9", strokeWidth: 3.2 };
+
+function flowElements(input) {
+  const nodes = input.nodes.map((nodeId) => ({ id: nodeId, data: { id: nodeId, status: "idle" } }));
+  const edges = input.edges.map(([source, target], index) => ({
+    id: `e-${source}-${target}-${index}`,
+    source,
+    target: target || `dynamic-${source}`,
+    animated: false,
+    style: {},
+    data: { dynamic: !target },
+  }));
+  return { nodes, edges };
+}
+
+function replayIndexed(input) {
+  let { nodes, edges } = flowElements(input);
+  const nodeIndex = RunState.indexNodes(nodes);
+  const edgeIndex = RunState.indexEdges(edges);
+  const state = RunState.createRunState();
+  let tools = RunState.emptyToolActivity();
+  let frames = 0;
+  for (let start = 0; start < input.events.length; start += input.events_per_frame) {
+    const batch = input.events.slice(start, start + input.events_per_frame);
+    batch.forEach((payload) => RunState.reduceEvent(state, payload));
+    const diff = RunState.takeDiff(state);
+    if (diff.nodes.length) nodes = RunState.patchNodes(nodes, nodeIndex, new Map(diff.nodes));
+    if (diff.edges.length) {
+      const keys = diff.edges.map(([source, target]) => RunState.edgeKey(source, target));
+      edges = RunState.patchEdges(edges, edgeIndex, keys, activeStyle);
+    }
+    tools = RunState.patchTools(tools, diff.tools, state.toolLimit);
+    frames += 1;
+  }
+  return { frames, nodes, edges, tools: tools.total };
+}
+
+function replayNaive(input) {
+  let { nodes, edges } = flowElements(input);
+  let tools = [];
+  input.events.forEach((payload) => {
+    switch (payload.event_type) {
+      case "node_start":
+      case "node_end": {
+        const status = payload.event_type === "node_start" ? "active" : "done";
+        nodes = nodes.map((node) => (node.id === payload.node_id ? { ...node, data: { ...node.data, status } } : node));
+        break;
+      }
+      case "edge_taken":
+        edges = edges.map((edge) => {
+          if (edge.source !== payload.source_node_id) return edge;
+          if (payload.target_node_id && edge.target !== payload.target_node_id) return edge;
+          if (!payload.target_node_id && !edge.data.dynamic) return edge;
+          return { ...edge, animated: true, style: { ...edge.style, ...activeStyle } };
+        });
+        break;
+      case "tool_call":
+      case "tool_result": {
+        const existing = tools.findIndex((item) => item.callId === payload.call_id);
+        const entry = { callId: payload.call_id, toolName: payload.tool_name };
+        if (existing >= 0) {
+          tools = [...tools];
+          tools[existing] = { ...tools[existing], ...entry };
+        } else {
+          tools = [entry, ...tools];
+        }
+        break;
+      }
+      default:
+        break;
+    }
+  });
+  return { frames: input.events.length, nodes, edges, tools: tools.length };
+}
+
+function time(replay, input) {
+  for (let index = 0; index < input.warmup; index += 1) replay(input);
+  const samples = [];
+  let result = null;
+  for (let index = 0; index < input.repeat; index += 1) {
+    const started = process.hrtime.bigint();
+    result = replay(input);
+    samples.push(Number(process.hrtime.bigint() - started) / 1e9);
+  }
+  const done = result.nodes.filter((node) => node.data.status === "done").length;
+  const animated = result.edges.filter((edge) => edge.animated).length;
+  return { samples, frames: result.frames, done_nodes: done, animated_edges: animated, tools: result.tools };
+}
+
+const input = JSON.parse(fs.readFileSync(process.argv[2], "utf8"));
+process.stdout.write(JSON.stringify({ indexed: time(replayIndexed, input), naive: time(replayNaive, input) }));
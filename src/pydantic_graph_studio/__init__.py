@@ -1,7 +1,24 @@
 """Pydantic Graph Studio entrypoint."""
 
+from pydantic_graph_studio.activity import ToolActivityLog
+from pydantic_graph_studio.admission import AdmissionPolicy, AdmissionRejected
+from pydantic_graph_studio.batch import RunBatch
+from pydantic_graph_studio.blobs import BlobStore
 from pydantic_graph_studio.cli import main
-from pydantic_graph_studio.introspection import build_graph_model, serialize_graph
+from pydantic_graph_studio.clusters import ClusterHierarchy
+from pydantic_graph_studio.compression import StreamCompression
+from pydantic_graph_studio.factories import ResourcePool, RunFactories
+from pydantic_graph_studio.history import RunHistoryStore, RunQuery
+from pydantic_graph_studio.introspection import (
+    SerializedGraph,
+    build_cluster_hierarchy,
+    build_graph_model,
+    serialize_graph,
+    serialize_graph_json,
+    serialize_graph_view_json,
+)
+from pydantic_graph_studio.layout import compute_layout
+from pydantic_graph_studio.retention import RetentionPolicy
 from pydantic_graph_studio.runtime import (
     InteractionHub,
     RunHooks,
@@ -12,18 +29,36 @@ from pydantic_graph_studio.runtime import (
     run_instrumented_sync,
 )
 from pydantic_graph_studio.schemas import (
+    AdmissionMetrics,
+    BatchProgress,
+    BatchRunSummary,
+    BlobRef,
     EdgeTakenEvent,
     ErrorEvent,
     Event,
     EventBase,
+    GraphCluster,
     GraphEdge,
+    GraphLayout,
     GraphModel,
     GraphNode,
+    GraphView,
     InputRequestEvent,
     InputResponseEvent,
     NodeEndEvent,
+    NodeLayout,
     NodeStartEvent,
+    RunAdmittedEvent,
+    RunCancelledEvent,
     RunEndEvent,
+    RunHistoryPage,
+    RunProgress,
+    RunQueuedEvent,
+    RunSnapshot,
+    RunSummary,
+    ServerMetrics,
+    ToolActivity,
+    ToolActivityPage,
     ToolCallEvent,
     ToolResultEvent,
     event_schema,
@@ -31,24 +66,61 @@ from pydantic_graph_studio.schemas import (
     graph_schema,
 )
 from pydantic_graph_studio.server import RunRegistry, create_app
+from pydantic_graph_studio.snapshot import RunReducer
+from pydantic_graph_studio.trace import RunTrace, TraceColumns
+from pydantic_graph_studio.wire import CompactDecoder, CompactEncoder, WireEncoder, decode_records
 
 __all__ = [
+    "AdmissionMetrics",
+    "AdmissionPolicy",
+    "AdmissionRejected",
+    "BatchProgress",
+    "BatchRunSummary",
+    "BlobRef",
+    "BlobStore",
+    "ClusterHierarchy",
+    "CompactDecoder",
+    "CompactEncoder",
     "EdgeTakenEvent",
     "ErrorEvent",
     "Event",
     "EventBase",
+    "GraphCluster",
     "GraphEdge",
+    "GraphLayout",
     "GraphModel",
     "GraphNode",
+    "GraphView",
     "InputRequestEvent",
     "InputResponseEvent",
     "InteractionHub",
     "NodeEndEvent",
+    "NodeLayout",
     "NodeStartEvent",
+    "ResourcePool",
+    "RetentionPolicy",
+    "RunAdmittedEvent",
+    "RunBatch",
+    "RunCancelledEvent",
     "RunEndEvent",
+    "RunFactories",
+    "RunHistoryPage",
+    "RunHistoryStore",
     "RunHooks",
+    "RunProgress",
+    "RunQuery",
+    "RunQueuedEvent",
+    "RunReducer",
     "RunRegistry",
+    "RunSnapshot",
+    "RunSummary",
+    "RunTrace",
+    "SerializedGraph",
+    "ServerMetrics",
+    "StreamCompression",
+    "build_cluster_hierarchy",
     "build_graph_model",
+    "compute_layout",
     "create_app",
     "event_schema",
     "export_schemas",
@@ -60,6 +132,14 @@ __all__ = [
     "run_instrumented",
     "run_instrumented_sync",
     "serialize_graph",
+    "serialize_graph_json",
+    "serialize_graph_view_json",
+    "ToolActivity",
+    "ToolActivityLog",
+    "ToolActivityPage",
     "ToolCallEvent",
     "ToolResultEvent",
+    "TraceColumns",
+    "WireEncoder",
+    "decode_records",
 ]
@@ -0,0 +1,60 @@
+"""Per-run tool activity kept on the server so clients can page through it on demand."""
+
+from __future__ import annotations
+
+import sys
+from dataclasses import dataclass, field
+from typing import Any
+
+from pydantic_core import to_json
+
+from pydantic_graph_studio.schemas import Event, ToolActivity, ToolCallEvent, ToolResultEvent
+
+
+@dataclass(slots=True)
+class ToolActivityLog:
+    """Tool calls of a single run in call order, updated in place as results arrive.
+
+    `nbytes` approximates the memory held by the entries, counting arguments and outputs by the size
+    of their JSON.
+    """
+
+    entries: list[ToolActivity] = field(default_factory=list)
+    nbytes: int = 0
+    _by_call_id: dict[str, int] = field(default_factory=dict)
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def apply(self, event: Event) -> None:
+        """Record a `tool_call` or `tool_result` event; other events are ignored."""
+
+        if not isinstance(event, ToolCallEvent | ToolResultEvent):
+            return
+        index = self._by_call_id.get(event.call_id)
+        if index is None:
+            index = len(self.entries)
+            self._by_call_id[event.call_id] = index
+            entry = ToolActivity(index=index, call_id=event.call_id, node_id=event.node_id, tool_name=event.tool_name)
+            self.entries.append(entry)
+            self.nbytes += sys.getsizeof(entry) + sum(map(sys.getsizeof, (event.call_id, event.tool_name)))
+        entry = self.entries[index]
+        if isinstance(event, ToolCallEvent):
+            self.nbytes += _payload_size(event.arguments) - _payload_size(entry.arguments)
+            entry.arguments = event.arguments
+        else:
+            self.nbytes += _payload_size(event.output) - _payload_size(entry.output)
+            entry.output = event.output
+            entry.success = event.success
+            entry.completed = True
+
+    def page(self, offset: int, limit: int) -> list[ToolActivity]:
+        """Return up to `limit` entries starting at call index `offset`."""
+
+        return self.entries[offset : offset + limit]
+
+
+def _payload_size(value: Any) -> int:
+    if value is None:
+        return 0
+    return len(to_json(value, serialize_unknown=True))
@@ -0,0 +1,169 @@
+"""Admission control for graph runs: a concurrency limit with a bounded, prioritized wait queue."""
+
+from __future__ import annotations
+
+import asyncio
+import math
+import time
+from collections import deque
+from dataclasses import dataclass, field
+
+from pydantic_graph_studio.schemas import AdmissionMetrics
+
+RETRY_AFTER_LIMIT = 600
+_DURATION_SMOOTHING = 0.2
+
+
+@dataclass(frozen=True, slots=True)
+class AdmissionPolicy:
+    """Limits on how many runs execute at once.
+
+    At most `max_running` runs execute concurrently. Further runs wait in one FIFO queue per priority
+    class, listed in `priorities` from highest to lowest; a freed slot always goes to the oldest run
+    of the highest non-empty class. At most `max_queued` runs wait in total, and runs beyond that are
+    rejected. Runs that do not name a priority use `default_priority`.
+    """
+
+    max_running: int
+    max_queued: int = 64
+    priorities: tuple[str, ...] = ("normal",)
+    default_priority: str = "normal"
+
+    def __post_init__(self) -> None:
+        if self.max_running < 1:
+            raise ValueError("max_running must be at least 1")
+        if self.max_queued < 0:
+            raise ValueError("max_queued must not be negative")
+        if not self.priorities or len(set(self.priorities)) != len(self.priorities):
+            raise ValueError("priorities must be a non-empty list of distinct names")
+        if self.default_priority not in self.priorities:
+            raise ValueError(f"Default priority '{self.default_priority}' is not one of the priorities")
+
+
+class AdmissionRejected(Exception):
+    """Raised when the wait queue is full; the run may be retried after `retry_after` seconds."""
+
+    def __init__(self, retry_after: int) -> None:
+        super().__init__(f"Too many queued runs, retry after {retry_after}s")
+        self.retry_after = retry_after
+
+
+@dataclass(slots=True, eq=False)
+class AdmissionTicket:
+    """A run's place in line. `admitted_at` is set (as a monotonic time) once the run may execute."""
+
+    run_id: str
+    priority: str
+    queued_at: float
+    admitted_at: float | None = None
+    released: bool = False
+    ready: asyncio.Event = field(default_factory=asyncio.Event)
+
+    @property
+    def waited(self) -> float:
+        """Seconds spent queued before admission (so far, while still queued)."""
+        end = self.admitted_at if self.admitted_at is not None else time.monotonic()
+        return end - self.queued_at
+
+
+class AdmissionController:
+    """Hands out run slots according to an `AdmissionPolicy` and keeps the admission metrics.
+
+    All methods must be called from the event loop that awaits `wait`.
+    """
+
+    def __init__(self, policy: AdmissionPolicy) -> None:
+        self.policy = policy
+        self._queues: dict[str, deque[AdmissionTicket]] = {priority: deque() for priority in policy.priorities}
+        self._running = 0
+        self._queued = 0
+        self._admitted_total = 0
+        self._queued_total = 0
+        self._rejected_total = 0
+        self._wait_total = 0.0
+        self._wait_max = 0.0
+        self._mean_run_seconds: float | None = None
+
+    def request(self, run_id: str, priority: str | None = None) -> AdmissionTicket:
+        """Claim a slot for a run, or a place in the queue when every slot is taken.
+
+        Raises `ValueError` for an unknown priority and `AdmissionRejected` when the queue is full.
+        """
+        priority = priority or self.policy.default_priority
+        queue = self._queues.get(priority)
+        if queue is None:
+            raise ValueError(f"Unknown priority '{priority}', expected one of: {', '.join(self.policy.priorities)}")
+        ticket = AdmissionTicket(run_id=run_id, priority=priority, queued_at=time.monotonic())
+        if self._running < self.policy.max_running and not self._queued:
+            self._admit(ticket)
+            return ticket
+        if self._queued >= self.policy.max_queued:
+            self._rejected_total += 1
+            raise AdmissionRejected(self.retry_after())
+        queue.append(ticket)
+        self._queued += 1
+        self._queued_total += 1
+        return ticket
+
+    def position(self, ticket: AdmissionTicket) -> int:
+        """Return the ticket's 1-based place in line across all priority classes, or 0 once admitted."""
+        if ticket.admitted_at is not None:
+            return 0
+        ahead = 0
+        for priority, queue in self._queues.items():
+            if priority == ticket.priority:
+                return ahead + queue.index(ticket) + 1
+            ahead += len(queue)
+        return 0
+
+    async def wait(self, ticket: AdmissionTicket) -> float:
+        """Wait until the ticket is admitted and return how many seconds it spent queued."""
+        await ticket.ready.wait()
+        return ticket.waited
+
+    def release(self, ticket: AdmissionTicket) -> None:
+        """Give back a finished run's slot, or withdraw a run that is still queued."""
+        if ticket.released:
+            return
+        ticket.released = True
+        if ticket.admitted_at is None:
+            self._queues[ticket.priority].remove(ticket)
+            self._queued -= 1
+            return
+        self._running -= 1
+        duration = time.monotonic() - ticket.admitted_at
+        mean = self._mean_run_seconds
+        self._mean_run_seconds = duration if mean is None else mean + _DURATION_SMOOTHING * (duration - mean)
+        while self._running < self.policy.max_running and self._queued:
+            queue = next(queue for queue in self._queues.values() if queue)
+            self._queued -= 1
+            self._admit(queue.popleft())
+
+    def retry_after(self) -> int:
+        """Estimate how many seconds until a new run would find room in the queue."""
+        mean = self._mean_run_seconds or 1.0
+        estimate = mean * (self._queued + 1) / self.policy.max_running
+        return min(RETRY_AFTER_LIMIT, max(1, math.ceil(estimate)))
+
+    def metrics(self) -> AdmissionMetrics:
+        return AdmissionMetrics(
+            max_running=self.policy.max_running,
+            max_queued=self.policy.max_queued,
+            running=self._running,
+            queued=self._queued,
+            queued_by_priority={priority: len(queue) for priority, queue in self._queues.items()},
+            admitted_total=self._admitted_total,
+            queued_total=self._queued_total,
+            rejected_total=self._rejected_total,
+            queue_wait_seconds_total=self._wait_total,
+            queue_wait_seconds_max=self._wait_max,
+        )
+
+    def _admit(self, ticket: AdmissionTicket) -> None:
+        ticket.admitted_at = time.monotonic()
+        self._running += 1
+        self._admitted_total += 1
+        waited = ticket.waited
+        self._wait_total += waited
+        self._wait_max = max(self._wait_max, waited)
+        ticket.ready.set()
@@ -0,0 +1,129 @@
+"""Batches of runs started together, e.g. to evaluate a graph on many inputs, and their aggregated progress."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from collections.abc import AsyncIterator, Awaitable, Callable
+from typing import Any
+
+from pydantic_graph_studio.admission import AdmissionRejected
+from pydantic_graph_studio.schemas import BatchProgress, BatchRunSummary
+
+BATCH_RUN_LIMIT = 1000
+DEFAULT_BATCH_CONCURRENCY = 4
+
+type StartBatchRun = Callable[[int], Awaitable[str]]
+type FinishBatchRun = Callable[[str], Awaitable[BatchRunSummary]]
+
+
+class RunBatch:
+    """Drives `size` runs with at most `concurrency` of them in flight and publishes their outcome.
+
+    `start(index)` starts the run for item `index` and returns its run id; `finish(run_id)` waits for
+    the run to end and returns its summary. Runs the admission queue turns away are retried after its
+    `Retry-After` estimate. Every change is appended to `messages` and announced on `updated`:
+    `run_started`, `run_finished` (with the run's summary) and finally `batch_finished`.
+    """
+
+    def __init__(self, batch_id: str, size: int, concurrency: int = DEFAULT_BATCH_CONCURRENCY) -> None:
+        if size < 1:
+            raise ValueError("A batch needs at least one run")
+        if concurrency < 1:
+            raise ValueError("concurrency must be at least 1")
+        self.batch_id = batch_id
+        self.concurrency = concurrency
+        self.summaries = [BatchRunSummary(index=index, status="pending") for index in range(size)]
+        self.messages: list[dict[str, Any]] = []
+        self.updated = asyncio.Condition()
+        self.done = asyncio.Event()
+        self._started: dict[int, float] = {}
+
+    async def run(self, start: StartBatchRun, finish: FinishBatchRun) -> None:
+        """Start every run in order as slots free up and return once all of them have ended."""
+        slots = asyncio.Semaphore(self.concurrency)
+        try:
+            async with asyncio.TaskGroup() as group:
+                for index in range(len(self.summaries)):
+                    await slots.acquire()
+                    try:
+                        run_id = await self._start(start, index)
+                    except Exception as exc:
+                        slots.release()
+                        await self._finished(index, BatchRunSummary(index=index, status="failed", error=str(exc)))
+                        continue
+                    group.create_task(self._finish(finish, index, run_id, slots))
+        finally:
+            self.done.set()
+            await self._publish({"type": "batch_finished", **self.counts()})
+
+    def counts(self) -> dict[str, int]:
+        """Return how many runs of the batch are in each status."""
+        counts = dict.fromkeys(("pending", "running", "completed", "failed", "cancelled"), 0)
+        for summary in self.summaries:
+            counts[summary.status] += 1
+        return counts
+
+    def progress(self) -> BatchProgress:
+        """Return the batch's aggregated progress and every run's summary so far."""
+        return BatchProgress(
+            batch_id=self.batch_id,
+            total=len(self.summaries),
+            concurrency=self.concurrency,
+            done=self.done.is_set(),
+            runs=list(self.summaries),
+            **self.counts(),
+        )
+
+    async def follow(self, cursor: int = 0, *, heartbeat: float | None = None) -> AsyncIterator[list[dict[str, Any]]]:
+        """Yield the messages after `cursor` as they are published, until the batch has finished.
+
+        With `heartbeat`, an empty list is yielded whenever nothing was published for that many seconds.
+        """
+        while True:
+            async with self.updated:
+                try:
+                    async with asyncio.timeout(heartbeat):
+                        while len(self.messages) <= cursor and not self.done.is_set():
+                            await self.updated.wait()
+                except TimeoutError:
+                    pass
+                messages = self.messages[cursor:]
+            if not messages:
+                if self.done.is_set():
+                    return
+                yield []
+                continue
+            cursor += len(messages)
+            yield messages
+
+    async def _start(self, start: StartBatchRun, index: int) -> str:
+        while True:
+            try:
+                run_id = await start(index)
+            except AdmissionRejected as exc:
+                await asyncio.sleep(exc.retry_after)
+                continue
+            self._started[index] = time.monotonic()
+            self.summaries[index] = BatchRunSummary(index=index, run_id=run_id, status="running")
+            await self._publish({"type": "run_started", "index": index, "run_id": run_id})
+            return run_id
+
+    async def _finish(self, finish: FinishBatchRun, index: int, run_id: str, slots: asyncio.Semaphore) -> None:
+        try:
+            summary = await finish(run_id)
+        except Exception as exc:
+            summary = BatchRunSummary(index=index, status="failed", error=str(exc))
+        finally:
+            slots.release()
+        duration = time.monotonic() - self._started.pop(index)
+        await self._finished(index, summary.model_copy(update={"index": index, "run_id": run_id, "duration": duration}))
+
+    async def _finished(self, index: int, summary: BatchRunSummary) -> None:
+        self.summaries[index] = summary
+        await self._publish({"type": "run_finished", **summary.model_dump(mode="json", by_alias=True)})
+
+    async def _publish(self, message: dict[str, Any]) -> None:
+        async with self.updated:
+            self.messages.append(message)
+            self.updated.notify_all()
@@ -0,0 +1,146 @@
+"""Content-addressed storage for large event payloads, referenced from events instead of inlined."""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import re
+import shutil
+import tempfile
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any
+
+from pydantic_core import to_json
+
+from pydantic_graph_studio.schemas import BlobRef, Event, InputRequestEvent, ToolCallEvent, ToolResultEvent
+
+BLOB_THRESHOLD = 16 * 1024
+BLOB_MEMORY_LIMIT = 64 * 1024 * 1024
+BLOB_PREVIEW_CHARS = 256
+
+_BLOB_HASH = re.compile(r"[0-9a-f]{64}")
+_PAYLOAD_FIELDS: dict[type[Any], str] = {
+    ToolCallEvent: "arguments",
+    ToolResultEvent: "output",
+    InputRequestEvent: "context",
+}
+
+
+class BlobStore:
+    """Deduplicated JSON payloads keyed by their SHA-256, kept in memory and spilled to disk.
+
+    The most recently stored blobs stay in memory up to `memory_limit` bytes; older ones are written to
+    `spill_dir` (a temporary directory unless one is given). A given `spill_dir` is kept on `close`,
+    with every in-memory blob written out, so blobs referenced from a persistent run history survive
+    restarts.
+    """
+
+    def __init__(
+        self,
+        *,
+        threshold: int = BLOB_THRESHOLD,
+        memory_limit: int = BLOB_MEMORY_LIMIT,
+        spill_dir: str | Path | None = None,
+    ) -> None:
+        self.threshold = threshold
+        self.memory_limit = memory_limit
+        self._spill_dir = Path(spill_dir) if spill_dir is not None else None
+        self._persistent = spill_dir is not None
+        self._memory: OrderedDict[str, bytes] = OrderedDict()
+        self._memory_bytes = 0
+        self._lock = threading.Lock()
+
+    def put(self, data: bytes) -> str:
+        """Store `data` and return its hash; storing the same bytes again is a no-op."""
+
+        blob_hash = hashlib.sha256(data).hexdigest()
+        with self._lock:
+            if blob_hash in self._memory:
+                self._memory.move_to_end(blob_hash)
+                return blob_hash
+            if self._spill_dir is not None and (self._spill_dir / blob_hash).exists():
+                return blob_hash
+            self._memory[blob_hash] = data
+            self._memory_bytes += len(data)
+            while self._memory_bytes > self.memory_limit and len(self._memory) > 1:
+                spilled_hash, spilled = self._memory.popitem(last=False)
+                self._memory_bytes -= len(spilled)
+                self._write(spilled_hash, spilled)
+        return blob_hash
+
+    def get(self, blob_hash: str) -> bytes | None:
+        """Return the bytes stored under `blob_hash`, reading spilled blobs back from disk."""
+
+        if not _BLOB_HASH.fullmatch(blob_hash):
+            return None
+        with self._lock:
+            data = self._memory.get(blob_hash)
+            spill_dir = self._spill_dir
+        if data is not None or spill_dir is None:
+            return data
+        try:
+            return (spill_dir / blob_hash).read_bytes()
+        except FileNotFoundError:
+            return None
+
+    def offload_value(self, value: Any) -> Any:
+        """Return `value`, or a `BlobRef` payload pointing at it when its JSON exceeds the threshold."""
+
+        if value is None or isinstance(value, bool | int | float):
+            return value
+        data = to_json(value)
+        if len(data) <= self.threshold:
+            return value
+        return self._reference(data).model_dump(by_alias=True)
+
+    def reference(self, value: Any) -> BlobRef:
+        """Store `value` as JSON whatever its size and return a reference to it.
+
+        Values pydantic cannot serialize are stored as their string representation.
+        """
+
+        return self._reference(to_json(value, serialize_unknown=True))
+
+    def _reference(self, data: bytes) -> BlobRef:
+        text = data[: BLOB_PREVIEW_CHARS * 4].decode("utf-8", errors="ignore")
+        preview = text if len(data) <= BLOB_PREVIEW_CHARS else f"{text[:BLOB_PREVIEW_CHARS]}…"
+        return BlobRef(blob=self.put(data), size=len(data), preview=preview)
+
+    async def offload(self, event: Event) -> Event:
+        """Move an event's large payload into the store, hashing and spilling off the event loop."""
+
+        field_name = _PAYLOAD_FIELDS.get(type(event))
+        if field_name is None:
+            return event
+        value = getattr(event, field_name)
+        if value is None or isinstance(value, bool | int | float):
+            return event
+        offloaded = await asyncio.to_thread(self.offload_value, value)
+        if offloaded is value:
+            return event
+        return event.model_copy(update={field_name: offloaded})
+
+    def close(self) -> None:
+        """Persist in-memory blobs to a given spill directory, or delete a temporary one."""
+
+        with self._lock:
+            if self._persistent:
+                for blob_hash, data in self._memory.items():
+                    self._write(blob_hash, data)
+            elif self._spill_dir is not None:
+                shutil.rmtree(self._spill_dir, ignore_errors=True)
+                self._spill_dir = None
+            self._memory.clear()
+            self._memory_bytes = 0
+
+    def _write(self, blob_hash: str, data: bytes) -> None:
+        if self._spill_dir is None:
+            self._spill_dir = Path(tempfile.mkdtemp(prefix="pgraph-blobs-"))
+        self._spill_dir.mkdir(parents=True, exist_ok=True)
+        path = self._spill_dir / blob_hash
+        if not path.exists():
+            partial = path.with_suffix(".tmp")
+            partial.write_bytes(data)
+            partial.replace(path)
@@ -16,6 +16,10 @@ from typing import Any
 from pydantic_graph import Graph
 from pydantic_graph.nodes import BaseNode
 
+from pydantic_graph_studio.admission import AdmissionPolicy
+from pydantic_graph_studio.blobs import BlobStore
+from pydantic_graph_studio.factories import ResourcePool, RunFactories
+from pydantic_graph_studio.history import RunHistoryStore
 from pydantic_graph_studio.introspection import build_graph_model
 from pydantic_graph_studio.server import create_app
 
@@ -53,7 +57,16 @@ def main(argv: list[str] | None = None) -> None:
         graph = _load_graph(args.graph_ref)
         start_node = _resolve_start_node(graph, args.start)
         port = _select_port(args.host, args.port, allow_fallback=not _has_explicit_port(args_list))
-        _run_server(graph, start_node, host=args.host, port=port, open_browser=not args.no_open)
+        _run_server(
+            graph,
+            start_node,
+            host=args.host,
+            port=port,
+            open_browser=not args.no_open,
+            history=args.history,
+            admission=_admission_policy(args),
+            factories=_run_factories(args),
+        )
     except CLIError as exc:
         print(f"error: {exc}", file=sys.stderr)
         raise SystemExit(2) from exc
@@ -88,6 +101,28 @@ def _parse_args(argv: list[str] | None) -> argparse.Namespace:
         action="store_true",
         help="Disable automatically opening the browser",
     )
+    parser.add_argument(
+        "--history",
+        help="SQLite file to record every run into, enabling the run history endpoints",
+    )
+    parser.add_argument(
+        "--state-factory",
+        help="Callable (module:var or path.py:var, sync or async) building each run's state",
+    )
+    parser.add_argument(
+        "--deps-factory",
+        help="Callable (module:var or path.py:var, sync or async) building each run's deps",
+    )
+    parser.add_argument(
+        "--inputs-factory",
+        help="Callable (module:var or path.py:var, sync or async) building each beta run's inputs",
+    )
+    parser.add_argument(
+        "--deps-pool",
+        type=int,
+        help="Reuse up to this many deps built by --deps-factory across runs, one run at a time each",
+    )
+    _add_admission_args(parser)
     return parser.parse_args(argv)
 
 
@@ -101,6 +136,16 @@ def _parse_example_args(argv: list[str] | None) -> argparse.Namespace:
         nargs="?",
         help="Example name or 'list' to show available examples",
     )
+    parser.add_argument(
+        "--size",
+        type=int,
+        help="Size parameter for synthetic stress examples",
+    )
+    parser.add_argument(
+        "--beta",
+        action="store_true",
+        help="Build synthetic stress examples as beta graphs",
+    )
     parser.add_argument(
         "--host",
         default="127.0.0.1",
@@ -121,9 +166,63 @@ def _parse_example_args(argv: list[str] | None) -> argparse.Namespace:
         action="store_true",
         help="Disable automatically opening the browser",
     )
+    parser.add_argument(
+        "--history",
+        help="SQLite file to record every run into, enabling the run history endpoints",
+    )
+    _add_admission_args(parser)
     return parser.parse_args(argv)
 
 
+def _add_admission_args(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        "--max-runs",
+        type=int,
+        help="Maximum number of concurrent runs; further runs wait in a queue (default: unlimited)",
+    )
+    parser.add_argument(
+        "--max-queued",
+        type=int,
+        default=64,
+        help="Maximum number of runs waiting for a slot when --max-runs is set (default: 64)",
+    )
+
+
+def _admission_policy(args: argparse.Namespace) -> AdmissionPolicy | None:
+    if args.max_runs is None:
+        return None
+    try:
+        return AdmissionPolicy(max_running=args.max_runs, max_queued=args.max_queued)
+    except ValueError as exc:
+        raise CLIError(str(exc)) from exc
+
+
+def _run_factories(args: argparse.Namespace) -> RunFactories | None:
+    if args.deps_pool is not None and args.deps_factory is None:
+        raise CLIError("--deps-pool requires --deps-factory")
+    state = _load_factory(args.state_factory) if args.state_factory else None
+    deps: Any = _load_factory(args.deps_factory) if args.deps_factory else None
+    inputs = _load_factory(args.inputs_factory) if args.inputs_factory else None
+    if deps is not None and args.deps_pool is not None:
+        try:
+            deps = ResourcePool(deps, max_size=args.deps_pool)
+        except ValueError as exc:
+            raise CLIError(str(exc)) from exc
+    if state is None and deps is None and inputs is None:
+        return None
+    return RunFactories(state=state, deps=deps, inputs=inputs)
+
+
+def _load_factory(factory_ref: str) -> Any:
+    target, _, attribute = factory_ref.rpartition(":")
+    if not target or not attribute:
+        raise CLIError(f"Factory reference '{factory_ref}' must be in the form module:var or path.py:var")
+    factory = _resolve_attribute(_load_module(target), attribute)
+    if not callable(factory):
+        raise CLIError(f"Factory reference '{factory_ref}' did not resolve to a callable")
+    return factory
+
+
 def _run_example_command(argv: list[str]) -> None:
     args = _parse_example_args(argv)
     if args.name is None or args.name == "list":
@@ -136,10 +235,29 @@ def _run_example_command(argv: list[str]) -> None:
         available = ", ".join(spec.name for spec in examples.list_examples())
         raise CLIError(f"Unknown example '{args.name}'. Available examples: {available}") from exc
 
-    graph = example.loader()
+    graph = _load_example_graph(example, size=args.size, beta=args.beta)
     start_node = _resolve_start_node(graph, args.start)
     port = _select_port(args.host, args.port, allow_fallback=not _has_explicit_port(argv))
-    _run_server(graph, start_node, host=args.host, port=port, open_browser=not args.no_open)
+    _run_server(
+        graph,
+        start_node,
+        host=args.host,
+        port=port,
+        open_browser=not args.no_open,
+        history=args.history,
+        admission=_admission_policy(args),
+    )
+
+
+def _load_example_graph(example: examples.ExampleSpec, *, size: int | None, beta: bool) -> Any:
+    if not example.sized:
+        if size is not None or beta:
+            raise CLIError(f"Example '{example.name}' does not accept --size or --beta")
+        return example.loader()
+    try:
+        return example.loader(size=size, beta=beta)
+    except ValueError as exc:
+        raise CLIError(str(exc)) from exc
 
 
 def _print_examples() -> None:
@@ -263,11 +381,26 @@ def _run_server(
     host: str,
     port: int,
     open_browser: bool,
+    history: str | None = None,
+    admission: AdmissionPolicy | None = None,
+    factories: RunFactories | None = None,
 ) -> None:
     if port <= 0 or port > 65535:
         raise CLIError("Port must be between 1 and 65535")
 
-    app = create_app(graph, start_node)
+    if history:
+        # Keep large payloads next to the database so recorded runs can still resolve their blob refs.
+        blobs = BlobStore(spill_dir=Path(history).with_suffix(".blobs"))
+        app = create_app(
+            graph,
+            start_node,
+            factories=factories,
+            history=RunHistoryStore(history),
+            blobs=blobs,
+            admission=admission,
+        )
+    else:
+        app = create_app(graph, start_node, factories=factories, admission=admission)
     try:
         import uvicorn
     except ModuleNotFoundError as exc:
@@ -0,0 +1,318 @@
+"""Cluster hierarchies and collapsed views for very large graphs."""
+
+from __future__ import annotations
+
+from collections.abc import Iterable, Mapping
+from dataclasses import dataclass, field
+
+from pydantic_graph_studio.schemas import GraphCluster, GraphEdge, GraphModel, GraphNode, GraphView
+
+CLUSTER_PREFIX = "cluster:"
+MAX_CLUSTER_CHILDREN = 64
+MAX_VISIBLE_ELEMENTS = 256
+STATUS_PRIORITY = {"idle": 0, "done": 1, "active": 2, "error": 3}
+
+GroupPath = tuple[str, ...]
+
+
+@dataclass(slots=True)
+class _Cluster:
+    cluster_id: str
+    label: str
+    parent_id: str | None
+    children: list[str] = field(default_factory=list)
+    node_count: int = 0
+
+
+class ClusterHierarchy:
+    """Nested grouping of a graph's nodes with on-demand expansion into `GraphView` payloads."""
+
+    def __init__(
+        self,
+        model: GraphModel,
+        strategy: str,
+        clusters: dict[str, _Cluster],
+        root: list[str],
+        node_parent: dict[str, str | None],
+    ) -> None:
+        self.model = model
+        self.strategy = strategy
+        self._clusters = clusters
+        self._root = root
+        self._node_parent = node_parent
+        self._nodes = {node.node_id: node for node in model.nodes}
+
+    @property
+    def cluster_ids(self) -> list[str]:
+        return list(self._clusters)
+
+    def ancestors(self, node_id: str) -> list[str]:
+        """Return the clusters containing `node_id`, innermost first."""
+
+        if node_id not in self._node_parent:
+            raise KeyError(node_id)
+        chain: list[str] = []
+        parent = self._node_parent[node_id]
+        while parent is not None:
+            chain.append(parent)
+            parent = self._clusters[parent].parent_id
+        return chain
+
+    def default_expansion(self, max_visible: int = MAX_VISIBLE_ELEMENTS) -> list[str]:
+        """Expand whole levels of the hierarchy, top down, while the view stays within `max_visible`."""
+
+        expanded: list[str] = []
+        visible = len(self._root)
+        frontier = [item for item in self._root if item in self._clusters]
+        while frontier:
+            growth = sum(len(self._clusters[cluster_id].children) - 1 for cluster_id in frontier)
+            if visible + growth > max_visible:
+                break
+            visible += growth
+            expanded.extend(frontier)
+            frontier = [
+                child
+                for cluster_id in frontier
+                for child in self._clusters[cluster_id].children
+                if child in self._clusters
+            ]
+        return expanded
+
+    def view(self, expanded: Iterable[str] | None = None, *, max_visible: int = MAX_VISIBLE_ELEMENTS) -> GraphView:
+        """Build the visible graph with every cluster outside `expanded` collapsed into one node.
+
+        Expanding a cluster implies expanding its ancestors; unknown cluster ids are ignored. When
+        `expanded` is None the top levels are expanded automatically within `max_visible` elements.
+        """
+
+        if expanded is None:
+            expanded_set = set(self.default_expansion(max_visible))
+        else:
+            expanded_set = set()
+            for cluster_id in expanded:
+                while cluster_id in self._clusters and cluster_id not in expanded_set:
+                    expanded_set.add(cluster_id)
+                    parent_id = self._clusters[cluster_id].parent_id
+                    if parent_id is None:
+                        break
+                    cluster_id = parent_id
+
+        nodes: list[GraphNode] = []
+        clusters: list[GraphCluster] = []
+        self._collect_visible(self._root, expanded_set, nodes, clusters)
+
+        visible_of: dict[str, str] = {}
+        for node_id in self._node_parent:
+            visible_of[node_id] = self._visible_element(node_id, expanded_set)
+
+        edge_index: dict[tuple[str, str | None, bool], int] = {}
+        edges: list[GraphEdge] = []
+        counts: list[int] = []
+        for edge in self.model.edges:
+            source = visible_of.get(edge.source_node_id, edge.source_node_id)
+            target = visible_of.get(edge.target_node_id, edge.target_node_id) if edge.target_node_id else None
+            if target is not None and source == target and source in self._clusters:
+                continue
+            key = (source, target, edge.dynamic)
+            index = edge_index.get(key)
+            if index is None:
+                edge_index[key] = len(edges)
+                edges.append(GraphEdge(source_node_id=source, target_node_id=target, dynamic=edge.dynamic))
+                counts.append(1)
+            else:
+                counts[index] += 1
+
+        return GraphView(
+            strategy=self.strategy,
+            graph=GraphModel(
+                nodes=nodes,
+                edges=edges,
+                entry_nodes=_dedupe(visible_of.get(node_id, node_id) for node_id in self.model.entry_nodes),
+                terminal_nodes=_dedupe(visible_of.get(node_id, node_id) for node_id in self.model.terminal_nodes),
+            ),
+            clusters=clusters,
+            expanded=sorted(expanded_set),
+            edge_counts=counts,
+        )
+
+    def rollup_status(self, statuses: Mapping[str, str]) -> dict[str, str]:
+        """Roll node statuses up to every containing cluster (error > active > done > idle)."""
+
+        rolled: dict[str, str] = {}
+        for node_id, status in statuses.items():
+            if node_id not in self._node_parent or status not in STATUS_PRIORITY:
+                continue
+            for cluster_id in self.ancestors(node_id):
+                current = rolled.get(cluster_id, "idle")
+                if STATUS_PRIORITY[status] > STATUS_PRIORITY[current]:
+                    rolled[cluster_id] = status
+        return rolled
+
+    def _collect_visible(
+        self,
+        items: list[str],
+        expanded: set[str],
+        nodes: list[GraphNode],
+        clusters: list[GraphCluster],
+    ) -> None:
+        for item in items:
+            cluster = self._clusters.get(item)
+            if cluster is None:
+                nodes.append(self._nodes[item])
+            elif item in expanded:
+                self._collect_visible(cluster.children, expanded, nodes, clusters)
+            else:
+                nodes.append(GraphNode(node_id=cluster.cluster_id, label=f"{cluster.label} ({cluster.node_count})"))
+                clusters.append(
+                    GraphCluster(
+                        cluster_id=cluster.cluster_id,
+                        label=cluster.label,
+                        parent_id=cluster.parent_id,
+                        node_count=cluster.node_count,
+                    )
+                )
+
+    def _visible_element(self, node_id: str, expanded: set[str]) -> str:
+        visible = node_id
+        parent = self._node_parent[node_id]
+        while parent is not None:
+            if parent not in expanded:
+                visible = parent
+            parent = self._clusters[parent].parent_id
+        return visible
+
+
+def build_hierarchy(
+    model: GraphModel,
+    strategy: str,
+    paths: Mapping[str, GroupPath],
+    *,
+    labels: Mapping[GroupPath, str] | None = None,
+    max_children: int = MAX_CLUSTER_CHILDREN,
+) -> ClusterHierarchy:
+    """Build a hierarchy from per-node group paths (outermost group first).
+
+    Single-child chains are merged, single-node groups are inlined, and any level with more than
+    `max_children` children is split into ordered range clusters so every expansion stays bounded.
+    """
+
+    labels = labels or {}
+    clusters: dict[str, _Cluster] = {}
+    root: list[str] = []
+
+    for node in model.nodes:
+        path = paths.get(node.node_id, ())
+        parent_id: str | None = None
+        for depth in range(1, len(path) + 1):
+            prefix = path[:depth]
+            cluster_id = CLUSTER_PREFIX + "/".join(prefix)
+            if cluster_id not in clusters:
+                clusters[cluster_id] = _Cluster(
+                    cluster_id=cluster_id,
+                    label=labels.get(prefix, prefix[-1]),
+                    parent_id=parent_id,
+                )
+                (clusters[parent_id].children if parent_id else root).append(cluster_id)
+            parent_id = cluster_id
+        (clusters[parent_id].children if parent_id else root).append(node.node_id)
+
+    root = _simplify(root, None, clusters)
+    while len(root) == 1 and root[0] in clusters:
+        # A single top-level group (e.g. every node in one module) adds nothing, so unwrap it.
+        root = clusters.pop(root[0]).children
+        for item in root:
+            if item in clusters:
+                clusters[item].parent_id = None
+    root = _chunk(root, None, clusters, max_children)
+
+    node_parent: dict[str, str | None] = {}
+    _index(root, None, clusters, node_parent)
+    return ClusterHierarchy(model, strategy, clusters, root, node_parent)
+
+
+def _simplify(items: list[str], parent_id: str | None, clusters: dict[str, _Cluster]) -> list[str]:
+    simplified: list[str] = []
+    for item in items:
+        cluster = clusters.get(item)
+        if cluster is None:
+            simplified.append(item)
+            continue
+        while len(cluster.children) == 1 and cluster.children[0] in clusters:
+            child = clusters.pop(cluster.children[0])
+            cluster.label = f"{cluster.label}.{child.label}"
+            cluster.children = child.children
+        cluster.parent_id = parent_id
+        cluster.children = _simplify(cluster.children, cluster.cluster_id, clusters)
+        if len(cluster.children) <= 1:
+            del clusters[item]
+            simplified.extend(cluster.children)
+            for child in cluster.children:
+                if child in clusters:
+                    clusters[child].parent_id = parent_id
+        else:
+            simplified.append(item)
+    return simplified
+
+
+def _chunk(items: list[str], parent_id: str | None, clusters: dict[str, _Cluster], max_children: int) -> list[str]:
+    for item in items:
+        cluster = clusters.get(item)
+        if cluster is not None:
+            cluster.children = _chunk(cluster.children, cluster.cluster_id, clusters, max_children)
+
+    level = 0
+    while len(items) > max_children:
+        level += 1
+        grouped: list[str] = []
+        for start in range(0, len(items), max_children):
+            members = items[start : start + max_children]
+            if len(members) == 1:
+                grouped.append(members[0])
+                continue
+            cluster_id = f"{parent_id or CLUSTER_PREFIX}#{level}.{start // max_children}"
+            clusters[cluster_id] = _Cluster(
+                cluster_id=cluster_id,
+                label=f"{_first_leaf(members[0], clusters)} … {_last_leaf(members[-1], clusters)}",
+                parent_id=parent_id,
+                children=members,
+            )
+            for member in members:
+                if member in clusters:
+                    clusters[member].parent_id = cluster_id
+            grouped.append(cluster_id)
+        items = grouped
+    return items
+
+
+def _index(
+    items: list[str],
+    parent_id: str | None,
+    clusters: dict[str, _Cluster],
+    node_parent: dict[str, str | None],
+) -> int:
+    total = 0
+    for item in items:
+        cluster = clusters.get(item)
+        if cluster is None:
+            node_parent[item] = parent_id
+            total += 1
+        else:
+            cluster.node_count = _index(cluster.children, item, clusters, node_parent)
+            total += cluster.node_count
+    return total
+
+
+def _first_leaf(item: str, clusters: dict[str, _Cluster]) -> str:
+    while item in clusters:
+        item = clusters[item].children[0]
+    return item
+
+
+def _last_leaf(item: str, clusters: dict[str, _Cluster]) -> str:
+    while item in clusters:
+        item = clusters[item].children[-1]
+    return item
+
+
+def _dedupe(items: Iterable[str]) -> list[str]:
+    return list(dict.fromkeys(items))
@@ -6,7 +6,7 @@ from collections.abc import Callable
 from dataclasses import dataclass
 from typing import Any
 
-ExampleLoader = Callable[[], Any]
+ExampleLoader = Callable[..., Any]
 
 
 @dataclass(frozen=True, slots=True)
@@ -15,6 +15,7 @@ class ExampleSpec:
     title: str
     description: str
     loader: ExampleLoader
+    sized: bool = False
 
 
 def _load_basic_graph() -> Any:
@@ -53,6 +54,15 @@ def _load_human_in_the_loop() -> Any:
     return human_in_the_loop_module.graph
 
 
+def _load_synthetic(shape: str) -> ExampleLoader:
+    def _load(*, size: int | None = None, beta: bool = False) -> Any:
+        from . import synthetic as synthetic_module
+
+        return synthetic_module.build_synthetic_graph(shape, size, beta=beta)
+
+    return _load
+
+
 _EXAMPLES: dict[str, ExampleSpec] = {
     "graph": ExampleSpec(
         name="graph",
@@ -90,6 +100,34 @@ _EXAMPLES: dict[str, ExampleSpec] = {
         description="Simulates a human approval step before finishing.",
         loader=_load_human_in_the_loop,
     ),
+    "stress-chain": ExampleSpec(
+        name="stress-chain",
+        title="Stress: Long Chain",
+        description="Synthetic linear chain; --size sets the number of nodes.",
+        loader=_load_synthetic("chain"),
+        sized=True,
+    ),
+    "stress-broadcast": ExampleSpec(
+        name="stress-broadcast",
+        title="Stress: Wide Broadcast",
+        description="Synthetic fan-out; --size sets the number of branches.",
+        loader=_load_synthetic("broadcast"),
+        sized=True,
+    ),
+    "stress-tree": ExampleSpec(
+        name="stress-tree",
+        title="Stress: Decision Tree",
+        description="Synthetic binary decision tree; --size sets the depth.",
+        loader=_load_synthetic("tree"),
+        sized=True,
+    ),
+    "stress-loop": ExampleSpec(
+        name="stress-loop",
+        title="Stress: Tight Loop",
+        description="Synthetic self-loop; --size sets the number of iterations.",
+        loader=_load_synthetic("loop"),
+        sized=True,
+    ),
 }
 
 
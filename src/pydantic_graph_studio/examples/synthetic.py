@@ -0,0 +1,276 @@
+"""Parameterized synthetic graphs for stress testing introspection, runtime and UI."""
+
+from __future__ import annotations
+
+import types
+from collections.abc import Callable
+from dataclasses import make_dataclass
+from typing import Any, Union
+
+from pydantic_graph import BaseNode, End, Graph, GraphRunContext
+
+SHAPES: tuple[str, ...] = ("chain", "broadcast", "tree", "loop")
+
+DEFAULT_SIZES: dict[str, int] = {
+    "chain": 1000,
+    "broadcast": 500,
+    "tree": 10,
+    "loop": 10000,
+}
+
+MAX_TREE_DEPTH = 16
+
+NodeBase = BaseNode[None, None, int]
+
+
+def build_synthetic_graph(shape: str, size: int | None = None, *, beta: bool = False) -> Any:
+    """Build a synthetic graph of the given shape.
+
+    `size` is the chain length for `chain`, the number of parallel branches for `broadcast`,
+    the depth of the binary decision tree for `tree` and the number of iterations for `loop`.
+    """
+
+    if shape not in DEFAULT_SIZES:
+        raise ValueError(f"Unknown synthetic shape '{shape}'. Expected one of: {', '.join(SHAPES)}")
+    resolved = DEFAULT_SIZES[shape] if size is None else size
+    if resolved < 1:
+        raise ValueError("Synthetic graph size must be at least 1")
+    if shape == "tree" and resolved > MAX_TREE_DEPTH:
+        raise ValueError(f"Synthetic tree depth must be at most {MAX_TREE_DEPTH}")
+    builders = _BETA_BUILDERS if beta else _V1_BUILDERS
+    return builders[shape](resolved)
+
+
+def _node_class(
+    name: str,
+    run: Callable[..., Any],
+    *,
+    fields: list[tuple[str, type[Any]]] | None = None,
+) -> type[NodeBase]:
+    namespace = {"run": run, "__module__": __name__, "__qualname__": name}
+    if fields:
+        return make_dataclass(name, fields, bases=(NodeBase,), namespace=namespace)
+    return types.new_class(name, (NodeBase,), exec_body=lambda ns: ns.update(namespace))
+
+
+def _set_return_hint(node_cls: type[NodeBase], hint: Any) -> None:
+    node_cls.run.__annotations__ = {"ctx": GraphRunContext, "return": hint}
+
+
+def _union(node_types: list[Any]) -> Any:
+    return Union[tuple(node_types)]  # noqa: UP007
+
+
+def _build_v1_chain(size: int) -> Graph[None, None, int]:
+    async def tail_run(self: Any, ctx: GraphRunContext) -> Any:
+        return End(size)
+
+    next_cls = _node_class(f"Chain{size - 1:05d}", tail_run)
+    _set_return_hint(next_cls, End[int])
+    node_types = [next_cls]
+    for index in reversed(range(size - 1)):
+        node_cls = _node_class(f"Chain{index:05d}", _advance_to(next_cls))
+        _set_return_hint(node_cls, next_cls)
+        node_types.append(node_cls)
+        next_cls = node_cls
+    node_types.reverse()
+    return Graph[None, None, int](nodes=node_types, name=f"synthetic_chain_{size}")
+
+
+def _advance_to(target: type[NodeBase]) -> Callable[..., Any]:
+    async def run(self: Any, ctx: GraphRunContext) -> Any:
+        return target()
+
+    return run
+
+
+def _build_v1_broadcast(size: int) -> Graph[None, None, int]:
+    # v1 graphs run one node at a time, so the broadcast is modelled as a hub that visits every branch in turn.
+    branches: list[type[NodeBase]] = []
+
+    async def dispatch_run(self: Any, ctx: GraphRunContext) -> Any:
+        if self.visited >= size:
+            return End(self.visited)
+        return branches[self.visited](visited=self.visited + 1)
+
+    dispatch_cls = _node_class("Dispatch", dispatch_run, fields=[("visited", int)])
+
+    async def branch_run(self: Any, ctx: GraphRunContext) -> Any:
+        return dispatch_cls(visited=self.visited)
+
+    for index in range(size):
+        branch_cls = _node_class(f"Branch{index:05d}", branch_run, fields=[("visited", int)])
+        _set_return_hint(branch_cls, dispatch_cls)
+        branches.append(branch_cls)
+
+    _set_return_hint(dispatch_cls, _union([*branches, End[int]]))
+
+    async def start_run(self: Any, ctx: GraphRunContext) -> Any:
+        return dispatch_cls(visited=0)
+
+    start_cls = _node_class("Fanout", start_run)
+    _set_return_hint(start_cls, dispatch_cls)
+    return Graph[None, None, int](nodes=[start_cls, dispatch_cls, *branches], name=f"synthetic_broadcast_{size}")
+
+
+def _build_v1_tree(depth: int) -> Graph[None, None, int]:
+    levels: list[list[type[NodeBase]]] = []
+    for level in reversed(range(depth)):
+        children = levels[0] if levels else None
+        current: list[type[NodeBase]] = []
+        for index in range(2**level):
+            node_cls = _tree_node_class(level, index, children)
+            current.append(node_cls)
+        levels.insert(0, current)
+    node_types = [node_cls for level in levels for node_cls in level]
+    return Graph[None, None, int](nodes=node_types, name=f"synthetic_tree_{depth}")
+
+
+def _tree_node_class(level: int, index: int, children: list[type[NodeBase]] | None) -> type[NodeBase]:
+    name = f"Tree{level:02d}x{index:05d}"
+    if children is None:
+
+        async def leaf_run(self: Any, ctx: GraphRunContext) -> Any:
+            return End(index)
+
+        node_cls = _node_class(name, leaf_run)
+        _set_return_hint(node_cls, End[int])
+        return node_cls
+
+    left = children[index * 2]
+    right = children[index * 2 + 1]
+
+    async def branch_run(self: Any, ctx: GraphRunContext) -> Any:
+        return left() if (level + index) % 2 == 0 else right()
+
+    node_cls = _node_class(name, branch_run)
+    _set_return_hint(node_cls, _union([left, right]))
+    return node_cls
+
+
+def _build_v1_loop(iterations: int) -> Graph[None, None, int]:
+    async def done_run(self: Any, ctx: GraphRunContext) -> Any:
+        return End(self.count)
+
+    done_cls = _node_class("LoopDone", done_run, fields=[("count", int)])
+    _set_return_hint(done_cls, End[int])
+
+    async def tick_run(self: Any, ctx: GraphRunContext) -> Any:
+        if self.count >= iterations:
+            return done_cls(count=self.count)
+        return tick_cls(count=self.count + 1)
+
+    tick_cls = _node_class("LoopTick", tick_run, fields=[("count", int)])
+    _set_return_hint(tick_cls, _union([tick_cls, done_cls]))
+
+    async def start_run(self: Any, ctx: GraphRunContext) -> Any:
+        return tick_cls(count=1)
+
+    start_cls = _node_class("LoopStart", start_run)
+    _set_return_hint(start_cls, tick_cls)
+    return Graph[None, None, int](nodes=[start_cls, tick_cls, done_cls], name=f"synthetic_loop_{iterations}")
+
+
+def _beta_builder() -> Any:
+    from pydantic_graph.beta.graph_builder import GraphBuilder
+
+    return GraphBuilder[None, None, None, int]()
+
+
+def _int_input(ctx: Any) -> int:
+    # The studio hands beta graphs an InteractionHub as their input, so only trust integers.
+    return ctx.inputs if isinstance(ctx.inputs, int) else 0
+
+
+async def _passthrough(ctx: Any) -> int:
+    return _int_input(ctx)
+
+
+def _build_beta_chain(size: int) -> Any:
+    builder = _beta_builder()
+    steps = [builder.step(call=_passthrough, node_id=f"Chain{index:05d}") for index in range(size)]
+    builder.add_edge(builder.start_node, steps[0])
+    for source, target in zip(steps, steps[1:], strict=False):
+        builder.add_edge(source, target)
+    builder.add_edge(steps[-1], builder.end_node)
+    return builder.build()
+
+
+def _build_beta_broadcast(size: int) -> Any:
+    from pydantic_graph.beta.join import reduce_sum
+
+    builder = _beta_builder()
+
+    async def branch(ctx: Any) -> int:
+        return 1
+
+    planner = builder.step(call=_passthrough, node_id="Fanout")
+    branches = [builder.step(call=branch, node_id=f"Branch{index:05d}") for index in range(size)]
+    join = builder.join(reduce_sum, initial=0, node_id="FanoutJoin")
+
+    builder.add_edge(builder.start_node, planner)
+    builder.add(
+        builder.edge_from(planner).broadcast(
+            lambda edge: [edge.to(step) for step in branches],
+            fork_id="FanoutFork",
+        )
+    )
+    for step in branches:
+        builder.add_edge(step, join)
+    builder.add_edge(join, builder.end_node)
+    return builder.build()
+
+
+def _build_beta_tree(depth: int) -> Any:
+    builder = _beta_builder()
+    root = _beta_tree_node(builder, 0, 0, depth)
+    builder.add_edge(builder.start_node, root)
+    return builder.build()
+
+
+def _beta_tree_node(builder: Any, level: int, index: int, depth: int) -> Any:
+    name = f"Tree{level:02d}x{index:05d}"
+    step = builder.step(call=_passthrough, node_id=name)
+    if level == depth - 1:
+        builder.add_edge(step, builder.end_node)
+        return step
+
+    left = _beta_tree_node(builder, level + 1, index * 2, depth)
+    right = _beta_tree_node(builder, level + 1, index * 2 + 1, depth)
+    go_left = (level + index) % 2 == 0
+    decision = builder.decision(node_id=f"{name}Decision")
+    decision = decision.branch(builder.match(int, matches=lambda _value: go_left).to(left))
+    decision = decision.branch(builder.match(int).to(right))
+    builder.add(builder.edge_from(step).to(decision))
+    return step
+
+
+def _build_beta_loop(iterations: int) -> Any:
+    builder = _beta_builder()
+
+    async def tick(ctx: Any) -> int:
+        return _int_input(ctx) + 1
+
+    tick_step = builder.step(call=tick, node_id="LoopTick")
+    decision = builder.decision(node_id="LoopDecision")
+    decision = decision.branch(builder.match(int, matches=lambda value: value < iterations).to(tick_step))
+    decision = decision.branch(builder.match(int).to(builder.end_node))
+
+    builder.add_edge(builder.start_node, tick_step)
+    builder.add(builder.edge_from(tick_step).to(decision))
+    return builder.build()
+
+
+_V1_BUILDERS: dict[str, Callable[[int], Any]] = {
+    "chain": _build_v1_chain,
+    "broadcast": _build_v1_broadcast,
+    "tree": _build_v1_tree,
+    "loop": _build_v1_loop,
+}
+
+_BETA_BUILDERS: dict[str, Callable[[int], Any]] = {
+    "chain": _build_beta_chain,
+    "broadcast": _build_beta_broadcast,
+    "tree": _build_beta_tree,
+    "loop": _build_beta_loop,
+}
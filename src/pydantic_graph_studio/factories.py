@@ -0,0 +1,132 @@
+"""Per-run `state`, `deps` and `inputs`, so concurrent runs never share mutable objects."""
+
+from __future__ import annotations
+
+import asyncio
+import inspect
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from typing import Any
+
+type RunFactory = Callable[[], Any]
+
+
+class ResourcePool:
+    """Reuses expensive objects, such as clients or connection pools, across runs.
+
+    Each run acquires an object for its whole duration and releases it when it ends, so an object is
+    never used by two runs at once. Objects are created on demand by `factory` (sync or async), at
+    most `max_size` of them; further runs wait for one to be released. `close` (sync or async) is
+    called on every object once the pool is closed.
+    """
+
+    def __init__(
+        self,
+        factory: RunFactory,
+        *,
+        max_size: int = 8,
+        close: Callable[[Any], Any] | None = None,
+    ) -> None:
+        if max_size < 1:
+            raise ValueError("max_size must be at least 1")
+        self.factory = factory
+        self.max_size = max_size
+        self._close = close
+        self._idle: list[Any] = []
+        self._slots = asyncio.Semaphore(max_size)
+        self._closed = False
+
+    @property
+    def idle(self) -> int:
+        """How many created objects are waiting to be reused."""
+        return len(self._idle)
+
+    async def acquire(self) -> Any:
+        """Return an idle object, or a new one while fewer than `max_size` exist."""
+        if self._closed:
+            raise RuntimeError("Resource pool is closed")
+        await self._slots.acquire()
+        if self._idle:
+            return self._idle.pop()
+        try:
+            return await _call(self.factory)
+        except BaseException:
+            self._slots.release()
+            raise
+
+    async def release(self, item: Any) -> None:
+        """Give an object back for the next run, or close it if the pool has been closed meanwhile."""
+        if self._closed:
+            await self._dispose(item)
+        else:
+            self._idle.append(item)
+        self._slots.release()
+
+    async def aclose(self) -> None:
+        """Close the idle objects; objects still in use are closed as they are released."""
+        self._closed = True
+        idle, self._idle = self._idle, []
+        for item in idle:
+            await self._dispose(item)
+
+    async def _dispose(self, item: Any) -> None:
+        if self._close is not None:
+            await _call(self._close, item)
+
+
+@dataclass(slots=True)
+class RunResources:
+    """The `state`, `deps` and `inputs` built for one run; `release` hands pooled objects back."""
+
+    state: Any = None
+    deps: Any = None
+    inputs: Any = None
+    _leases: list[tuple[ResourcePool, Any]] = field(default_factory=list)
+
+    async def release(self) -> None:
+        leases, self._leases = self._leases, []
+        for pool, item in leases:
+            await pool.release(item)
+
+
+@dataclass(frozen=True, slots=True)
+class RunFactories:
+    """Build a fresh `state`, `deps` and `inputs` for every run.
+
+    Each field is a zero-argument callable (sync or async) called once per run, or a `ResourcePool`
+    the run borrows from until it ends. Fields left as None keep the value given to the registry.
+    """
+
+    state: RunFactory | ResourcePool | None = None
+    deps: RunFactory | ResourcePool | None = None
+    inputs: RunFactory | ResourcePool | None = None
+
+    async def create(self, *, state: Any = None, deps: Any = None, inputs: Any = None) -> RunResources:
+        """Build one run's resources, falling back to the given values for fields without a factory."""
+        resources = RunResources(state=state, deps=deps, inputs=inputs)
+        try:
+            for name in ("state", "deps", "inputs"):
+                source = getattr(self, name)
+                if isinstance(source, ResourcePool):
+                    item = await source.acquire()
+                    resources._leases.append((source, item))
+                    setattr(resources, name, item)
+                elif source is not None:
+                    setattr(resources, name, await _call(source))
+        except BaseException:
+            await resources.release()
+            raise
+        return resources
+
+    async def aclose(self) -> None:
+        """Close the pools among the factories."""
+        for source in (self.state, self.deps, self.inputs):
+            if isinstance(source, ResourcePool):
+                await source.aclose()
+
+
+async def _call(function: Callable[..., Any], *args: Any) -> Any:
+    result = function(*args)
+    if inspect.isawaitable(result):
+        return await result
+    return result
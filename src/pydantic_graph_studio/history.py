@@ -0,0 +1,358 @@
+"""Optional SQLite run history, written behind the event loop by a background thread."""
+
+from __future__ import annotations
+
+import queue
+import sqlite3
+import threading
+import time
+from collections.abc import Mapping
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Literal
+
+from pydantic import TypeAdapter
+
+from pydantic_graph_studio.schemas import Event, RunHistoryPage, RunSnapshot, RunSummary
+from pydantic_graph_studio.snapshot import KEYFRAME_INTERVAL, RunReducer, state_at
+
+HISTORY_BATCH_SIZE = 512
+HISTORY_FLUSH_INTERVAL = 0.05
+HISTORY_PAGE_LIMIT = 500
+
+HistorySort = Literal["started_at", "duration"]
+
+_EVENT_ADAPTER: TypeAdapter[Event] = TypeAdapter(Event)
+_MAX_SEQ = 2**63 - 1
+_RUN_COLUMNS = "run_id, started_at, ended_at, duration, status, error, event_count"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    run_id TEXT PRIMARY KEY,
+    started_at REAL NOT NULL,
+    ended_at REAL,
+    duration REAL,
+    status TEXT NOT NULL,
+    error TEXT COLLATE NOCASE,
+    event_count INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS runs_started_at ON runs (started_at);
+CREATE INDEX IF NOT EXISTS runs_duration ON runs (duration);
+CREATE INDEX IF NOT EXISTS runs_status ON runs (status, started_at);
+CREATE INDEX IF NOT EXISTS runs_error ON runs (error);
+CREATE TABLE IF NOT EXISTS run_nodes (
+    node_id TEXT NOT NULL,
+    run_id TEXT NOT NULL,
+    visits INTEGER NOT NULL,
+    PRIMARY KEY (node_id, run_id)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS events (
+    run_id TEXT NOT NULL,
+    seq INTEGER NOT NULL,
+    recorded_at REAL NOT NULL,
+    event_type TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    PRIMARY KEY (run_id, seq)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS keyframes (
+    run_id TEXT NOT NULL,
+    seq INTEGER NOT NULL,
+    state TEXT NOT NULL,
+    PRIMARY KEY (run_id, seq)
+) WITHOUT ROWID;
+"""
+
+
+@dataclass(frozen=True, slots=True)
+class RecordedEvent:
+    """A stored event with its sequence number and the Unix time it was recorded at."""
+
+    seq: int
+    recorded_at: float
+    event: Event
+
+
+@dataclass(frozen=True, slots=True)
+class RunQuery:
+    """Filters for `RunHistoryStore.search`; unset fields do not constrain the result.
+
+    `error` matches error messages by case-insensitive prefix so the lookup can use the index.
+    """
+
+    status: str | None = None
+    node_id: str | None = None
+    error: str | None = None
+    started_after: float | None = None
+    started_before: float | None = None
+    min_duration: float | None = None
+    max_duration: float | None = None
+    sort: HistorySort = "started_at"
+    offset: int = 0
+    limit: int = 50
+
+
+class RunHistoryStore:
+    """Append-only run history in a SQLite database.
+
+    `run_started`, `record` and `run_finished` only enqueue work, so they are safe to call from the
+    event loop; a writer thread drains the queue and commits up to `HISTORY_BATCH_SIZE` operations per
+    transaction. The writer also reduces each run as it goes and stores a keyframe of the reduced state
+    every `KEYFRAME_INTERVAL` events for `state_at`. Queries open their own connection and are meant to
+    run in a worker thread.
+    """
+
+    def __init__(self, path: str | Path) -> None:
+        self.path = Path(path)
+        self._queue: queue.Queue[tuple[Any, ...] | None] = queue.Queue()
+        self._thread: threading.Thread | None = None
+        self._reducers: dict[str, RunReducer] = {}
+        self.dropped = 0
+
+    def open(self) -> None:
+        """Create the schema if needed and start the writer thread."""
+
+        if self._thread is not None:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        connection = self._connect()
+        try:
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.executescript(_SCHEMA)
+        finally:
+            connection.close()
+        self._thread = threading.Thread(target=self._write_loop, name="pgraph-history", daemon=True)
+        self._thread.start()
+
+    def close(self) -> None:
+        """Write out everything queued so far and stop the writer thread."""
+
+        thread = self._thread
+        if thread is None:
+            return
+        self._thread = None
+        self._queue.put(None)
+        thread.join()
+
+    def flush(self) -> None:
+        """Block until every queued operation has been committed."""
+
+        if self._thread is not None:
+            self._queue.join()
+
+    def run_started(self, run_id: str, *, started_at: float | None = None) -> None:
+        """Record a new run as running."""
+
+        self._enqueue(("start", run_id, time.time() if started_at is None else started_at))
+
+    def record(self, run_id: str, seq: int, event: Event, *, recorded_at: float | None = None) -> None:
+        """Append event number `seq` of a run."""
+
+        self._enqueue(("event", run_id, seq, time.time() if recorded_at is None else recorded_at, event))
+
+    def run_finished(
+        self,
+        run_id: str,
+        *,
+        status: str,
+        error: str | None,
+        event_count: int,
+        visit_counts: Mapping[str, int],
+        ended_at: float | None = None,
+    ) -> None:
+        """Record a run's outcome and the nodes it visited."""
+
+        ended_at = time.time() if ended_at is None else ended_at
+        self._enqueue(("finish", run_id, ended_at, status, error, event_count, dict(visit_counts)))
+
+    def search(self, query: RunQuery | None = None) -> RunHistoryPage:
+        """Return one page of runs matching `query`, newest (or longest) first."""
+
+        query = query or RunQuery()
+        clauses: list[str] = []
+        params: list[Any] = []
+        if query.status is not None:
+            clauses.append("status = ?")
+            params.append(query.status)
+        if query.node_id is not None:
+            clauses.append("run_id IN (SELECT run_id FROM run_nodes WHERE node_id = ?)")
+            params.append(query.node_id)
+        if query.error is not None:
+            clauses.append("error LIKE ? ESCAPE '\\'")
+            params.append(_escape_like(query.error) + "%")
+        if query.started_after is not None:
+            clauses.append("started_at >= ?")
+            params.append(query.started_after)
+        if query.started_before is not None:
+            clauses.append("started_at < ?")
+            params.append(query.started_before)
+        if query.min_duration is not None:
+            clauses.append("duration >= ?")
+            params.append(query.min_duration)
+        if query.max_duration is not None:
+            clauses.append("duration <= ?")
+            params.append(query.max_duration)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        order = "duration DESC, run_id" if query.sort == "duration" else "started_at DESC, run_id"
+
+        connection = self._connect()
+        try:
+            (total,) = connection.execute(f"SELECT count(*) FROM runs {where}", params).fetchone()
+            rows = connection.execute(
+                f"SELECT {_RUN_COLUMNS} FROM runs {where} ORDER BY {order} LIMIT ? OFFSET ?",
+                [*params, query.limit, query.offset],
+            ).fetchall()
+        finally:
+            connection.close()
+        return RunHistoryPage(total=total, offset=query.offset, items=[_summary(row) for row in rows])
+
+    def get_run(self, run_id: str) -> RunSummary | None:
+        """Return the summary of one stored run."""
+
+        connection = self._connect()
+        try:
+            row = connection.execute(f"SELECT {_RUN_COLUMNS} FROM runs WHERE run_id = ?", (run_id,)).fetchone()
+        finally:
+            connection.close()
+        return None if row is None else _summary(row)
+
+    def load_events(self, run_id: str, *, after: int = 0) -> list[RecordedEvent]:
+        """Return a stored run's events with a sequence number greater than `after`, in order."""
+
+        connection = self._connect()
+        try:
+            rows = connection.execute(
+                "SELECT seq, recorded_at, payload FROM events WHERE run_id = ? AND seq > ? ORDER BY seq",
+                (run_id, after),
+            ).fetchall()
+        finally:
+            connection.close()
+        return [
+            RecordedEvent(seq=seq, recorded_at=recorded_at, event=_EVENT_ADAPTER.validate_json(payload))
+            for seq, recorded_at, payload in rows
+        ]
+
+    def state_at(self, run_id: str, seq: int | None = None) -> RunSnapshot | None:
+        """Return a stored run's state after its first `seq` events (all of them by default).
+
+        Loads the nearest keyframe at or before `seq` and replays the events after it.
+        """
+
+        connection = self._connect()
+        try:
+            if connection.execute("SELECT 1 FROM runs WHERE run_id = ?", (run_id,)).fetchone() is None:
+                return None
+            end = _MAX_SEQ if seq is None else seq
+            row = connection.execute(
+                "SELECT seq, state FROM keyframes WHERE run_id = ? AND seq <= ? ORDER BY seq DESC LIMIT 1",
+                (run_id, end),
+            ).fetchone()
+            start = row[0] if row is not None else 0
+            rows = connection.execute(
+                "SELECT payload FROM events WHERE run_id = ? AND seq > ? AND seq <= ? ORDER BY seq",
+                (run_id, start, end),
+            ).fetchall()
+        finally:
+            connection.close()
+        keyframe = RunSnapshot.model_validate_json(row[1]) if row is not None else None
+        return state_at(run_id, keyframe, (_EVENT_ADAPTER.validate_json(payload) for (payload,) in rows))
+
+    def _connect(self) -> sqlite3.Connection:
+        connection = sqlite3.connect(self.path, timeout=30.0)
+        connection.execute("PRAGMA synchronous=NORMAL")
+        return connection
+
+    def _enqueue(self, item: tuple[Any, ...]) -> None:
+        if self._thread is not None:
+            self._queue.put_nowait(item)
+
+    def _write_loop(self) -> None:
+        connection = self._connect()
+        try:
+            while True:
+                batch = [self._queue.get()]
+                deadline = time.monotonic() + HISTORY_FLUSH_INTERVAL
+                while batch[-1] is not None and len(batch) < HISTORY_BATCH_SIZE:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    try:
+                        batch.append(self._queue.get(timeout=remaining))
+                    except queue.Empty:
+                        break
+                stopping = batch[-1] is None
+                try:
+                    self._write_batch(connection, [item for item in batch if item is not None])
+                except sqlite3.Error:
+                    # History is best effort: a failed batch is counted and dropped, never retried.
+                    self.dropped += len(batch) - stopping
+                finally:
+                    for _ in batch:
+                        self._queue.task_done()
+                if stopping:
+                    return
+        finally:
+            connection.close()
+
+    def _write_batch(self, connection: sqlite3.Connection, batch: list[tuple[Any, ...]]) -> None:
+        if not batch:
+            return
+        starts: list[tuple[Any, ...]] = []
+        events: list[tuple[Any, ...]] = []
+        finishes: list[tuple[Any, ...]] = []
+        visits: list[tuple[Any, ...]] = []
+        keyframes: list[tuple[Any, ...]] = []
+        for item in batch:
+            kind = item[0]
+            if kind == "start":
+                _, run_id, started_at = item
+                starts.append((run_id, started_at))
+            elif kind == "event":
+                _, run_id, seq, recorded_at, event = item
+                events.append((run_id, seq, recorded_at, event.event_type, event.model_dump_json()))
+                reducer = self._reducers.setdefault(run_id, RunReducer(run_id=run_id))
+                if reducer.apply(event) == seq and seq % KEYFRAME_INTERVAL == 0:
+                    keyframes.append((run_id, seq, reducer.snapshot().model_dump_json()))
+            else:
+                _, run_id, ended_at, status, error, event_count, visit_counts = item
+                finishes.append((ended_at, ended_at, status, error, event_count, run_id))
+                self._reducers.pop(run_id, None)
+                visits.extend((node_id, run_id, count) for node_id, count in visit_counts.items())
+        with connection:
+            connection.executemany(
+                "INSERT OR IGNORE INTO runs (run_id, started_at, status) VALUES (?, ?, 'running')",
+                starts,
+            )
+            connection.executemany(
+                "INSERT OR REPLACE INTO events (run_id, seq, recorded_at, event_type, payload) VALUES (?, ?, ?, ?, ?)",
+                events,
+            )
+            connection.executemany(
+                "UPDATE runs SET ended_at = ?, duration = ? - started_at, status = ?, error = ?, event_count = ? "
+                "WHERE run_id = ?",
+                finishes,
+            )
+            connection.executemany(
+                "INSERT OR REPLACE INTO keyframes (run_id, seq, state) VALUES (?, ?, ?)",
+                keyframes,
+            )
+            connection.executemany(
+                "INSERT OR REPLACE INTO run_nodes (node_id, run_id, visits) VALUES (?, ?, ?)",
+                visits,
+            )
+
+
+def _summary(row: tuple[Any, ...]) -> RunSummary:
+    run_id, started_at, ended_at, duration, status, error, event_count = row
+    return RunSummary(
+        run_id=run_id,
+        started_at=started_at,
+        ended_at=ended_at,
+        duration=duration,
+        status=status,
+        error=error,
+        event_count=event_count,
+    )
+
+
+def _escape_like(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
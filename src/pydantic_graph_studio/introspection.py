@@ -1,11 +1,18 @@
 from __future__ import annotations
 
-from collections.abc import Iterable, Mapping
+import hashlib
+import re
+import weakref
+from collections import defaultdict, deque
+from collections.abc import Callable, Iterable, Mapping
+from dataclasses import dataclass
 from typing import Any
 
 from pydantic_graph import Graph
 from pydantic_graph.nodes import NodeDef
 
+from pydantic_graph_studio.clusters import ClusterHierarchy, GroupPath, build_hierarchy
+from pydantic_graph_studio.layout import compute_layout
 from pydantic_graph_studio.schemas import GraphEdge, GraphModel, GraphNode
 
 BetaGraph: type[Any] | None = None
@@ -26,12 +33,37 @@ else:
     BetaGraph = _BetaGraph
 
 
-def build_graph_model(graph: Any) -> GraphModel:
-    """Build a GraphModel payload from a pydantic_graph.Graph instance."""
+@dataclass(frozen=True, slots=True)
+class SerializedGraph:
+    """Encoded graph payload with a content hash suitable for use as an HTTP ETag."""
 
-    if _is_beta_graph(graph):
-        return _build_beta_graph_model(graph)
+    body: bytes
+    etag: str
 
+
+CLUSTER_STRATEGIES: tuple[str, ...] = ("module", "prefix", "region")
+GRAPH_VIEW_CACHE_LIMIT = 128
+
+_serialized_graphs: dict[tuple[int, bool], tuple[weakref.ref[Any], SerializedGraph]] = {}
+_cluster_hierarchies: dict[tuple[int, str], tuple[weakref.ref[Any], ClusterHierarchy]] = {}
+_graph_node_ids: dict[int, tuple[weakref.ref[Any], tuple[str, ...]]] = {}
+_graph_views: dict[tuple[int, str, frozenset[str] | None, bool], tuple[weakref.ref[Any], SerializedGraph]] = {}
+_NAME_TOKEN = re.compile(r"[A-Z]?[a-z]+|[A-Z]+(?![a-z])")
+
+
+def build_graph_model(graph: Any, *, layout: bool = False) -> GraphModel:
+    """Build a GraphModel payload from a pydantic_graph.Graph instance.
+
+    With `layout=True` the model also carries server-computed node coordinates.
+    """
+
+    model = _build_beta_graph_model(graph) if _is_beta_graph(graph) else _build_v1_graph_model(graph)
+    if layout:
+        model.layout = compute_layout(model)
+    return model
+
+
+def _build_v1_graph_model(graph: Any) -> GraphModel:
     node_defs = _sorted_node_defs(graph.node_defs)
     nodes = _build_nodes(node_defs)
     edges = _build_edges(node_defs)
@@ -51,6 +83,241 @@ def serialize_graph(graph: Graph[Any, Any, Any]) -> dict[str, Any]:
     return build_graph_model(graph).model_dump(mode="json")
 
 
+def serialize_graph_json(graph: Any, *, layout: bool = False) -> SerializedGraph:
+    """Return the JSON-encoded graph payload, computed once per graph instance.
+
+    Graphs are treated as immutable once built, so the encoded bytes (including the optional
+    layout) are cached until the graph is garbage collected.
+    """
+
+    def _serialize() -> SerializedGraph:
+        return _serialized(build_graph_model(graph, layout=layout).model_dump_json().encode("utf-8"))
+
+    return _cached_per_graph(_serialized_graphs, (id(graph), layout), graph, _serialize)
+
+
+def graph_node_ids(graph: Any) -> tuple[str, ...]:
+    """Return the graph's node ids in `GraphModel.nodes` order, computed once per graph instance."""
+
+    def _build() -> tuple[str, ...]:
+        return tuple(node.node_id for node in build_graph_model(graph).nodes)
+
+    return _cached_per_graph(_graph_node_ids, id(graph), graph, _build)
+
+
+def build_cluster_hierarchy(graph: Any, strategy: str = "module") -> ClusterHierarchy:
+    """Group a graph's nodes into a cluster hierarchy, computed once per graph and strategy.
+
+    `module` groups by the Python module defining each node, `prefix` by the leading word of the
+    node id, and `region` (beta graphs only) by the nodes between each fork and its join.
+    """
+
+    if strategy not in CLUSTER_STRATEGIES:
+        raise ValueError(f"Unknown cluster strategy '{strategy}'. Expected one of: {', '.join(CLUSTER_STRATEGIES)}")
+    beta = _is_beta_graph(graph)
+    if strategy == "region" and not beta:
+        raise ValueError("The region cluster strategy requires a beta graph")
+
+    def _build() -> ClusterHierarchy:
+        model = build_graph_model(graph)
+        labels: dict[GroupPath, str] = {}
+        if strategy == "module":
+            paths = _beta_module_paths(graph) if beta else _v1_module_paths(graph)
+        elif strategy == "prefix":
+            paths = _prefix_paths(model)
+        else:
+            paths, labels = _beta_region_paths(graph, model)
+        return build_hierarchy(model, strategy, paths, labels=labels)
+
+    return _cached_per_graph(_cluster_hierarchies, (id(graph), strategy), graph, _build)
+
+
+def serialize_graph_view_json(
+    graph: Any,
+    *,
+    strategy: str = "module",
+    expanded: Iterable[str] | None = None,
+    layout: bool = False,
+) -> SerializedGraph:
+    """Return the JSON-encoded clustered view of a graph with the given clusters expanded.
+
+    The most recently requested `GRAPH_VIEW_CACHE_LIMIT` views (with their layout and ETag) are cached
+    until the graph is garbage collected.
+    """
+
+    hierarchy = build_cluster_hierarchy(graph, strategy)
+    expanded_key = frozenset(expanded) if expanded is not None else None
+
+    def _serialize() -> SerializedGraph:
+        view = hierarchy.view(expanded_key)
+        if layout:
+            view.graph.layout = compute_layout(view.graph)
+        return _serialized(view.model_dump_json().encode("utf-8"))
+
+    key = (id(graph), strategy, expanded_key, layout)
+    return _cached_per_graph(_graph_views, key, graph, _serialize, limit=GRAPH_VIEW_CACHE_LIMIT)
+
+
+def _serialized(body: bytes) -> SerializedGraph:
+    return SerializedGraph(body=body, etag=f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"')
+
+
+def _cached_per_graph[T](
+    cache: dict[Any, tuple[weakref.ref[Any], T]],
+    key: Any,
+    graph: Any,
+    factory: Callable[[], T],
+    *,
+    limit: int | None = None,
+) -> T:
+    # Graphs are unhashable, so entries are keyed by id() and dropped when the graph is collected.
+    cached = cache.get(key)
+    if cached is not None and cached[0]() is graph:
+        if limit is not None:
+            # Keep the dict in least recently used order so trimming drops the stalest entries.
+            cache[key] = cache.pop(key)
+        return cached[1]
+
+    value = factory()
+
+    def _evict(ref: weakref.ref[Any]) -> None:
+        entry = cache.get(key)
+        if entry is not None and entry[0] is ref:
+            del cache[key]
+
+    cache[key] = (weakref.ref(graph, _evict), value)
+    while limit is not None and len(cache) > limit:
+        del cache[next(iter(cache))]
+    return value
+
+
+def _v1_module_paths(graph: Any) -> dict[str, GroupPath]:
+    return {
+        node_id: tuple(node_def.node.__module__.split("."))
+        for node_id, node_def in graph.node_defs.items()
+        if getattr(node_def.node, "__module__", None)
+    }
+
+
+def _beta_module_paths(graph: Any) -> dict[str, GroupPath]:
+    paths: dict[str, GroupPath] = {}
+    for node_id, node in graph.nodes.items():
+        if isinstance(node, BetaNodeStep):
+            module = node.node_type.__module__
+        elif isinstance(node, BetaStep):
+            module = getattr(node.call, "__module__", None)
+        else:
+            continue
+        if module:
+            paths[str(node_id)] = tuple(module.split("."))
+    return paths
+
+
+def _prefix_paths(model: GraphModel) -> dict[str, GroupPath]:
+    paths: dict[str, GroupPath] = {}
+    for node in model.nodes:
+        match = _NAME_TOKEN.search(node.node_id)
+        if match is not None:
+            paths[node.node_id] = (match.group(0),)
+    return paths
+
+
+def _beta_region_paths(graph: Any, model: GraphModel) -> tuple[dict[str, GroupPath], dict[GroupPath, str]]:
+    successors: dict[str, list[str]] = defaultdict(list)
+    predecessors: dict[str, list[str]] = defaultdict(list)
+    for edge in model.edges:
+        if edge.target_node_id is not None:
+            successors[edge.source_node_id].append(edge.target_node_id)
+            predecessors[edge.target_node_id].append(edge.source_node_id)
+
+    if not model.entry_nodes:
+        return {}, {}
+    dominators = _immediate_dominators(model.entry_nodes[0], successors, predecessors)
+    forks = {str(node_id) for node_id, node in graph.nodes.items() if isinstance(node, BetaFork)}
+    joins = sorted(str(node_id) for node_id, node in graph.nodes.items() if isinstance(node, BetaJoin))
+
+    regions: list[tuple[str, str, set[str]]] = []
+    for join_id in joins:
+        # A join closes the nearest fork that dominates it; the region is everything in between.
+        fork_id = dominators.get(join_id)
+        while fork_id is not None and fork_id not in forks:
+            fork_id = dominators.get(fork_id)
+        if fork_id is None:
+            continue
+        members = _reachable(fork_id, successors, stop=join_id) & _reachable(join_id, predecessors, stop=fork_id)
+        regions.append((fork_id, join_id, members))
+
+    paths: dict[str, GroupPath] = {}
+    labels: dict[GroupPath, str] = {}
+    for fork_id, join_id, members in sorted(regions, key=lambda region: -len(region[2])):
+        for node_id in members:
+            path = (*paths.get(node_id, ()), f"{fork_id}..{join_id}")
+            paths[node_id] = path
+            labels[path] = f"{fork_id} → {join_id}"
+    return paths, labels
+
+
+def _immediate_dominators(
+    entry: str,
+    successors: Mapping[str, list[str]],
+    predecessors: Mapping[str, list[str]],
+) -> dict[str, str | None]:
+    """Cooper-Harvey-Kennedy iterative dominators over the nodes reachable from `entry`."""
+
+    postorder: list[str] = []
+    visited = {entry}
+    stack = [(entry, iter(successors.get(entry, ())))]
+    while stack:
+        node_id, children = stack[-1]
+        child = next(children, None)
+        if child is None:
+            postorder.append(node_id)
+            stack.pop()
+        elif child not in visited:
+            visited.add(child)
+            stack.append((child, iter(successors.get(child, ()))))
+
+    order = {node_id: index for index, node_id in enumerate(postorder)}
+    idom: dict[str, str] = {entry: entry}
+
+    def intersect(left: str, right: str) -> str:
+        while left != right:
+            while order[left] < order[right]:
+                left = idom[left]
+            while order[right] < order[left]:
+                right = idom[right]
+        return left
+
+    changed = True
+    while changed:
+        changed = False
+        for node_id in reversed(postorder):
+            if node_id == entry:
+                continue
+            processed = [pred for pred in predecessors.get(node_id, ()) if pred in idom]
+            if not processed:
+                continue
+            candidate = processed[0]
+            for pred in processed[1:]:
+                candidate = intersect(candidate, pred)
+            if idom.get(node_id) != candidate:
+                idom[node_id] = candidate
+                changed = True
+
+    return {node_id: (None if node_id == entry else parent) for node_id, parent in idom.items()}
+
+
+def _reachable(start: str, adjacency: Mapping[str, list[str]], *, stop: str) -> set[str]:
+    seen = {start, stop}
+    queue = deque([start])
+    while queue:
+        for neighbor in adjacency.get(queue.popleft(), ()):
+            if neighbor not in seen:
+                seen.add(neighbor)
+                queue.append(neighbor)
+    return seen
+
+
 def _sorted_node_defs(node_defs: Mapping[str, NodeDef[Any, Any, Any]]) -> list[NodeDef[Any, Any, Any]]:
     return [node_defs[node_id] for node_id in sorted(node_defs.keys())]
 
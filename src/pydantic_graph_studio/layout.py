@@ -0,0 +1,290 @@
+"""Layered (Sugiyama-style) layout for graph models, computed on the server."""
+
+from __future__ import annotations
+
+from collections import defaultdict, deque
+from dataclasses import dataclass
+
+from pydantic_graph_studio.schemas import GraphLayout, GraphModel, NodeLayout
+
+RANK_SEPARATION = 120.0
+NODE_SEPARATION = 70.0
+MARGIN = 40.0
+SIDE_LANE_OFFSET = 120.0
+SIDE_LANE_SPACING = 36.0
+ORDERING_SWEEPS = 4
+DYNAMIC_LABEL = "Dynamic target"
+
+
+@dataclass(slots=True)
+class _LayoutNode:
+    node_id: str
+    width: float
+    height: float
+    layer: int = 0
+    order: int = 0
+    center_x: float = 0.0
+    top: float = 0.0
+
+
+def dynamic_target_id(source_node_id: str) -> str:
+    """Return the id of the placeholder node drawn for a source's dynamic edge."""
+
+    return f"dynamic-{source_node_id}"
+
+
+def estimate_node_size(label: str, *, badges: int) -> tuple[float, float]:
+    """Estimate the rendered size of a studio node, mirroring `estimateNodeSize` in `app.js`."""
+
+    width = min(260.0, max(160.0, len(label) * 7 + 90.0))
+    height = 64.0 + badges * 18.0
+    return width, height
+
+
+def compute_layout(model: GraphModel) -> GraphLayout:
+    """Compute top-to-bottom layered coordinates for every node and routing hints for long edges."""
+
+    nodes, edges = _layout_inputs(model)
+    if not nodes:
+        return GraphLayout(nodes=[], edge_route_x=[], width=0.0, height=0.0)
+
+    forward = _acyclic_edges(nodes, edges, model.entry_nodes)
+    layers = _assign_layers(nodes, forward)
+    _order_layers(nodes, layers, forward)
+    _assign_coordinates(nodes, layers, forward)
+    route_x = _route_edges(nodes, layers, edges)
+
+    min_left = min(node.center_x - node.width / 2 for node in nodes.values())
+    shift = MARGIN - min_left
+    for node in nodes.values():
+        node.center_x += shift
+    route_x = [value + shift if value is not None else None for value in route_x]
+
+    width = max(node.center_x + node.width / 2 for node in nodes.values()) + MARGIN
+    height = max(node.top + node.height for node in nodes.values()) + MARGIN
+    return GraphLayout(
+        nodes=[
+            NodeLayout(
+                node_id=node.node_id,
+                x=round(node.center_x - node.width / 2, 2),
+                y=round(node.top, 2),
+                width=node.width,
+                height=node.height,
+            )
+            for node in nodes.values()
+        ],
+        edge_route_x=[round(value, 2) if value is not None else None for value in route_x],
+        width=round(width, 2),
+        height=round(height, 2),
+    )
+
+
+def _layout_inputs(model: GraphModel) -> tuple[dict[str, _LayoutNode], list[tuple[str, str]]]:
+    entry = set(model.entry_nodes)
+    terminal = set(model.terminal_nodes)
+    nodes: dict[str, _LayoutNode] = {}
+    for graph_node in model.nodes:
+        node_id = graph_node.node_id
+        badges = (node_id in entry) + (node_id in terminal)
+        width, height = estimate_node_size(graph_node.label or node_id, badges=badges)
+        nodes[node_id] = _LayoutNode(node_id=node_id, width=width, height=height)
+
+    edges: list[tuple[str, str]] = []
+    for edge in model.edges:
+        target = edge.target_node_id
+        if target is None:
+            target = dynamic_target_id(edge.source_node_id)
+            if target not in nodes:
+                width, height = estimate_node_size(DYNAMIC_LABEL, badges=1)
+                nodes[target] = _LayoutNode(node_id=target, width=width, height=height)
+        elif target not in nodes:
+            width, height = estimate_node_size(target, badges=0)
+            nodes[target] = _LayoutNode(node_id=target, width=width, height=height)
+        if edge.source_node_id not in nodes:
+            width, height = estimate_node_size(edge.source_node_id, badges=0)
+            nodes[edge.source_node_id] = _LayoutNode(node_id=edge.source_node_id, width=width, height=height)
+        edges.append((edge.source_node_id, target))
+    return nodes, edges
+
+
+def _acyclic_edges(
+    nodes: dict[str, _LayoutNode],
+    edges: list[tuple[str, str]],
+    entry_nodes: list[str],
+) -> dict[str, list[str]]:
+    """Drop self loops and back edges found by a DFS from the entry nodes."""
+
+    adjacency: dict[str, list[str]] = defaultdict(list)
+    for source, target in edges:
+        if source != target:
+            adjacency[source].append(target)
+
+    forward: dict[str, list[str]] = defaultdict(list)
+    state: dict[str, int] = {}
+    roots = [node_id for node_id in entry_nodes if node_id in nodes] + list(nodes)
+    for root in roots:
+        if root in state:
+            continue
+        state[root] = 1
+        stack = [(root, iter(adjacency.get(root, ())))]
+        while stack:
+            node_id, children = stack[-1]
+            child = next(children, None)
+            if child is None:
+                state[node_id] = 2
+                stack.pop()
+                continue
+            child_state = state.get(child)
+            if child_state == 1:
+                continue
+            forward[node_id].append(child)
+            if child_state is None:
+                state[child] = 1
+                stack.append((child, iter(adjacency.get(child, ()))))
+    return forward
+
+
+def _assign_layers(nodes: dict[str, _LayoutNode], forward: dict[str, list[str]]) -> list[list[_LayoutNode]]:
+    """Longest-path layering over the acyclic edge set."""
+
+    indegree = dict.fromkeys(nodes, 0)
+    for targets in forward.values():
+        for target in targets:
+            indegree[target] += 1
+    queue = deque(node_id for node_id, degree in indegree.items() if degree == 0)
+    while queue:
+        node_id = queue.popleft()
+        layer = nodes[node_id].layer + 1
+        for target in forward.get(node_id, ()):
+            target_node = nodes[target]
+            if target_node.layer < layer:
+                target_node.layer = layer
+            indegree[target] -= 1
+            if indegree[target] == 0:
+                queue.append(target)
+
+    layers: list[list[_LayoutNode]] = [[] for _ in range(max(node.layer for node in nodes.values()) + 1)]
+    for node in nodes.values():
+        layers[node.layer].append(node)
+    return layers
+
+
+def _order_layers(
+    nodes: dict[str, _LayoutNode],
+    layers: list[list[_LayoutNode]],
+    forward: dict[str, list[str]],
+) -> None:
+    """Reduce crossings with alternating barycenter sweeps."""
+
+    incoming: dict[str, list[str]] = defaultdict(list)
+    for source, targets in forward.items():
+        for target in targets:
+            incoming[target].append(source)
+
+    for layer in layers:
+        for index, node in enumerate(layer):
+            node.order = index
+
+    def sweep(layer: list[_LayoutNode], neighbors: dict[str, list[str]]) -> None:
+        def barycenter(node: _LayoutNode) -> float:
+            linked = neighbors.get(node.node_id)
+            if not linked:
+                return float(node.order)
+            return sum(nodes[other].order for other in linked) / len(linked)
+
+        layer.sort(key=lambda node: (barycenter(node), node.order))
+        for index, node in enumerate(layer):
+            node.order = index
+
+    for _ in range(ORDERING_SWEEPS):
+        for layer in layers[1:]:
+            sweep(layer, incoming)
+        for layer in reversed(layers[:-1]):
+            sweep(layer, forward)
+
+
+def _assign_coordinates(
+    nodes: dict[str, _LayoutNode],
+    layers: list[list[_LayoutNode]],
+    forward: dict[str, list[str]],
+) -> None:
+    """Place each node under the mean of its parents, then remove overlaps within the layer."""
+
+    incoming: dict[str, list[str]] = defaultdict(list)
+    for source, targets in forward.items():
+        for target in targets:
+            incoming[target].append(source)
+
+    top = MARGIN
+    for layer in layers:
+        if not layer:
+            continue
+        desired: list[float] = []
+        previous: float | None = None
+        for node in layer:
+            parents = incoming.get(node.node_id)
+            if parents:
+                value = sum(nodes[parent].center_x for parent in parents) / len(parents)
+            elif previous is not None:
+                value = previous + NODE_SEPARATION + node.width
+            else:
+                value = 0.0
+            desired.append(value)
+            previous = value
+
+        placed: list[float] = []
+        for index, node in enumerate(layer):
+            value = desired[index]
+            if index:
+                left = layer[index - 1]
+                value = max(value, placed[-1] + (left.width + node.width) / 2 + NODE_SEPARATION)
+            placed.append(value)
+        shift = sum(want - got for want, got in zip(desired, placed, strict=True)) / len(layer)
+
+        layer_height = max(node.height for node in layer)
+        for node, value in zip(layer, placed, strict=True):
+            node.center_x = value + shift
+            node.top = top + (layer_height - node.height) / 2
+        top += layer_height + RANK_SEPARATION
+
+
+def _route_edges(
+    nodes: dict[str, _LayoutNode],
+    layers: list[list[_LayoutNode]],
+    edges: list[tuple[str, str]],
+) -> list[float | None]:
+    """Send edges that would cut through intermediate layers, or point upwards, into side lanes."""
+
+    bounds = [
+        (layer[0].center_x - layer[0].width / 2, layer[-1].center_x + layer[-1].width / 2) if layer else None
+        for layer in layers
+    ]
+    global_min = min(node.center_x - node.width / 2 for node in nodes.values())
+    global_max = max(node.center_x + node.width / 2 for node in nodes.values())
+    left_lanes = 0
+    right_lanes = 0
+
+    routes: list[float | None] = []
+    for source_id, target_id in edges:
+        source = nodes[source_id]
+        target = nodes[target_id]
+        span = target.layer - source.layer
+        if span == 1:
+            routes.append(None)
+            continue
+        needs_detour = span <= 0
+        if not needs_detour:
+            center = (source.center_x + target.center_x) / 2
+            for layer_bounds in bounds[source.layer + 1 : target.layer]:
+                if layer_bounds is not None and layer_bounds[0] <= center <= layer_bounds[1]:
+                    needs_detour = True
+                    break
+        if not needs_detour:
+            routes.append(None)
+        elif source.center_x >= target.center_x:
+            right_lanes += 1
+            routes.append(global_max + SIDE_LANE_OFFSET + (right_lanes - 1) * SIDE_LANE_SPACING)
+        else:
+            left_lanes += 1
+            routes.append(global_min - SIDE_LANE_OFFSET - (left_lanes - 1) * SIDE_LANE_SPACING)
+    return routes
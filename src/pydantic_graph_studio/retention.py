@@ -0,0 +1,91 @@
+"""When the run registry lets go of runs nobody is watching: TTLs and a memory budget for buffered events."""
+
+from __future__ import annotations
+
+from collections.abc import Iterable
+from dataclasses import dataclass
+from typing import Literal
+
+EVICTION_REASONS = ("idle", "expired", "count", "memory")
+
+type EvictionReason = Literal["idle", "expired", "count", "memory"]
+
+
+@dataclass(frozen=True, slots=True)
+class RetentionPolicy:
+    """Limits on how long, and in how much memory, the registry keeps runs without subscribers.
+
+    An active run nobody has streamed or queried for `idle_ttl` seconds is cancelled and dropped
+    (`idle`); a finished run nobody has read for `finished_ttl` seconds is dropped (`expired`). Beyond
+    `max_finished` finished runs, the least recently read unwatched ones are dropped (`count`). While
+    the events, tool activity and keyframes buffered by all runs exceed `memory_budget` bytes,
+    unwatched finished runs are dropped, least recently read first (`memory`); the budget bounds kept
+    history, so it never stops a run that is still executing. Runs with a subscriber are never
+    evicted. The reaper checks every `reap_interval` seconds; None disables a limit. With
+    `abandon_grace`, a run whose last subscriber disconnects is cancelled unless someone subscribes
+    again within that many seconds. An app created with `retention=None` keeps every run, finished
+    ones included, until shutdown.
+    """
+
+    idle_ttl: float | None = 600.0
+    finished_ttl: float | None = 600.0
+    memory_budget: int | None = 256 * 1024 * 1024
+    reap_interval: float = 5.0
+    abandon_grace: float | None = None
+    max_finished: int | None = None
+
+    def __post_init__(self) -> None:
+        for name in ("idle_ttl", "finished_ttl", "memory_budget", "abandon_grace", "max_finished"):
+            value = getattr(self, name)
+            if value is not None and value < 0:
+                raise ValueError(f"{name} must not be negative")
+        if self.reap_interval <= 0:
+            raise ValueError("reap_interval must be positive")
+
+
+@dataclass(frozen=True, slots=True)
+class RetainedRun:
+    """What the reaper needs to know about one registered run; `last_access` is a monotonic time."""
+
+    run_id: str
+    finished: bool
+    subscribers: int
+    last_access: float
+    nbytes: int
+
+
+def plan_evictions(
+    runs: Iterable[RetainedRun],
+    policy: RetentionPolicy,
+    now: float,
+) -> list[tuple[str, EvictionReason]]:
+    """Return the runs to evict under `policy` at monotonic time `now`, each with the reason why."""
+
+    evictions: list[tuple[str, EvictionReason]] = []
+    kept: list[RetainedRun] = []
+    for run in runs:
+        unread = now - run.last_access
+        if run.subscribers:
+            kept.append(run)
+        elif run.finished and policy.finished_ttl is not None and unread > policy.finished_ttl:
+            evictions.append((run.run_id, "expired"))
+        elif not run.finished and policy.idle_ttl is not None and unread > policy.idle_ttl:
+            evictions.append((run.run_id, "idle"))
+        else:
+            kept.append(run)
+    droppable = sorted((run for run in kept if run.finished and not run.subscribers), key=lambda run: run.last_access)
+    if policy.max_finished is not None:
+        excess = max(sum(run.finished for run in kept) - policy.max_finished, 0)
+        dropped, droppable = droppable[:excess], droppable[excess:]
+        evictions.extend((run.run_id, "count") for run in dropped)
+        dropped_ids = {run.run_id for run in dropped}
+        kept = [run for run in kept if run.run_id not in dropped_ids]
+    if policy.memory_budget is None:
+        return evictions
+    buffered = sum(run.nbytes for run in kept)
+    for run in droppable:
+        if buffered <= policy.memory_budget:
+            break
+        evictions.append((run.run_id, "memory"))
+        buffered -= run.nbytes
+    return evictions
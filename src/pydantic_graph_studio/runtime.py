@@ -342,8 +342,12 @@ async def iter_run_events(
     inputs: Any = None,
     run_id: str | None = None,
     interaction: InteractionHub | None = None,
+    on_output: Callable[[Any], None] | None = None,
 ) -> AsyncIterator[Event]:
-    """Yield an ordered stream of runtime events for a graph run."""
+    """Yield an ordered stream of runtime events for a graph run.
+
+    `on_output` is called with the run's output once it completes, before the stream ends.
+    """
 
     if _is_beta_graph(graph):
         async for event in _iter_run_events_beta(
@@ -353,6 +357,7 @@ async def iter_run_events(
             inputs=inputs,
             run_id=run_id,
             interaction=interaction,
+            on_output=on_output,
         ):
             yield event
         return
@@ -427,11 +432,13 @@ async def iter_run_events(
         node: BaseNode[Any, Any, Any],
         exc: BaseException,
     ) -> None:
+        if _is_cancellation(exc):
+            return
         await emit(
             ErrorEvent(
                 run_id=run_id,
                 event_type="error",
-                message=str(exc),
+                message=_error_message(exc),
                 node_id=node.get_node_id(),
             )
         )
@@ -447,7 +454,7 @@ async def iter_run_events(
 
     async def _run() -> None:
         try:
-            await run_instrumented(
+            result = await run_instrumented(
                 graph,
                 start_node,
                 state=state,
@@ -455,13 +462,18 @@ async def iter_run_events(
                 persistence=persistence,
                 hooks=hooks,
             )
+            if on_output is not None:
+                on_output(result.output)
         except BaseException as exc:
+            if _is_cancellation(exc):
+                # A cancelled run has not failed; whoever cancelled it reports the cancellation.
+                raise
             if not done.is_set():
                 await emit(
                     ErrorEvent(
                         run_id=run_id,
                         event_type="error",
-                        message=str(exc),
+                        message=_error_message(exc),
                         node_id=None,
                     )
                 )
@@ -475,6 +487,8 @@ async def iter_run_events(
                 break
             event = await queue.get()
             yield event
+        # `done` is set from inside the last node, so let the run wind down and report its output.
+        await task
     finally:
         if not task.done():
             task.cancel()
@@ -482,6 +496,22 @@ async def iter_run_events(
             await task
 
 
+def _is_cancellation(exc: BaseException) -> bool:
+    """Whether `exc` cancels the current task, rather than being a `CancelledError` raised by code it awaited.
+
+    A node whose inner `wait_for` or client call was cancelled sees a `CancelledError` too, but its run
+    has failed and must still end with an `error` event.
+    """
+    if not isinstance(exc, asyncio.CancelledError):
+        return False
+    task = asyncio.current_task()
+    return task is not None and task.cancelling() > 0
+
+
+def _error_message(exc: BaseException) -> str:
+    return str(exc) or type(exc).__name__
+
+
 def _is_beta_graph(graph: Any) -> bool:
     return BetaGraph is not None and isinstance(graph, BetaGraph)
 
@@ -494,6 +524,7 @@ async def _iter_run_events_beta(
     inputs: Any = None,
     run_id: str | None = None,
     interaction: InteractionHub | None = None,
+    on_output: Callable[[Any], None] | None = None,
 ) -> AsyncIterator[Event]:
     if run_id is None:
         run_id = uuid4().hex
@@ -523,14 +554,15 @@ async def _iter_run_events_beta(
                     try:
                         result = await original_run_task(task)
                     except BaseException as exc:
-                        await emit(
-                            ErrorEvent(
-                                run_id=run_id,
-                                event_type="error",
-                                message=str(exc),
-                                node_id=node_id,
+                        if not _is_cancellation(exc):
+                            await emit(
+                                ErrorEvent(
+                                    run_id=run_id,
+                                    event_type="error",
+                                    message=_error_message(exc),
+                                    node_id=node_id,
+                                )
                             )
-                        )
                         raise
                     await emit(NodeEndEvent(run_id=run_id, event_type="node_end", node_id=node_id))
 
@@ -562,13 +594,18 @@ async def _iter_run_events_beta(
 
                 async for _item in graph_run:
                     pass
+                if on_output is not None:
+                    on_output(graph_run.output)
         except BaseException as exc:
+            if _is_cancellation(exc):
+                # A cancelled run has not failed; whoever cancelled it reports the cancellation.
+                raise
             if not done.is_set():
                 await emit(
                     ErrorEvent(
                         run_id=run_id,
                         event_type="error",
-                        message=str(exc),
+                        message=_error_message(exc),
                         node_id=None,
                     )
                 )
@@ -582,6 +619,8 @@ async def _iter_run_events_beta(
                 break
             event = await queue.get()
             yield event
+        # `done` is set from inside the last node, so let the run wind down and report its output.
+        await task
     finally:
         if not task.done():
             task.cancel()
@@ -2,7 +2,7 @@ from __future__ import annotations
 
 from typing import Annotated, Any, Literal
 
-from pydantic import BaseModel, Field, TypeAdapter
+from pydantic import BaseModel, ConfigDict, Field, TypeAdapter
 
 
 class GraphNode(BaseModel):
@@ -20,6 +20,30 @@ class GraphEdge(BaseModel):
     dynamic: bool = False
 
 
+class NodeLayout(BaseModel):
+    """Top-left position and size of a node in a server-computed layout."""
+
+    node_id: str
+    x: float
+    y: float
+    width: float
+    height: float
+
+
+class GraphLayout(BaseModel):
+    """Server-computed node coordinates and edge routing hints.
+
+    `nodes` also covers the `dynamic-<source>` placeholder targets drawn for dynamic edges, and
+    `edge_route_x` is parallel to `GraphModel.edges`, holding the x coordinate of the vertical
+    segment for edges that must detour around intermediate layers.
+    """
+
+    nodes: list[NodeLayout]
+    edge_route_x: list[float | None]
+    width: float
+    height: float
+
+
 class GraphModel(BaseModel):
     """Container for the full graph payload."""
 
@@ -27,6 +51,30 @@ class GraphModel(BaseModel):
     edges: list[GraphEdge]
     entry_nodes: list[str]
     terminal_nodes: list[str]
+    layout: GraphLayout | None = None
+
+
+class GraphCluster(BaseModel):
+    """A collapsed group of nodes shown as a single element in a clustered graph view."""
+
+    cluster_id: str
+    label: str
+    parent_id: str | None = None
+    node_count: int
+
+
+class GraphView(BaseModel):
+    """Visible slice of a clustered graph.
+
+    `graph` contains the visible nodes plus one node per collapsed cluster (keyed by `cluster_id`).
+    Its edges are aggregated between visible elements, and `edge_counts` is parallel to `graph.edges`.
+    """
+
+    strategy: str
+    graph: GraphModel
+    clusters: list[GraphCluster]
+    expanded: list[str]
+    edge_counts: list[int]
 
 
 class EventBase(BaseModel):
@@ -113,6 +161,29 @@ class ErrorEvent(EventBase):
     node_id: str | None = None
 
 
+class RunQueuedEvent(EventBase):
+    """Emitted when a run has to wait for a free slot; `position` is its 1-based place in line."""
+
+    event_type: Literal["run_queued"]
+    priority: str
+    position: int
+
+
+class RunAdmittedEvent(EventBase):
+    """Emitted when a queued run starts executing, after waiting `waited` seconds."""
+
+    event_type: Literal["run_admitted"]
+    priority: str
+    waited: float
+
+
+class RunCancelledEvent(EventBase):
+    """Emitted when a run is stopped before it finished, e.g. `requested` or `abandoned` by its subscribers."""
+
+    event_type: Literal["cancelled"]
+    reason: str
+
+
 Event = Annotated[
     NodeStartEvent
     | NodeEndEvent
@@ -122,11 +193,160 @@ Event = Annotated[
     | ToolResultEvent
     | InputRequestEvent
     | InputResponseEvent
-    | ErrorEvent,
+    | ErrorEvent
+    | RunQueuedEvent
+    | RunAdmittedEvent
+    | RunCancelledEvent,
     Field(discriminator="event_type"),
 ]
 
 
+class BlobRef(BaseModel):
+    """Stands in for a large event payload kept in the blob store; fetch it from `/api/blobs/{blob}`.
+
+    Serialized with the `$blob` key, so clients tell a reference apart from an inline payload.
+    """
+
+    model_config = ConfigDict(populate_by_name=True)
+
+    blob: str = Field(alias="$blob")
+    size: int
+    preview: str
+
+
+class ToolActivity(BaseModel):
+    """Latest known state of one tool call, numbered by the order in which calls started."""
+
+    index: int
+    call_id: str
+    node_id: str
+    tool_name: str
+    arguments: Any = None
+    output: Any = None
+    success: bool | None = None
+    completed: bool = False
+
+
+class ToolActivityPage(BaseModel):
+    """A window of a run's tool activity in call order; `total` counts every call so far."""
+
+    run_id: str
+    total: int
+    offset: int
+    items: list[ToolActivity]
+
+
+class RunProgress(BaseModel):
+    """Running totals for a run."""
+
+    nodes_started: int = 0
+    nodes_finished: int = 0
+    edges_taken: int = 0
+    tool_calls: int = 0
+    tool_results: int = 0
+
+
+class RunSnapshot(BaseModel):
+    """Reduced state of a run after its first `seq` events.
+
+    Stream `/api/events` with `after=seq` to continue from the snapshot without replaying history.
+    `node_status` only lists nodes that have run; every other node is idle. `tools_total` counts the
+    tool calls seen so far, numbered like `ToolActivity.index`.
+    """
+
+    run_id: str
+    seq: int
+    status: Literal["queued", "running", "completed", "failed", "cancelled"]
+    node_status: dict[str, Literal["active", "done", "error"]]
+    visit_counts: dict[str, int]
+    last_edge: GraphEdge | None = None
+    open_tool_calls: list[ToolActivity]
+    pending_inputs: list[InputRequestEvent]
+    progress: RunProgress
+    tools_total: int = 0
+    error: str | None = None
+
+
+class RunSummary(BaseModel):
+    """A run recorded in the history store; times are Unix timestamps in seconds."""
+
+    run_id: str
+    started_at: float
+    ended_at: float | None = None
+    duration: float | None = None
+    status: Literal["running", "completed", "failed", "cancelled"]
+    error: str | None = None
+    event_count: int = 0
+
+
+class RunHistoryPage(BaseModel):
+    """A page of stored runs; `total` counts every run matching the query."""
+
+    total: int
+    offset: int
+    items: list[RunSummary]
+
+
+class AdmissionMetrics(BaseModel):
+    """Run admission counters; `queued_total` counts the admitted runs that had to wait first."""
+
+    max_running: int
+    max_queued: int
+    running: int
+    queued: int
+    queued_by_priority: dict[str, int]
+    admitted_total: int
+    queued_total: int
+    rejected_total: int
+    queue_wait_seconds_total: float
+    queue_wait_seconds_max: float
+
+
+class ServerMetrics(BaseModel):
+    """Registry counters served by `/api/metrics`.
+
+    `buffered_bytes` approximates the memory held by the events, tool activity and keyframes of
+    every registered run, and `evictions` counts the runs dropped by the reaper per reason (`idle`,
+    `expired`, `count` or `memory`). `admission` is None when runs are not limited.
+    """
+
+    active_runs: int
+    finished_runs: int
+    buffered_bytes: int = 0
+    memory_budget: int | None = None
+    evictions: dict[str, int] = Field(default_factory=dict)
+    admission: AdmissionMetrics | None = None
+
+
+class BatchRunSummary(BaseModel):
+    """Outcome of one run of a batch; `output` references the run's final output in the blob store.
+
+    `duration` counts the seconds from the run's start, including any wait for admission, to its end.
+    """
+
+    index: int
+    run_id: str | None = None
+    status: Literal["pending", "running", "completed", "failed", "cancelled"]
+    duration: float | None = None
+    error: str | None = None
+    output: BlobRef | None = None
+
+
+class BatchProgress(BaseModel):
+    """Aggregated progress of a batch of runs, with one summary per item in request order."""
+
+    batch_id: str
+    total: int
+    concurrency: int
+    pending: int
+    running: int
+    completed: int
+    failed: int
+    cancelled: int
+    done: bool
+    runs: list[BatchRunSummary]
+
+
 def graph_schema() -> dict[str, Any]:
     """Return the JSON Schema for the graph payload."""
 
@@ -2,32 +2,135 @@ from __future__ import annotations
 
 import asyncio
 import json
-from collections.abc import AsyncIterator
+import time
+from collections import OrderedDict
+from collections.abc import AsyncIterator, Callable, Sequence
 from contextlib import asynccontextmanager
-from dataclasses import dataclass
-from importlib import resources
-from typing import Any
+from dataclasses import dataclass, field, replace
+from typing import Annotated, Any, Literal
 from uuid import uuid4
 
-from fastapi import FastAPI, HTTPException
-from fastapi.responses import HTMLResponse, JSONResponse, StreamingResponse
-from fastapi.staticfiles import StaticFiles
-from pydantic import BaseModel
+from fastapi import FastAPI, Header, HTTPException, Query, Request, WebSocket, WebSocketDisconnect
+from fastapi.responses import HTMLResponse, Response, StreamingResponse
+from pydantic import BaseModel, Field, PydanticSchemaGenerationError, TypeAdapter, ValidationError
 from pydantic_graph import Graph
 from pydantic_graph.nodes import BaseNode
 
-from pydantic_graph_studio.introspection import serialize_graph
+from pydantic_graph_studio.activity import ToolActivityLog
+from pydantic_graph_studio.admission import AdmissionController, AdmissionPolicy, AdmissionRejected
+from pydantic_graph_studio.batch import BATCH_RUN_LIMIT, DEFAULT_BATCH_CONCURRENCY, RunBatch
+from pydantic_graph_studio.blobs import BlobStore
+from pydantic_graph_studio.compression import (
+    StreamCompression,
+    StreamCompressor,
+    compress_stream,
+    select_stream_encoding,
+)
+from pydantic_graph_studio.factories import RunFactories, RunResources
+from pydantic_graph_studio.history import (
+    HISTORY_PAGE_LIMIT,
+    HistorySort,
+    RecordedEvent,
+    RunHistoryStore,
+    RunQuery,
+)
+from pydantic_graph_studio.introspection import (
+    build_cluster_hierarchy,
+    graph_node_ids,
+    serialize_graph_json,
+    serialize_graph_view_json,
+)
+from pydantic_graph_studio.retention import (
+    EVICTION_REASONS,
+    EvictionReason,
+    RetainedRun,
+    RetentionPolicy,
+    plan_evictions,
+)
 from pydantic_graph_studio.runtime import InteractionHub, iter_run_events
-from pydantic_graph_studio.schemas import Event
+from pydantic_graph_studio.schemas import (
+    BatchProgress,
+    BatchRunSummary,
+    EdgeTakenEvent,
+    ErrorEvent,
+    Event,
+    RunAdmittedEvent,
+    RunCancelledEvent,
+    RunHistoryPage,
+    RunQueuedEvent,
+    RunSnapshot,
+    ServerMetrics,
+    ToolActivityPage,
+)
+from pydantic_graph_studio.snapshot import KEYFRAME_INTERVAL, RunReducer, state_at
+from pydantic_graph_studio.static import IMMUTABLE_CACHE_CONTROL, REVALIDATE_CACHE_CONTROL, load_static_bundle
+from pydantic_graph_studio.trace import EVENT_TYPES, RunTrace
+from pydantic_graph_studio.wire import WIRE_FORMATS, CompactEncoder, WireEncoder, WireMode
+
+FINISHED_BATCH_LIMIT = 32
+TOOL_PAGE_LIMIT = 500
+SOCKET_BATCH_LIMIT = 1024
+SOCKET_CHANNEL_LIMIT = 1 << 16
+DEFAULT_STREAM_COMPRESSION = StreamCompression()
+DEFAULT_RETENTION = RetentionPolicy()
+MULTIPLEX_QUEUE_LIMIT = 256
+CANCEL_WAIT_SECONDS = 5.0
+DEFAULT_HEARTBEAT_INTERVAL = 15.0
+SSE_HEARTBEAT = b": heartbeat\n\n"
 
 
 @dataclass(slots=True)
 class RunState:
+    """An in-flight or recently finished run, with its trace, reduced state, keyframes and subscribers."""
+
     run_id: str
-    queue: asyncio.Queue[Event]
     done: asyncio.Event
     task: asyncio.Task[None]
     interaction: InteractionHub
+    reducer: RunReducer
+    trace: RunTrace
+    tools: ToolActivityLog = field(default_factory=ToolActivityLog)
+    keyframes: list[RunSnapshot] = field(default_factory=list)
+    updated: asyncio.Condition = field(default_factory=asyncio.Condition)
+    subscribers: int = 0
+    last_access: float = field(default_factory=time.monotonic)
+    abandon_grace: float | None = None
+    cancel_reason: str | None = None
+    output: Any = None
+    keyframe_bytes: int = 0
+    _abandon_timer: asyncio.TimerHandle | None = None
+
+    @property
+    def nbytes(self) -> int:
+        """Approximate memory held by the run's events, tool activity and keyframes."""
+        return self.trace.nbytes + self.tools.nbytes + self.keyframe_bytes
+
+    def cancel(self, reason: str) -> bool:
+        """Cancel the run, ending it with a `cancelled` event; False if it had already finished."""
+        if self.task.done():
+            return False
+        if self.cancel_reason is None:
+            self.cancel_reason = reason
+        self.task.cancel()
+        return True
+
+    def subscribe(self) -> None:
+        self.subscribers += 1
+        if self._abandon_timer is not None:
+            self._abandon_timer.cancel()
+            self._abandon_timer = None
+
+    def unsubscribe(self) -> None:
+        self.subscribers -= 1
+        self.last_access = time.monotonic()
+        if self.subscribers or self.abandon_grace is None or self.done.is_set():
+            return
+        self._abandon_timer = asyncio.get_running_loop().call_later(self.abandon_grace, self._abandon)
+
+    def _abandon(self) -> None:
+        self._abandon_timer = None
+        if not self.subscribers:
+            self.cancel("abandoned")
 
 
 class InputResponsePayload(BaseModel):
@@ -36,10 +139,72 @@ class InputResponsePayload(BaseModel):
     response: str
 
 
+class BatchRunItem(BaseModel):
+    """One run of a batch; `state` and `inputs`, when given, replace the app's values for that run."""
+
+    state: Any = None
+    inputs: Any = None
+
+
+class BatchRunRequest(BaseModel):
+    """Runs to start together, at most `concurrency` of them executing at once."""
+
+    items: list[BatchRunItem] = Field(min_length=1, max_length=BATCH_RUN_LIMIT)
+    concurrency: int = Field(default=DEFAULT_BATCH_CONCURRENCY, ge=1, le=BATCH_RUN_LIMIT)
+    priority: str | None = None
+
+
+class SocketSubscribe(BaseModel):
+    """Follow a run's events over `/api/ws`, starting after sequence number `after`."""
+
+    type: Literal["subscribe"]
+    run_id: str
+    after: int = Field(default=0, ge=0)
+
+
+class SocketUnsubscribe(BaseModel):
+    """Stop following the run streamed on `channel`."""
+
+    type: Literal["unsubscribe"]
+    channel: int
+
+
+class SocketInput(InputResponsePayload):
+    """Answer an input request over `/api/ws` instead of `POST /api/input`."""
+
+    type: Literal["input"]
+
+
+SocketMessage = Annotated[SocketSubscribe | SocketUnsubscribe | SocketInput, Field(discriminator="type")]
+_SOCKET_MESSAGE_ADAPTER: TypeAdapter[SocketMessage] = TypeAdapter(SocketMessage)
+
+
 class RunRegistry:
-    def __init__(self) -> None:
-        """Initialize the run registry."""
+    def __init__(
+        self,
+        history: RunHistoryStore | None = None,
+        blobs: BlobStore | None = None,
+        admission: AdmissionController | None = None,
+        retention: RetentionPolicy | None = None,
+    ) -> None:
+        """Initialize the run registry, optionally recording every run into `history`.
+
+        With `blobs`, large tool arguments, outputs and input contexts are moved into the blob store
+        and events carry a `BlobRef` in their place. With `admission`, runs beyond its concurrency
+        limit wait for a slot, announced by a `run_queued` event and ended by `run_admitted`. With
+        `retention`, `reap` (run periodically by `start_reaper`) evicts runs nobody is watching.
+        """
+        self.history = history
+        self.blobs = blobs
+        self.admission = admission
+        self.retention = retention
+        self._evictions: dict[str, int] = dict.fromkeys(EVICTION_REASONS, 0)
+        self._reaper: asyncio.Task[None] | None = None
         self._runs: dict[str, RunState] = {}
+        self._finished: OrderedDict[str, RunState] = OrderedDict()
+        self._listeners: set[Callable[[RunState], None]] = set()
+        self._batches: OrderedDict[str, RunBatch] = OrderedDict()
+        self._batch_tasks: set[asyncio.Task[None]] = set()
         self._lock = asyncio.Lock()
 
     async def start_run(
@@ -51,58 +216,344 @@ class RunRegistry:
         deps: Any = None,
         persistence: Any = None,
         inputs: Any = None,
+        factories: RunFactories | None = None,
+        priority: str | None = None,
     ) -> str:
-        """Start a graph run and return the run id."""
+        """Start a graph run and return the run id.
+
+        `factories` build the run its own `state`, `deps` and `inputs` once it is admitted, in place of
+        the shared values; pooled objects are given back when it ends. `priority` picks the admission
+        queue the run waits in when every slot is taken. Raises `ValueError` for an unknown priority
+        and `AdmissionRejected` when the queue is full.
+        """
+        run_state = await self._launch(
+            graph,
+            start_node,
+            state=state,
+            deps=deps,
+            persistence=persistence,
+            inputs=inputs,
+            factories=factories,
+            priority=priority,
+        )
+        return run_state.run_id
+
+    async def _launch(
+        self,
+        graph: Graph[Any, Any, Any],
+        start_node: BaseNode[Any, Any, Any] | None,
+        *,
+        state: Any,
+        deps: Any,
+        persistence: Any,
+        inputs: Any,
+        factories: RunFactories | None,
+        priority: str | None,
+    ) -> RunState:
         run_id = uuid4().hex
-        queue: asyncio.Queue[Event] = asyncio.Queue()
+        admission = self.admission
+        ticket = admission.request(run_id, priority) if admission is not None else None
+        position = admission.position(ticket) if admission is not None and ticket is not None else 0
         done = asyncio.Event()
         interaction = InteractionHub(run_id=run_id)
+        reducer = RunReducer(run_id=run_id)
+        tools = ToolActivityLog()
+        trace = RunTrace(run_id)
+        keyframes: list[RunSnapshot] = []
+        updated = asyncio.Condition()
+        history = self.history
+        blobs = self.blobs
+        if history is not None:
+            history.run_started(run_id)
+
+        def set_output(output: Any) -> None:
+            run_state.output = output
+
+        async def record(event: Event) -> None:
+            if blobs is not None:
+                event = await blobs.offload(event)
+            now = time.time_ns()
+            async with updated:
+                trace.append(event, timestamp_ns=now)
+                tools.apply(event)
+                seq = reducer.apply(event)
+                if seq % KEYFRAME_INTERVAL == 0:
+                    keyframe = reducer.snapshot()
+                    keyframes.append(keyframe)
+                    run_state.keyframe_bytes += len(keyframe.model_dump_json())
+                updated.notify_all()
+            if history is not None:
+                history.record(run_id, seq, event, recorded_at=now / 1e9)
 
         async def producer() -> None:
+            resources: RunResources | None = None
             try:
+                if admission is not None and ticket is not None and ticket.admitted_at is None:
+                    await record(
+                        RunQueuedEvent(
+                            run_id=run_id, event_type="run_queued", priority=ticket.priority, position=position
+                        )
+                    )
+                    waited = await admission.wait(ticket)
+                    await record(
+                        RunAdmittedEvent(
+                            run_id=run_id, event_type="run_admitted", priority=ticket.priority, waited=waited
+                        )
+                    )
+                if factories is None:
+                    resources = RunResources(state=state, deps=deps, inputs=inputs)
+                else:
+                    try:
+                        resources = await factories.create(state=state, deps=deps, inputs=inputs)
+                    except Exception as exc:
+                        message = f"Failed to create the run's state, deps or inputs: {exc}"
+                        await record(ErrorEvent(run_id=run_id, event_type="error", message=message))
+                        return
                 async for event in iter_run_events(
                     graph,
                     start_node,
-                    state=state,
-                    deps=deps,
+                    state=resources.state,
+                    deps=resources.deps,
                     persistence=persistence,
-                    inputs=inputs,
+                    inputs=resources.inputs,
                     run_id=run_id,
                     interaction=interaction,
+                    on_output=set_output,
                 ):
-                    await queue.put(event)
+                    await record(event)
+            except asyncio.CancelledError:
+                if reducer.status in ("queued", "running"):
+                    reason = run_state.cancel_reason or "cancelled"
+                    await record(RunCancelledEvent(run_id=run_id, event_type="cancelled", reason=reason))
+                raise
             finally:
+                if resources is not None:
+                    await resources.release()
+                if history is not None:
+                    history.run_finished(
+                        run_id,
+                        status=_final_status(reducer),
+                        error=reducer.error,
+                        event_count=reducer.seq,
+                        visit_counts=reducer.visit_counts,
+                    )
+                trace.seal()
                 done.set()
+                async with updated:
+                    updated.notify_all()
+                await self.remove(run_id)
 
         task = asyncio.create_task(producer())
+        if admission is not None and ticket is not None:
+            # A done callback also frees the slot of a task cancelled before it ever started.
+            task.add_done_callback(lambda _task: admission.release(ticket))
+        run_state = RunState(
+            run_id=run_id,
+            done=done,
+            task=task,
+            interaction=interaction,
+            reducer=reducer,
+            trace=trace,
+            tools=tools,
+            keyframes=keyframes,
+            updated=updated,
+            abandon_grace=self.retention.abandon_grace if self.retention is not None else None,
+        )
         async with self._lock:
-            self._runs[run_id] = RunState(
-                run_id=run_id,
-                queue=queue,
-                done=done,
-                task=task,
-                interaction=interaction,
+            self._runs[run_id] = run_state
+            listeners = list(self._listeners)
+        for listener in listeners:
+            listener(run_state)
+        return run_state
+
+    async def start_batch(
+        self,
+        graph: Graph[Any, Any, Any],
+        start_node: BaseNode[Any, Any, Any] | None,
+        items: Sequence[dict[str, Any]],
+        *,
+        concurrency: int = DEFAULT_BATCH_CONCURRENCY,
+        state: Any = None,
+        deps: Any = None,
+        persistence: Any = None,
+        inputs: Any = None,
+        factories: RunFactories | None = None,
+        priority: str | None = None,
+    ) -> RunBatch:
+        """Start one run per item, at most `concurrency` at a time, and return the batch driving them.
+
+        An item's `state` and `inputs` keys replace the shared values and the matching factories for
+        its run. Runs go through admission like any other; a full queue delays the batch instead of
+        failing it. The batch subscribes to each run until it ends, so retention never evicts them.
+        Raises `ValueError` for an empty batch, a bad concurrency or an unknown priority.
+        """
+        if priority is not None and self.admission is not None and priority not in self.admission.policy.priorities:
+            raise ValueError(f"Unknown priority '{priority}'")
+        batch = RunBatch(uuid4().hex, len(items), concurrency)
+        runs: dict[str, RunState] = {}
+
+        async def start(index: int) -> str:
+            item = items[index]
+            overrides = [name for name in ("state", "inputs") if name in item]
+            run_state = await self._launch(
+                graph,
+                start_node,
+                state=item.get("state", state),
+                deps=deps,
+                persistence=persistence,
+                inputs=item.get("inputs", inputs),
+                factories=replace(factories, **dict.fromkeys(overrides)) if factories is not None else None,
+                priority=priority,
             )
-        return run_id
+            # The batch watches its runs from the moment they are registered, so the reaper never takes them.
+            run_state.subscribe()
+            runs[run_state.run_id] = run_state
+            return run_state.run_id
+
+        async def finish(run_id: str) -> BatchRunSummary:
+            run_state = runs.pop(run_id)
+            try:
+                await run_state.done.wait()
+            finally:
+                run_state.unsubscribe()
+            return await self._summarize(run_state)
+
+        async with self._lock:
+            self._batches[batch.batch_id] = batch
+            finished = [batch_id for batch_id, other in self._batches.items() if other.done.is_set()]
+            for batch_id in finished[: max(0, len(finished) - FINISHED_BATCH_LIMIT)]:
+                del self._batches[batch_id]
+        task = asyncio.create_task(batch.run(start, finish))
+        self._batch_tasks.add(task)
+        task.add_done_callback(self._batch_tasks.discard)
+        return batch
+
+    async def get_batch(self, batch_id: str) -> RunBatch | None:
+        """Fetch a running or recently finished batch."""
+        async with self._lock:
+            return self._batches.get(batch_id)
+
+    async def _summarize(self, run_state: RunState) -> BatchRunSummary:
+        reducer = run_state.reducer
+        status = _final_status(reducer)
+        output = None
+        if status == "completed" and self.blobs is not None:
+            output = await asyncio.to_thread(self.blobs.reference, run_state.output)
+        return BatchRunSummary(index=0, run_id=run_state.run_id, status=status, error=reducer.error, output=output)
+
+    async def watch(self, listener: Callable[[RunState], None]) -> list[RunState]:
+        """Call `listener` with every run started from now on and return the runs already active."""
+        async with self._lock:
+            self._listeners.add(listener)
+            return list(self._runs.values())
+
+    async def unwatch(self, listener: Callable[[RunState], None]) -> None:
+        """Stop calling a listener registered with `watch`."""
+        async with self._lock:
+            self._listeners.discard(listener)
 
     async def get(self, run_id: str) -> RunState | None:
         """Fetch the run state for a run id."""
         async with self._lock:
-            return self._runs.get(run_id)
+            run = self._runs.get(run_id)
+        if run is not None:
+            run.last_access = time.monotonic()
+        return run
+
+    async def find(self, run_id: str) -> RunState | None:
+        """Fetch the run state for an active or recently finished run."""
+        async with self._lock:
+            run = self._runs.get(run_id) or self._finished.get(run_id)
+        if run is not None:
+            run.last_access = time.monotonic()
+        return run
+
+    async def metrics(self) -> ServerMetrics:
+        """Return the registry's run counters, including admission metrics when runs are limited."""
+        async with self._lock:
+            active, finished = len(self._runs), len(self._finished)
+            buffered = sum(run.nbytes for run in (*self._runs.values(), *self._finished.values()))
+            evictions = dict(self._evictions)
+        admission = self.admission.metrics() if self.admission is not None else None
+        return ServerMetrics(
+            active_runs=active,
+            finished_runs=finished,
+            buffered_bytes=buffered,
+            memory_budget=self.retention.memory_budget if self.retention is not None else None,
+            evictions=evictions,
+            admission=admission,
+        )
+
+    async def reap(self) -> list[tuple[str, EvictionReason]]:
+        """Evict the runs the retention policy no longer allows to be kept and return why each went.
+
+        Evicted active runs are cancelled; evicted runs are gone from `find`, as if never started.
+        """
+        if self.retention is None:
+            return []
+        now = time.monotonic()
+        async with self._lock:
+            retained = [
+                RetainedRun(run.run_id, finished, run.subscribers, run.last_access, run.nbytes)
+                for finished, runs in ((False, self._runs), (True, self._finished))
+                for run in runs.values()
+            ]
+            evictions = plan_evictions(retained, self.retention, now)
+            evicted = [self._runs.pop(run_id, None) or self._finished.pop(run_id) for run_id, _reason in evictions]
+            for _run_id, reason in evictions:
+                self._evictions[reason] += 1
+        for run, (_run_id, reason) in zip(evicted, evictions, strict=True):
+            run.cancel(reason)
+        return evictions
+
+    def start_reaper(self) -> None:
+        """Run `reap` in the background every `retention.reap_interval` seconds until `shutdown`."""
+        if self.retention is None or self._reaper is not None:
+            return
+        interval = self.retention.reap_interval
+
+        async def reaper() -> None:
+            while True:
+                await asyncio.sleep(interval)
+                await self.reap()
+
+        self._reaper = asyncio.create_task(reaper())
+
+    async def cancel(self, run_id: str, reason: str = "requested") -> RunState | None:
+        """Cancel an active run and return it, or None if no such run is active."""
+        async with self._lock:
+            run = self._runs.get(run_id)
+        if run is not None:
+            run.cancel(reason)
+        return run
 
     async def remove(self, run_id: str) -> None:
-        """Remove a run state from the registry."""
+        """Move a run from the active runs to the finished ones, kept for late readers until reaped."""
         async with self._lock:
-            self._runs.pop(run_id, None)
+            run = self._runs.pop(run_id, None)
+            if run is None:
+                return
+            run.last_access = time.monotonic()
+            self._finished[run_id] = run
 
     async def shutdown(self) -> None:
         """Cancel any in-flight runs and clear the registry."""
+        if self._reaper is not None:
+            self._reaper.cancel()
+            self._reaper = None
+        batch_tasks = list(self._batch_tasks)
+        for task in batch_tasks:
+            task.cancel()
+        await asyncio.gather(*batch_tasks, return_exceptions=True)
         async with self._lock:
             runs = list(self._runs.values())
             self._runs.clear()
+            self._finished.clear()
+            self._batches.clear()
         for run in runs:
-            if not run.task.done():
-                run.task.cancel()
+            run.cancel("shutdown")
+        # Let cancelled runs record their final events before history and blobs are closed.
+        await asyncio.gather(*(run.task for run in runs), return_exceptions=True)
 
 
 def create_app(
@@ -113,73 +564,319 @@ def create_app(
     deps: Any = None,
     persistence: Any = None,
     inputs: Any = None,
+    factories: RunFactories | None = None,
+    history: RunHistoryStore | None = None,
+    blobs: BlobStore | None = None,
+    compression: StreamCompression | None = DEFAULT_STREAM_COMPRESSION,
+    admission: AdmissionPolicy | None = None,
+    retention: RetentionPolicy | None = DEFAULT_RETENTION,
+    heartbeat_interval: float | None = DEFAULT_HEARTBEAT_INTERVAL,
 ) -> FastAPI:
     """Create the FastAPI app bound to a graph and start node."""
-    ui_root = resources.files("pydantic_graph_studio.ui")
-    index_html = (ui_root / "index.html").read_text(encoding="utf-8")
-    assets_dir = ui_root / "assets"
+    if heartbeat_interval is not None and heartbeat_interval <= 0:
+        raise ValueError("heartbeat_interval must be positive")
+    static_bundle = load_static_bundle()
 
     @asynccontextmanager
     async def lifespan(app: FastAPI) -> AsyncIterator[None]:
         """Initialize and tear down shared server state."""
-        registry = RunRegistry()
+        if history is not None:
+            await asyncio.to_thread(history.open)
+        blob_store = blobs if blobs is not None else BlobStore()
+        controller = AdmissionController(admission) if admission is not None else None
+        registry = RunRegistry(history, blob_store, controller, retention)
+        registry.start_reaper()
         app.state.graph = graph
         app.state.start_node = start_node
         app.state.state = state
         app.state.deps = deps
         app.state.persistence = persistence
         app.state.inputs = inputs
+        app.state.factories = factories
         app.state.registry = registry
+        app.state.history = history
+        app.state.blobs = blob_store
         try:
             yield
         finally:
             await registry.shutdown()
+            if factories is not None:
+                await factories.aclose()
+            if history is not None:
+                await asyncio.to_thread(history.close)
+            await asyncio.to_thread(blob_store.close)
 
     app = FastAPI(lifespan=lifespan)
 
     @app.get("/api/graph")
-    async def get_graph() -> JSONResponse:
-        """Return the serialized graph model."""
-        payload = serialize_graph(app.state.graph)
-        return JSONResponse(payload)
+    async def get_graph(request: Request, layout: bool = False) -> Response:
+        """Return the serialized graph model, honoring `If-None-Match` revalidation.
+
+        Pass `layout=true` to include server-computed node coordinates.
+        """
+        serialized = serialize_graph_json(app.state.graph, layout=layout)
+        headers = {"ETag": serialized.etag, "Cache-Control": "no-cache"}
+        if _etag_matches(request.headers.get("if-none-match"), serialized.etag):
+            return Response(status_code=304, headers=headers)
+        return Response(serialized.body, media_type="application/json", headers=headers)
+
+    @app.get("/api/graph/view")
+    async def get_graph_view(
+        request: Request,
+        strategy: str = "module",
+        expand: Annotated[list[str] | None, Query()] = None,
+        layout: bool = False,
+    ) -> Response:
+        """Return a clustered view of the graph with only the `expand`-ed clusters opened.
+
+        Without `expand` the top levels are opened automatically while the view stays small.
+        """
+        try:
+            serialized = serialize_graph_view_json(app.state.graph, strategy=strategy, expanded=expand, layout=layout)
+        except ValueError as exc:
+            raise HTTPException(status_code=400, detail=str(exc)) from exc
+        headers = {"ETag": serialized.etag, "Cache-Control": "no-cache"}
+        if _etag_matches(request.headers.get("if-none-match"), serialized.etag):
+            return Response(status_code=304, headers=headers)
+        return Response(serialized.body, media_type="application/json", headers=headers)
+
+    @app.get("/api/graph/clusters")
+    async def locate_clusters(
+        strategy: str = "module",
+        node_id: Annotated[list[str] | None, Query()] = None,
+    ) -> dict[str, Any]:
+        """Return the clusters containing each requested node, innermost first."""
+        try:
+            hierarchy = build_cluster_hierarchy(app.state.graph, strategy)
+        except ValueError as exc:
+            raise HTTPException(status_code=400, detail=str(exc)) from exc
+        ancestors: dict[str, list[str]] = {}
+        for item in node_id or ():
+            try:
+                ancestors[item] = hierarchy.ancestors(item)
+            except KeyError:
+                continue
+        return {"strategy": strategy, "ancestors": ancestors}
 
     @app.post("/api/run")
-    async def start_run() -> dict[str, str]:
-        """Start a new run and return its identifier."""
-        run_id = await app.state.registry.start_run(
-            app.state.graph,
-            app.state.start_node,
-            state=app.state.state,
-            deps=app.state.deps,
-            persistence=app.state.persistence,
-            inputs=app.state.inputs,
-        )
+    async def start_run(priority: str | None = None) -> dict[str, str]:
+        """Start a new run and return its identifier.
+
+        When runs are limited, `priority` names the admission class the run queues in; a full queue
+        is answered with `429` and a `Retry-After` estimate in seconds.
+        """
+        try:
+            run_id = await app.state.registry.start_run(
+                app.state.graph,
+                app.state.start_node,
+                state=app.state.state,
+                deps=app.state.deps,
+                persistence=app.state.persistence,
+                inputs=app.state.inputs,
+                factories=app.state.factories,
+                priority=priority,
+            )
+        except AdmissionRejected as exc:
+            raise HTTPException(
+                status_code=429, detail=str(exc), headers={"Retry-After": str(exc.retry_after)}
+            ) from exc
+        except ValueError as exc:
+            raise HTTPException(status_code=400, detail=str(exc)) from exc
         return {"run_id": run_id}
 
+    @app.post("/api/runs/batch")
+    async def start_batch(payload: BatchRunRequest) -> BatchProgress:
+        """Start one run per item and return the batch id with its progress so far.
+
+        Item `state` and `inputs` are validated against the type of the app's own values (or of a
+        class used as their factory) when there is one. Follow the batch with
+        `/api/runs/batch/{batch_id}/stream` or poll `/api/runs/batch/{batch_id}`.
+        """
+        factories: RunFactories | None = app.state.factories
+        items: list[dict[str, Any]] = []
+        try:
+            for item in payload.items:
+                values: dict[str, Any] = {}
+                for name in sorted(item.model_fields_set & {"state", "inputs"}):
+                    factory = getattr(factories, name) if factories is not None else None
+                    values[name] = _batch_value(getattr(item, name), getattr(app.state, name), factory)
+                items.append(values)
+            batch = await app.state.registry.start_batch(
+                app.state.graph,
+                app.state.start_node,
+                items,
+                concurrency=payload.concurrency,
+                state=app.state.state,
+                deps=app.state.deps,
+                persistence=app.state.persistence,
+                inputs=app.state.inputs,
+                factories=factories,
+                priority=payload.priority,
+            )
+        except ValueError as exc:
+            raise HTTPException(status_code=400, detail=str(exc)) from exc
+        return batch.progress()
+
+    @app.get("/api/runs/batch/{batch_id}")
+    async def get_batch(batch_id: str) -> BatchProgress:
+        """Return a batch's aggregated progress and the summary of each of its runs."""
+        batch = await app.state.registry.get_batch(batch_id)
+        if batch is None:
+            raise HTTPException(status_code=404, detail="Unknown batch_id")
+        return batch.progress()
+
+    @app.get("/api/runs/batch/{batch_id}/stream")
+    async def stream_batch(
+        batch_id: str,
+        accept_encoding: Annotated[str | None, Header()] = None,
+    ) -> StreamingResponse:
+        """Stream a batch's progress as Server-Sent Events, from its first message.
+
+        Every message is JSON with a `type`: `run_started` (`index` and `run_id`), `run_finished`
+        (the run's summary: `status`, `duration`, `error` and an `output` blob reference) and, last,
+        `batch_finished` with the number of runs per status.
+        """
+        batch = await app.state.registry.get_batch(batch_id)
+        if batch is None:
+            raise HTTPException(status_code=404, detail="Unknown batch_id")
+
+        async def event_stream() -> AsyncIterator[bytes]:
+            """Yield the batch messages as they are published."""
+            async for messages in batch.follow(heartbeat=heartbeat_interval):
+                if not messages:
+                    yield SSE_HEARTBEAT
+                    continue
+                yield b"".join(_sse_data(message) for message in messages)
+
+        return _event_stream_response(event_stream(), accept_encoding)
+
+    @app.get("/api/metrics")
+    async def get_metrics() -> ServerMetrics:
+        """Return run registry and admission counters."""
+        return await app.state.registry.metrics()
+
     @app.get("/api/events")
-    async def stream_events(run_id: str) -> StreamingResponse:
-        """Stream events for a run as Server-Sent Events."""
-        run_state = await app.state.registry.get(run_id)
+    async def stream_events(
+        run_id: str,
+        after: Annotated[int | None, Query(ge=0)] = None,
+        wire: WireMode = "json",
+        last_event_id: Annotated[str | None, Header()] = None,
+        accept_encoding: Annotated[str | None, Header()] = None,
+    ) -> StreamingResponse:
+        """Stream events for a run as Server-Sent Events, each tagged with its sequence number as `id`.
+
+        Pass `after` (or reconnect with `Last-Event-ID`) to skip the events a client already has, e.g.
+        the `seq` of a snapshot from `/api/runs/{run_id}/snapshot`. With `wire=compact` the stream
+        starts with a `CompactEncoder` dictionary and events use interned node ids and short fields.
+        """
+        run_state = await app.state.registry.find(run_id)
         if run_state is None:
             raise HTTPException(status_code=404, detail="Unknown run_id")
+        if after is None:
+            after = int(last_event_id) if last_event_id and last_event_id.isdigit() else 0
+
+        preamble, frame = _sse_framing(wire, run_id, graph_node_ids(app.state.graph))
 
         async def event_stream() -> AsyncIterator[bytes]:
             """Yield SSE-formatted event payloads."""
+            if preamble:
+                yield preamble
+            async for first_seq, events in _follow(run_state, after, heartbeat=heartbeat_interval):
+                if not events:
+                    yield SSE_HEARTBEAT
+                for seq, event in enumerate(events, start=first_seq):
+                    yield frame(seq, event)
+
+        return _event_stream_response(event_stream(), accept_encoding)
+
+    @app.get("/api/stream")
+    async def stream_runs(
+        runs: Annotated[list[str] | None, Query()] = None,
+        all_runs: Annotated[bool, Query(alias="all")] = False,
+        tail: bool = False,
+        event_type: Annotated[list[str] | None, Query()] = None,
+        node_id: Annotated[list[str] | None, Query()] = None,
+        accept_encoding: Annotated[str | None, Header()] = None,
+    ) -> StreamingResponse:
+        """Stream the events of many runs over one Server-Sent Events connection.
+
+        Follow the comma-separated `runs`, or with `all=1` every active run plus each run started while
+        connected. Every message is JSON with a `type`: `run_started` (with the `seq` the run is followed
+        from), `event` (the run's own `seq` and the `event`) and `run_finished` (final `seq` and
+        `status`). `tail=true` follows already running runs from their latest event instead of the
+        first. `event_type` and `node_id` keep only matching events; lifecycle messages are always
+        sent. The stream ends once every listed run has finished, and never with `all=1`.
+        """
+        run_ids = [run_id for item in runs or () for run_id in item.split(",") if run_id]
+        if not all_runs and not run_ids:
+            raise HTTPException(status_code=400, detail="Pass runs=<run_id,...> or all=1")
+        unknown_types = set(event_type or ()) - set(EVENT_TYPES)
+        if unknown_types:
+            raise HTTPException(status_code=400, detail=f"Unknown event types: {', '.join(sorted(unknown_types))}")
+        registry: RunRegistry = app.state.registry
+        listed: list[RunState] = []
+        for run_id in dict.fromkeys(run_ids):
+            run_state = await registry.find(run_id)
+            if run_state is None:
+                raise HTTPException(status_code=404, detail=f"Unknown run_id '{run_id}'")
+            listed.append(run_state)
+        types = set(event_type) if event_type else None
+        nodes = set(node_id) if node_id else None
+
+        def selected(event: Event) -> bool:
+            if types is not None and event.event_type not in types:
+                return False
+            return nodes is None or not nodes.isdisjoint(_event_node_ids(event))
+
+        async def multiplexed() -> AsyncIterator[bytes]:
+            """Merge the followed runs' messages as they are produced."""
+            output: asyncio.Queue[bytes | None] = asyncio.Queue(maxsize=MULTIPLEX_QUEUE_LIMIT)
+            pumps: set[asyncio.Task[None]] = set()
+
+            async def pump(run_state: RunState, after: int) -> None:
+                run_id = run_state.run_id
+                await output.put(_sse_data({"type": "run_started", "run_id": run_id, "seq": after}))
+                async for first_seq, events in _follow(run_state, after):
+                    chunk = b"".join(
+                        _sse_data({"type": "event", "seq": seq, "event": event.model_dump(mode="json")})
+                        for seq, event in enumerate(events, start=first_seq)
+                        if selected(event)
+                    )
+                    if chunk:
+                        await output.put(chunk)
+                status = _final_status(run_state.reducer)
+                finished = {"type": "run_finished", "run_id": run_id, "seq": len(run_state.trace), "status": status}
+                await output.put(_sse_data(finished))
+                await output.put(None)
+
+            def follow(run_state: RunState, after: int = 0) -> None:
+                task = asyncio.create_task(pump(run_state, after))
+                pumps.add(task)
+                task.add_done_callback(pumps.discard)
+
+            followed = await registry.watch(follow) if all_runs else listed
+            remaining = len(followed)
             try:
-                while True:
-                    if run_state.done.is_set() and run_state.queue.empty():
-                        break
-                    event = await run_state.queue.get()
-                    payload = json.dumps(event.model_dump(mode="json"))
-                    yield f"data: {payload}\n\n".encode()
+                for run_state in followed:
+                    follow(run_state, len(run_state.trace) if tail else 0)
+                while all_runs or remaining:
+                    try:
+                        async with asyncio.timeout(heartbeat_interval):
+                            chunk = await output.get()
+                    except TimeoutError:
+                        yield SSE_HEARTBEAT
+                        continue
+                    if chunk is None:
+                        remaining -= 1
+                    else:
+                        yield chunk
             finally:
-                await app.state.registry.remove(run_id)
+                if all_runs:
+                    await registry.unwatch(follow)
+                for task in list(pumps):
+                    task.cancel()
 
-        headers = {
-            "Cache-Control": "no-cache",
-            "Connection": "keep-alive",
-        }
-        return StreamingResponse(event_stream(), media_type="text/event-stream", headers=headers)
+        return _event_stream_response(multiplexed(), accept_encoding)
 
     @app.post("/api/input")
     async def submit_input(payload: InputResponsePayload) -> dict[str, bool]:
@@ -192,11 +889,426 @@ def create_app(
             raise HTTPException(status_code=400, detail="Unknown request_id")
         return {"accepted": True}
 
-    app.mount("/assets", StaticFiles(directory=str(assets_dir)), name="assets")
+    @app.websocket("/api/ws")
+    async def event_socket(websocket: WebSocket, format: str = "binary") -> None:
+        """Stream any number of runs and answer their input requests over a single WebSocket.
+
+        Control messages are JSON text in both directions. After a `hello` listing the graph's node ids
+        and `EVENT_TYPES`, each `subscribe` is answered with a `subscribed` message carrying a channel
+        number (or an `error` once every channel is taken); the run's events then arrive as binary
+        messages of `WireEncoder` records (or, with `format=json`, as `events` text messages), followed
+        by `end` once the run is over. `input` messages are answered with `input_ack`.
+        """
+        if format not in WIRE_FORMATS:
+            await websocket.close(code=1008, reason=f"Unknown format '{format}'")
+            return
+        await websocket.accept()
+        node_ids = graph_node_ids(app.state.graph)
+        encoder = WireEncoder(node_ids)
+        send_lock = asyncio.Lock()
+        pumps: dict[int, asyncio.Task[None]] = {}
+        next_channel = 0
+
+        async def send(message: dict[str, Any] | bytes) -> None:
+            async with send_lock:
+                if isinstance(message, bytes):
+                    await websocket.send_bytes(message)
+                else:
+                    await websocket.send_text(json.dumps(message))
+
+        async def pump(channel: int, run_state: RunState, after: int) -> None:
+            cursor = after
+            try:
+                async for first_seq, events in _follow(run_state, after, limit=SOCKET_BATCH_LIMIT):
+                    if format == "binary":
+                        await send(encoder.encode_batch(channel, first_seq, events))
+                    else:
+                        items = [
+                            {"seq": seq, "event": event.model_dump(mode="json")}
+                            for seq, event in enumerate(events, start=first_seq)
+                        ]
+                        await send({"type": "events", "channel": channel, "events": items})
+                    cursor = first_seq + len(events) - 1
+                await send({"type": "end", "channel": channel, "seq": cursor})
+            except (WebSocketDisconnect, RuntimeError):
+                return
+            finally:
+                if pumps.get(channel) is asyncio.current_task():
+                    del pumps[channel]
+
+        await send({"type": "hello", "format": format, "nodes": list(node_ids), "event_types": list(EVENT_TYPES)})
+        try:
+            while True:
+                received = await websocket.receive()
+                if received["type"] == "websocket.disconnect":
+                    break
+                try:
+                    message = _SOCKET_MESSAGE_ADAPTER.validate_json(received.get("text") or received.get("bytes") or "")
+                except ValidationError as exc:
+                    await send({"type": "error", "detail": str(exc)})
+                    continue
+                if isinstance(message, SocketSubscribe):
+                    run_state = await app.state.registry.find(message.run_id)
+                    if run_state is None:
+                        await send({"type": "error", "run_id": message.run_id, "detail": "Unknown run_id"})
+                        continue
+                    # Channel numbers wrap around, skipping the ones still in use.
+                    limit = SOCKET_CHANNEL_LIMIT
+                    candidates = ((next_channel + offset) % limit for offset in range(limit))
+                    channel = next((candidate for candidate in candidates if candidate not in pumps), None)
+                    if channel is None:
+                        await send({"type": "error", "run_id": message.run_id, "detail": "Too many open channels"})
+                        continue
+                    next_channel = channel + 1
+                    await send({"type": "subscribed", "channel": channel, "run_id": message.run_id})
+                    pumps[channel] = asyncio.create_task(pump(channel, run_state, message.after))
+                elif isinstance(message, SocketUnsubscribe):
+                    task = pumps.pop(message.channel, None)
+                    if task is not None:
+                        task.cancel()
+                else:
+                    accepted = False
+                    detail = "Unknown run_id"
+                    run_state = await app.state.registry.get(message.run_id)
+                    if run_state is not None:
+                        accepted = await run_state.interaction.resolve_input(message.request_id, message.response)
+                        detail = None if accepted else "Unknown request_id"
+                    ack = {"type": "input_ack", "run_id": message.run_id, "request_id": message.request_id}
+                    await send({**ack, "accepted": accepted, "detail": detail})
+        except WebSocketDisconnect:
+            pass
+        finally:
+            for task in list(pumps.values()):
+                task.cancel()
+
+    @app.delete("/api/runs/{run_id}")
+    async def cancel_run(run_id: str) -> dict[str, str]:
+        """Cancel an active run; it ends with a `cancelled` event and its graph task is stopped.
+
+        Answers with the run's status once it has stopped, or `cancelling` if it is still winding down
+        after a few seconds. Runs that already finished are a `409`.
+        """
+        registry: RunRegistry = app.state.registry
+        run_state = await registry.cancel(run_id)
+        if run_state is None:
+            if await registry.find(run_id) is not None:
+                raise HTTPException(status_code=409, detail="Run already finished")
+            raise HTTPException(status_code=404, detail="Unknown run_id")
+        done, _ = await asyncio.wait({run_state.task}, timeout=CANCEL_WAIT_SECONDS)
+        return {"run_id": run_id, "status": _final_status(run_state.reducer) if done else "cancelling"}
+
+    @app.get("/api/runs/{run_id}/tools")
+    async def list_tool_activity(
+        run_id: str,
+        offset: Annotated[int, Query(ge=0)] = 0,
+        limit: Annotated[int, Query(ge=1, le=TOOL_PAGE_LIMIT)] = 100,
+    ) -> ToolActivityPage:
+        """Return a page of a run's tool calls in call order."""
+        run_state = await app.state.registry.find(run_id)
+        if run_state is None:
+            raise HTTPException(status_code=404, detail="Unknown run_id")
+        tools = run_state.tools
+        return ToolActivityPage(run_id=run_id, total=len(tools), offset=offset, items=tools.page(offset, limit))
+
+    @app.get("/api/runs/{run_id}/snapshot")
+    async def get_run_snapshot(run_id: str) -> RunSnapshot:
+        """Return the run's current reduced state and the sequence number it reflects."""
+        run_state = await app.state.registry.find(run_id)
+        if run_state is None:
+            raise HTTPException(status_code=404, detail="Unknown run_id")
+        return run_state.reducer.snapshot()
+
+    @app.get("/api/runs/{run_id}/state")
+    async def get_run_state(run_id: str, seq: Annotated[int | None, Query(ge=0)] = None) -> RunSnapshot:
+        """Return the run state after its first `seq` events (all recorded events by default).
+
+        The state is rebuilt from the nearest keyframe plus at most `KEYFRAME_INTERVAL` events, so a
+        seek costs the same anywhere in the run. `seq` past the end is clamped to the last event.
+        """
+        run_state = await app.state.registry.find(run_id)
+        if run_state is not None:
+            return _state_at(run_state, seq)
+        store: RunHistoryStore | None = app.state.history
+        if store is not None:
+            snapshot = await asyncio.to_thread(store.state_at, run_id, seq)
+            if snapshot is not None:
+                return snapshot
+        raise HTTPException(status_code=404, detail="Unknown run_id")
+
+    @app.get("/api/runs/{run_id}/replay")
+    async def replay_run(
+        run_id: str,
+        speed: str = "1",
+        wire: WireMode = "json",
+        accept_encoding: Annotated[str | None, Header()] = None,
+    ) -> StreamingResponse:
+        """Re-emit a finished run's events as Server-Sent Events, in the same format as `/api/events`.
+
+        Gaps between events follow the recorded timestamps divided by `speed`; `speed=max` sends
+        everything as fast as possible. Runs are read from memory while recent, else from the history.
+        """
+        try:
+            factor = _replay_speed(speed)
+        except ValueError as exc:
+            raise HTTPException(status_code=400, detail=str(exc)) from exc
+        recorded = await _recorded_events(run_id)
+        preamble, frame = _sse_framing(wire, run_id, graph_node_ids(app.state.graph))
+
+        async def event_stream() -> AsyncIterator[bytes]:
+            """Yield the recorded events, paced by their original timing."""
+            if preamble:
+                yield preamble
+            previous: float | None = None
+            for item in recorded:
+                if factor is not None and previous is not None and item.recorded_at > previous:
+                    delay = (item.recorded_at - previous) / factor
+                    while heartbeat_interval is not None and delay > heartbeat_interval:
+                        await asyncio.sleep(heartbeat_interval)
+                        yield SSE_HEARTBEAT
+                        delay -= heartbeat_interval
+                    await asyncio.sleep(delay)
+                previous = item.recorded_at
+                yield frame(item.seq, item.event)
+
+        return _event_stream_response(event_stream(), accept_encoding)
+
+    def _event_stream_response(stream: AsyncIterator[bytes], accept_encoding: str | None) -> StreamingResponse:
+        headers = {
+            "Cache-Control": "no-cache",
+            "Connection": "keep-alive",
+            # Ask buffering proxies (e.g. nginx) to pass events through as they are written.
+            "X-Accel-Buffering": "no",
+        }
+        if compression is not None:
+            headers["Vary"] = "Accept-Encoding"
+            encoding = select_stream_encoding(accept_encoding)
+            if encoding is not None:
+                compressor = StreamCompressor(encoding, compression.level)
+                stream = compress_stream(stream, compressor, compression.flush_interval)
+                headers["Content-Encoding"] = encoding
+        return StreamingResponse(stream, media_type="text/event-stream", headers=headers)
+
+    async def _recorded_events(run_id: str) -> list[RecordedEvent]:
+        run_state = await app.state.registry.find(run_id)
+        if run_state is not None:
+            if not run_state.done.is_set():
+                raise HTTPException(status_code=409, detail="Run is still in progress")
+            trace = run_state.trace
+            return [
+                RecordedEvent(seq=trace.seqs[index], recorded_at=trace.timestamp(index), event=event)
+                for index, event in enumerate(trace)
+            ]
+        store: RunHistoryStore | None = app.state.history
+        if store is not None:
+            recorded = await asyncio.to_thread(store.load_events, run_id)
+            if recorded:
+                return recorded
+        raise HTTPException(status_code=404, detail="Unknown run_id")
+
+    @app.get("/api/history/runs")
+    async def list_run_history(
+        sort: HistorySort = "started_at",
+        offset: Annotated[int, Query(ge=0)] = 0,
+        limit: Annotated[int, Query(ge=1, le=HISTORY_PAGE_LIMIT)] = 50,
+    ) -> RunHistoryPage:
+        """Return a page of recorded runs, newest first (or longest first with `sort=duration`)."""
+        return await _search_history(RunQuery(sort=sort, offset=offset, limit=limit))
+
+    @app.get("/api/history/runs/search")
+    async def search_run_history(
+        status: str | None = None,
+        node_id: str | None = None,
+        error: str | None = None,
+        started_after: float | None = None,
+        started_before: float | None = None,
+        min_duration: Annotated[float | None, Query(ge=0)] = None,
+        max_duration: Annotated[float | None, Query(ge=0)] = None,
+        sort: HistorySort = "started_at",
+        offset: Annotated[int, Query(ge=0)] = 0,
+        limit: Annotated[int, Query(ge=1, le=HISTORY_PAGE_LIMIT)] = 50,
+    ) -> RunHistoryPage:
+        """Search recorded runs by status, visited node, error message prefix, start time and duration."""
+        query = RunQuery(
+            status=status,
+            node_id=node_id,
+            error=error,
+            started_after=started_after,
+            started_before=started_before,
+            min_duration=min_duration,
+            max_duration=max_duration,
+            sort=sort,
+            offset=offset,
+            limit=limit,
+        )
+        return await _search_history(query)
+
+    async def _search_history(query: RunQuery) -> RunHistoryPage:
+        store: RunHistoryStore | None = app.state.history
+        if store is None:
+            raise HTTPException(status_code=404, detail="Run history is not enabled")
+        return await asyncio.to_thread(store.search, query)
+
+    @app.get("/api/blobs/{blob_hash}")
+    async def get_blob(blob_hash: str, request: Request) -> Response:
+        """Return the full JSON payload behind a `BlobRef`; blobs never change, so they cache forever."""
+        headers = {"ETag": f'"{blob_hash}"', "Cache-Control": IMMUTABLE_CACHE_CONTROL}
+        if _etag_matches(request.headers.get("if-none-match"), headers["ETag"]):
+            return Response(status_code=304, headers=headers)
+        data = await asyncio.to_thread(app.state.blobs.get, blob_hash)
+        if data is None:
+            raise HTTPException(status_code=404, detail="Unknown blob")
+        return Response(data, media_type="application/json", headers=headers)
+
+    @app.api_route("/assets/{asset_path:path}", methods=["GET", "HEAD"])
+    async def studio_asset(asset_path: str, request: Request) -> Response:
+        """Serve a precompressed UI asset; content-hashed URLs are cached as immutable."""
+        resolved = static_bundle.resolve(asset_path)
+        if resolved is None:
+            raise HTTPException(status_code=404, detail="Not Found")
+        asset, immutable = resolved
+        encoding = asset.select_encoding(request.headers.get("accept-encoding"))
+        etag = asset.etag_for(encoding)
+        headers = {
+            "ETag": etag,
+            "Cache-Control": IMMUTABLE_CACHE_CONTROL if immutable else REVALIDATE_CACHE_CONTROL,
+            "Vary": "Accept-Encoding",
+        }
+        if _etag_matches(request.headers.get("if-none-match"), etag):
+            return Response(status_code=304, headers=headers)
+        if encoding != "identity":
+            headers["Content-Encoding"] = encoding
+        body = asset.encodings[encoding]
+        if request.method == "HEAD":
+            headers["Content-Length"] = str(len(body))
+            body = b""
+        return Response(body, media_type=asset.media_type, headers=headers)
 
     @app.get("/")
     async def studio_index() -> HTMLResponse:
         """Serve the bundled studio UI."""
-        return HTMLResponse(index_html)
+        return HTMLResponse(static_bundle.index_html, headers={"Cache-Control": REVALIDATE_CACHE_CONTROL})
 
     return app
+
+
+def _state_at(run_state: RunState, seq: int | None) -> RunSnapshot:
+    end = len(run_state.trace) if seq is None else min(seq, len(run_state.trace))
+    keyframe_count = min(end // KEYFRAME_INTERVAL, len(run_state.keyframes))
+    keyframe = run_state.keyframes[keyframe_count - 1] if keyframe_count else None
+    start = keyframe.seq if keyframe is not None else 0
+    return state_at(run_state.run_id, keyframe, run_state.trace.events(start, end))
+
+
+async def _follow(
+    run_state: RunState,
+    cursor: int,
+    *,
+    limit: int | None = None,
+    heartbeat: float | None = None,
+) -> AsyncIterator[tuple[int, list[Event]]]:
+    """Yield the run's events after `cursor` in batches as they are recorded, until the run is over.
+
+    Each batch comes with the sequence number of its first event and holds at most `limit` events.
+    With `heartbeat`, an empty batch is yielded whenever no event arrived for that many seconds; the
+    wait is bounded in place, so following a run never needs a timer task of its own.
+    """
+    trace = run_state.trace
+    updated = run_state.updated
+    run_state.subscribe()
+    try:
+        while True:
+            async with updated:
+                try:
+                    async with asyncio.timeout(heartbeat):
+                        while len(trace) <= cursor and not run_state.done.is_set():
+                            await updated.wait()
+                except TimeoutError:
+                    pass
+                end = len(trace)
+            if end <= cursor:
+                if run_state.done.is_set():
+                    return
+                yield cursor + 1, []
+                continue
+            if limit is not None:
+                end = min(end, cursor + limit)
+            yield cursor + 1, list(trace.events(cursor, end))
+            cursor = end
+    finally:
+        run_state.unsubscribe()
+
+
+def _batch_value(value: Any, default: Any, factory: Any) -> Any:
+    """Validate a batch item's JSON value against the class its factory builds or its default's type."""
+    if isinstance(factory, type):
+        target: Any = factory
+    elif default is not None:
+        target = type(default)
+    else:
+        return value
+    try:
+        adapter: TypeAdapter[Any] = TypeAdapter(target)
+    except PydanticSchemaGenerationError:
+        return value
+    return adapter.validate_python(value)
+
+
+def _sse_frame(seq: int, event: Event) -> bytes:
+    payload = json.dumps(event.model_dump(mode="json"))
+    return f"id: {seq}\ndata: {payload}\n\n".encode()
+
+
+def _final_status(reducer: RunReducer) -> str:
+    """Return a finished run's status; a run that never completed nor failed was cancelled."""
+    return "cancelled" if reducer.status in ("queued", "running") else reducer.status
+
+
+def _event_node_ids(event: Event) -> tuple[str | None, ...]:
+    if isinstance(event, EdgeTakenEvent):
+        return event.source_node_id, event.target_node_id
+    return (getattr(event, "node_id", None),)
+
+
+def _sse_framing(
+    wire: WireMode,
+    run_id: str,
+    node_ids: Sequence[str],
+) -> tuple[bytes, Callable[[int, Event], bytes]]:
+    """Return the stream preamble and the per-event SSE framing for a `wire` mode."""
+    if wire == "json":
+        return b"", _sse_frame
+    encoder = CompactEncoder(run_id, node_ids)
+
+    def frame(seq: int, event: Event) -> bytes:
+        *dictionaries, compact = encoder.encode(event)
+        head = b"".join(_sse_data(dictionary) for dictionary in dictionaries)
+        return head + f"id: {seq}\n".encode() + _sse_data(compact)
+
+    return _sse_data(encoder.dictionary()), frame
+
+
+def _sse_data(payload: dict[str, Any]) -> bytes:
+    return f"data: {json.dumps(payload, separators=(',', ':'))}\n\n".encode()
+
+
+def _replay_speed(value: str) -> float | None:
+    """Parse a replay speed factor; None means as fast as possible."""
+    if value == "max":
+        return None
+    try:
+        factor = float(value)
+    except ValueError:
+        factor = 0.0
+    if not factor > 0 or factor == float("inf"):
+        raise ValueError("speed must be a positive number or 'max'")
+    return factor
+
+
+def _etag_matches(if_none_match: str | None, etag: str) -> bool:
+    if not if_none_match:
+        return False
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*" or candidate.removeprefix("W/") == etag:
+            return True
+    return False
@@ -0,0 +1,154 @@
+"""Incrementally reduced run state, so late-joining clients can catch up without replaying events."""
+
+from __future__ import annotations
+
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+from typing import Literal
+
+from pydantic_graph_studio.schemas import (
+    EdgeTakenEvent,
+    ErrorEvent,
+    Event,
+    GraphEdge,
+    InputRequestEvent,
+    InputResponseEvent,
+    NodeEndEvent,
+    NodeStartEvent,
+    RunAdmittedEvent,
+    RunCancelledEvent,
+    RunEndEvent,
+    RunProgress,
+    RunQueuedEvent,
+    RunSnapshot,
+    ToolActivity,
+    ToolCallEvent,
+    ToolResultEvent,
+)
+
+KEYFRAME_INTERVAL = 256
+
+NodeStatus = Literal["active", "done", "error"]
+RunStatus = Literal["queued", "running", "completed", "failed", "cancelled"]
+
+
+@dataclass(slots=True)
+class RunReducer:
+    """Fold a run's events, in order, into the state exposed by `RunSnapshot`.
+
+    Every event is applied in O(1) and a snapshot costs O(state), independent of how many events the
+    run has produced. `seq` counts the events applied so far, and a reducer restored from a snapshot
+    with `from_snapshot` continues exactly where the original left off.
+    """
+
+    run_id: str
+    seq: int = 0
+    status: RunStatus = "running"
+    error: str | None = None
+    node_status: dict[str, NodeStatus] = field(default_factory=dict)
+    visit_counts: dict[str, int] = field(default_factory=dict)
+    last_edge: GraphEdge | None = None
+    progress: RunProgress = field(default_factory=RunProgress)
+    tools_total: int = 0
+    _open_tool_calls: dict[str, ToolActivity] = field(default_factory=dict)
+    _pending_inputs: dict[str, InputRequestEvent] = field(default_factory=dict)
+
+    @classmethod
+    def from_snapshot(cls, snapshot: RunSnapshot) -> RunReducer:
+        """Rebuild the reducer that produced `snapshot`."""
+
+        return cls(
+            run_id=snapshot.run_id,
+            seq=snapshot.seq,
+            status=snapshot.status,
+            error=snapshot.error,
+            node_status=dict(snapshot.node_status),
+            visit_counts=dict(snapshot.visit_counts),
+            last_edge=snapshot.last_edge,
+            progress=snapshot.progress.model_copy(),
+            tools_total=snapshot.tools_total,
+            _open_tool_calls={call.call_id: call.model_copy() for call in snapshot.open_tool_calls},
+            _pending_inputs={request.request_id: request for request in snapshot.pending_inputs},
+        )
+
+    def apply(self, event: Event) -> int:
+        """Apply the next event and return its sequence number (1-based)."""
+
+        self.seq += 1
+        progress = self.progress
+        if isinstance(event, NodeStartEvent):
+            self.node_status[event.node_id] = "active"
+            self.visit_counts[event.node_id] = self.visit_counts.get(event.node_id, 0) + 1
+            progress.nodes_started += 1
+        elif isinstance(event, NodeEndEvent):
+            self.node_status[event.node_id] = "done"
+            progress.nodes_finished += 1
+        elif isinstance(event, EdgeTakenEvent):
+            self.last_edge = GraphEdge(
+                source_node_id=event.source_node_id,
+                target_node_id=event.target_node_id,
+                dynamic=event.target_node_id is None,
+            )
+            progress.edges_taken += 1
+        elif isinstance(event, ToolCallEvent):
+            call = self._open_tool_calls.get(event.call_id)
+            if call is None:
+                # Numbered like `ToolActivityLog`, so `index` matches the paged tool activity.
+                call = ToolActivity(
+                    index=self.tools_total,
+                    call_id=event.call_id,
+                    node_id=event.node_id,
+                    tool_name=event.tool_name,
+                )
+                self._open_tool_calls[event.call_id] = call
+                self.tools_total += 1
+            call.arguments = event.arguments
+            progress.tool_calls += 1
+        elif isinstance(event, ToolResultEvent):
+            if self._open_tool_calls.pop(event.call_id, None) is None:
+                self.tools_total += 1
+            progress.tool_results += 1
+        elif isinstance(event, InputRequestEvent):
+            self._pending_inputs[event.request_id] = event
+        elif isinstance(event, InputResponseEvent):
+            self._pending_inputs.pop(event.request_id, None)
+        elif isinstance(event, RunEndEvent):
+            self.status = "completed"
+        elif isinstance(event, ErrorEvent):
+            self.status = "failed"
+            self.error = event.message
+            if event.node_id is not None:
+                self.node_status[event.node_id] = "error"
+        elif isinstance(event, RunQueuedEvent):
+            self.status = "queued"
+        elif isinstance(event, RunAdmittedEvent):
+            self.status = "running"
+        elif isinstance(event, RunCancelledEvent):
+            self.status = "cancelled"
+        return self.seq
+
+    def snapshot(self) -> RunSnapshot:
+        """Return a copy of the current state, tagged with the sequence number it reflects."""
+
+        return RunSnapshot(
+            run_id=self.run_id,
+            seq=self.seq,
+            status=self.status,
+            node_status=dict(self.node_status),
+            visit_counts=dict(self.visit_counts),
+            last_edge=self.last_edge,
+            open_tool_calls=[call.model_copy() for call in self._open_tool_calls.values()],
+            pending_inputs=list(self._pending_inputs.values()),
+            progress=self.progress.model_copy(),
+            tools_total=self.tools_total,
+            error=self.error,
+        )
+
+
+def state_at(run_id: str, keyframe: RunSnapshot | None, events: Iterable[Event]) -> RunSnapshot:
+    """Return the run state after applying `events` on top of `keyframe` (or the initial state)."""
+
+    reducer = RunReducer(run_id=run_id) if keyframe is None else RunReducer.from_snapshot(keyframe)
+    for event in events:
+        reducer.apply(event)
+    return reducer.snapshot()
@@ -0,0 +1,161 @@
+"""Precompressed, content-hashed bundle of the studio UI assets."""
+
+from __future__ import annotations
+
+import gzip
+import hashlib
+import mimetypes
+import re
+from dataclasses import dataclass
+from functools import cache
+from importlib import resources
+from importlib.resources.abc import Traversable
+from typing import Any
+
+brotli: Any | None = None
+try:  # pragma: no cover - optional brotli support
+    import brotli as _brotli
+except ModuleNotFoundError:  # pragma: no cover
+    pass
+else:
+    brotli = _brotli
+
+COMPRESSIBLE_SUFFIXES = frozenset({".css", ".html", ".js", ".json", ".map", ".svg", ".txt"})
+ENCODING_PREFERENCE = ("br", "gzip")
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+REVALIDATE_CACHE_CONTROL = "no-cache"
+
+_ASSET_REFERENCE = re.compile(r"/assets/([A-Za-z0-9_.-]+)(?:\?v=[^\"']*)?")
+
+
+@dataclass(frozen=True, slots=True)
+class StaticAsset:
+    """A single UI asset with its precomputed encodings.
+
+    `etag` is the digest of the uncompressed content; every encoding is served with its own strong
+    ETag from `etag_for`, since caches may only treat byte-identical representations as equal.
+    """
+
+    name: str
+    hashed_name: str
+    media_type: str
+    etag: str
+    encodings: dict[str, bytes]
+
+    def etag_for(self, encoding: str) -> str:
+        """Return the strong ETag of one encoding of the asset."""
+
+        if encoding == "identity":
+            return f'"{self.etag}"'
+        return f'"{self.etag}-{encoding}"'
+
+    def select_encoding(self, accept_encoding: str | None) -> str:
+        """Pick the best available encoding for an `Accept-Encoding` header."""
+
+        accepted = parse_accept_encoding(accept_encoding)
+        for encoding in ENCODING_PREFERENCE:
+            if encoding in self.encodings and accepted.get(encoding, accepted.get("*", 0.0)) > 0:
+                return encoding
+        return "identity"
+
+
+@dataclass(frozen=True, slots=True)
+class StaticBundle:
+    """All UI assets plus an `index.html` whose asset URLs point at content-hashed names."""
+
+    assets: dict[str, StaticAsset]
+    hashed: dict[str, StaticAsset]
+    index_html: str
+
+    def resolve(self, path: str) -> tuple[StaticAsset, bool] | None:
+        """Return the asset for a request path and whether the URL is content-hashed."""
+
+        asset = self.hashed.get(path)
+        if asset is not None:
+            return asset, True
+        asset = self.assets.get(path)
+        if asset is not None:
+            return asset, False
+        return None
+
+    def url_for(self, name: str) -> str:
+        """Return the content-hashed URL for an asset name."""
+
+        return f"/assets/{self.assets[name].hashed_name}"
+
+
+@cache
+def load_static_bundle() -> StaticBundle:
+    """Load and compress the bundled UI once per process."""
+
+    ui_root = resources.files("pydantic_graph_studio.ui")
+    return build_static_bundle(
+        (ui_root / "index.html").read_text(encoding="utf-8"),
+        ui_root / "assets",
+    )
+
+
+def build_static_bundle(index_html: str, assets_dir: Traversable) -> StaticBundle:
+    """Hash and precompress every file in `assets_dir` and rewrite `index_html` to match."""
+
+    assets: dict[str, StaticAsset] = {}
+    for entry in sorted(assets_dir.iterdir(), key=lambda item: item.name):
+        if not entry.is_file():
+            continue
+        asset = _build_asset(entry.name, entry.read_bytes())
+        assets[asset.name] = asset
+    hashed = {asset.hashed_name: asset for asset in assets.values()}
+
+    def _rewrite(match: re.Match[str]) -> str:
+        asset = assets.get(match.group(1))
+        return f"/assets/{asset.hashed_name}" if asset is not None else match.group(0)
+
+    return StaticBundle(assets=assets, hashed=hashed, index_html=_ASSET_REFERENCE.sub(_rewrite, index_html))
+
+
+def _build_asset(name: str, content: bytes) -> StaticAsset:
+    digest = hashlib.sha256(content).hexdigest()
+    stem, dot, suffix = name.rpartition(".")
+    hashed_name = f"{stem}.{digest[:12]}.{suffix}" if dot else f"{name}.{digest[:12]}"
+    media_type = mimetypes.guess_type(name)[0] or "application/octet-stream"
+    if media_type.startswith("text/") or media_type == "application/javascript":
+        media_type = f"{media_type}; charset=utf-8"
+
+    encodings = {"identity": content}
+    if f".{suffix}" in COMPRESSIBLE_SUFFIXES:
+        gzipped = gzip.compress(content, compresslevel=9, mtime=0)
+        if len(gzipped) < len(content):
+            encodings["gzip"] = gzipped
+        if brotli is not None:
+            compressed = brotli.compress(content, quality=11)
+            if len(compressed) < len(content):
+                encodings["br"] = compressed
+    return StaticAsset(
+        name=name,
+        hashed_name=hashed_name,
+        media_type=media_type,
+        etag=digest[:32],
+        encodings=encodings,
+    )
+
+
+def parse_accept_encoding(header: str | None) -> dict[str, float]:
+    """Map each coding in an `Accept-Encoding` header to its quality value."""
+
+    accepted: dict[str, float] = {}
+    if not header:
+        return accepted
+    for part in header.split(","):
+        token, _, params = part.strip().partition(";")
+        token = token.strip().lower()
+        if not token:
+            continue
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        accepted[token] = quality
+    return accepted
@@ -0,0 +1,215 @@
+"""Compact, column-wise in-memory storage of a run's events."""
+
+from __future__ import annotations
+
+import sys
+import time
+from array import array
+from collections.abc import Iterator
+from dataclasses import dataclass
+
+from pydantic import TypeAdapter
+
+from pydantic_graph_studio.schemas import (
+    EdgeTakenEvent,
+    Event,
+    NodeEndEvent,
+    NodeStartEvent,
+    RunEndEvent,
+)
+
+EVENT_TYPES: tuple[str, ...] = (
+    "node_start",
+    "node_end",
+    "edge_taken",
+    "run_end",
+    "tool_call",
+    "tool_result",
+    "input_request",
+    "input_response",
+    "error",
+    "run_queued",
+    "run_admitted",
+    "cancelled",
+)
+NO_NODE = -1
+
+_EVENT_CODES = {event_type: code for code, event_type in enumerate(EVENT_TYPES)}
+_NODE_START, _NODE_END, _EDGE_TAKEN, _RUN_END = (_EVENT_CODES[name] for name in EVENT_TYPES[:4])
+_EVENT_ADAPTER: TypeAdapter[Event] = TypeAdapter(Event)
+_ROW_NBYTES = sum(array(typecode).itemsize for typecode in "qqbii")
+
+
+@dataclass(frozen=True, slots=True)
+class TraceColumns:
+    """Views over a range of a `RunTrace`'s columns.
+
+    For a sealed trace the views are zero-copy and pin the underlying arrays; otherwise they view
+    copies, so a run can keep appending while they are held. Use the columns as a context manager (or
+    call `release`) to let go of the buffers promptly.
+    """
+
+    seqs: memoryview
+    timestamps: memoryview
+    kinds: memoryview
+    nodes: memoryview
+    targets: memoryview
+
+    def release(self) -> None:
+        for view in (self.seqs, self.timestamps, self.kinds, self.nodes, self.targets):
+            view.release()
+
+    def __enter__(self) -> TraceColumns:
+        return self
+
+    def __exit__(self, *_exc_info: object) -> None:
+        self.release()
+
+
+class RunTrace:
+    """A run's events stored column-wise instead of as a list of pydantic models.
+
+    Every event costs a fixed 25 bytes across the `seqs` and `timestamps` (`array('q')`, nanoseconds
+    since the epoch), `kinds` (an index into `EVENT_TYPES`), `nodes` and `targets` columns; node ids
+    are interned into `node_ids` and referenced by position (`NO_NODE` when absent). Node and edge
+    events are rebuilt from the columns alone. The rarer, payload-heavy events (tool calls and results,
+    input requests and responses, errors) also keep their JSON in a side table keyed by position.
+    A trace is `seal`ed once its run has ended, after which it can no longer be appended to.
+    `nbytes` approximates the memory held by the columns, interned ids and payload table, kept up to
+    date as events are appended.
+    """
+
+    __slots__ = (
+        "run_id",
+        "seqs",
+        "timestamps",
+        "kinds",
+        "nodes",
+        "targets",
+        "node_ids",
+        "sealed",
+        "nbytes",
+        "_node_codes",
+        "_payloads",
+    )
+
+    def __init__(self, run_id: str) -> None:
+        self.run_id = run_id
+        self.seqs = array("q")
+        self.timestamps = array("q")
+        self.kinds = array("b")
+        self.nodes = array("i")
+        self.targets = array("i")
+        self.node_ids: list[str] = []
+        self.sealed = False
+        self.nbytes = 0
+        self._node_codes: dict[str, int] = {}
+        self._payloads: dict[int, bytes] = {}
+
+    def __len__(self) -> int:
+        return len(self.kinds)
+
+    def __iter__(self) -> Iterator[Event]:
+        return self.events()
+
+    def __getitem__(self, index: int) -> Event:
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("trace index out of range")
+        return self._event(index)
+
+    def append(self, event: Event, *, timestamp_ns: int | None = None) -> int:
+        """Append `event` and return its sequence number (1-based)."""
+
+        if self.sealed:
+            raise RuntimeError(f"Trace of run {self.run_id} is sealed")
+        seq = self.seqs[-1] + 1 if self.seqs else 1
+        code = _EVENT_CODES[event.event_type]
+        node = target = NO_NODE
+        if isinstance(event, EdgeTakenEvent):
+            node = self._intern(event.source_node_id)
+            if event.target_node_id is not None:
+                target = self._intern(event.target_node_id)
+        else:
+            node_id = getattr(event, "node_id", None)
+            if node_id is not None:
+                node = self._intern(node_id)
+        if code > _RUN_END:
+            payload = self._payloads[len(self)] = event.model_dump_json().encode()
+            self.nbytes += sys.getsizeof(payload)
+        self.nbytes += _ROW_NBYTES
+        self.seqs.append(seq)
+        self.timestamps.append(time.time_ns() if timestamp_ns is None else timestamp_ns)
+        self.kinds.append(code)
+        self.nodes.append(node)
+        self.targets.append(target)
+        return seq
+
+    def events(self, start: int = 0, stop: int | None = None) -> Iterator[Event]:
+        """Yield the events at positions `start` to `stop` (exclusive), rebuilt as pydantic models."""
+
+        stop = len(self) if stop is None else min(stop, len(self))
+        for index in range(max(start, 0), stop):
+            yield self._event(index)
+
+    def timestamp(self, index: int) -> float:
+        """Return when the event at `index` was recorded, in seconds since the epoch."""
+
+        return self.timestamps[index] / 1e9
+
+    def seal(self) -> None:
+        """Mark the trace as complete; later appends raise `RuntimeError`."""
+
+        self.sealed = True
+
+    def columns(self, start: int = 0, stop: int | None = None) -> TraceColumns:
+        """Return views of the columns for positions `start` to `stop`.
+
+        They are zero-copy once the trace is sealed; while it may still grow they view copies of the
+        range, since a view pinning a live column would make the run's next append fail.
+        """
+
+        if self.sealed:
+            return TraceColumns(
+                seqs=memoryview(self.seqs)[start:stop],
+                timestamps=memoryview(self.timestamps)[start:stop],
+                kinds=memoryview(self.kinds)[start:stop],
+                nodes=memoryview(self.nodes)[start:stop],
+                targets=memoryview(self.targets)[start:stop],
+            )
+        return TraceColumns(
+            seqs=memoryview(self.seqs[start:stop]),
+            timestamps=memoryview(self.timestamps[start:stop]),
+            kinds=memoryview(self.kinds[start:stop]),
+            nodes=memoryview(self.nodes[start:stop]),
+            targets=memoryview(self.targets[start:stop]),
+        )
+
+    def _intern(self, node_id: str) -> int:
+        code = self._node_codes.get(node_id)
+        if code is None:
+            code = self._node_codes[node_id] = len(self.node_ids)
+            self.node_ids.append(node_id)
+            self.nbytes += sys.getsizeof(node_id)
+        return code
+
+    def _event(self, index: int) -> Event:
+        code = self.kinds[index]
+        if code > _RUN_END:
+            return _EVENT_ADAPTER.validate_json(self._payloads[index])
+        run_id = self.run_id
+        if code == _RUN_END:
+            return RunEndEvent.model_construct(run_id=run_id, event_type="run_end")
+        node_id = self.node_ids[self.nodes[index]]
+        if code == _NODE_START:
+            return NodeStartEvent.model_construct(run_id=run_id, event_type="node_start", node_id=node_id)
+        if code == _NODE_END:
+            return NodeEndEvent.model_construct(run_id=run_id, event_type="node_end", node_id=node_id)
+        target = self.targets[index]
+        return EdgeTakenEvent.model_construct(
+            run_id=run_id,
+            event_type="edge_taken",
+            source_node_id=node_id,
+            target_node_id=None if target == NO_NODE else self.node_ids[target],
+        )
@@ -13,8 +13,45 @@
     useEdgesState,
     useNodesState,
   } = RF;
-  const dagreLib = window.dagre;
-  const hasDagre = dagreLib && dagreLib.graphlib && typeof dagreLib.layout === "function";
+  const assetUrls = window.PGRAPH_ASSETS || {};
+  let dagreLib = window.dagre;
+  const hasDagre = () =>
+    Boolean(dagreLib && dagreLib.graphlib && typeof dagreLib.layout === "function");
+
+  function loadDagre() {
+    if (hasDagre() || !assetUrls.dagre) {
+      return Promise.resolve(hasDagre());
+    }
+    return new Promise((resolve) => {
+      const script = document.createElement("script");
+      script.src = assetUrls.dagre;
+      script.onload = () => {
+        dagreLib = window.dagre;
+        resolve(hasDagre());
+      };
+      script.onerror = () => resolve(false);
+      document.head.appendChild(script);
+    });
+  }
+
+  const RunState = window.PGraphRunState;
+  const ancestorLookupBatch = 200;
+  const eventWorkerSupported =
+    typeof Worker !== "undefined" && Boolean(assetUrls.runWorker && assetUrls.runState);
+  const pageParams = new URLSearchParams(window.location.search);
+  const clusterStrategy = pageParams.get("cluster") || "module";
+  const replayRunId = pageParams.get("replay");
+  const replaySpeed = pageParams.get("speed") || "max";
+  // `?transport=ws` streams runs over the `/api/ws` WebSocket (`?transport=ws-json` for its JSON framing).
+  const socketTransport = pageParams.get("transport")?.startsWith("ws") && typeof WebSocket !== "undefined";
+  const socketFormat = pageParams.get("transport") === "ws-json" ? "json" : "binary";
+  // `?wire=compact` asks SSE streams for interned node ids and short field names.
+  const compactWire = pageParams.get("wire") === "compact";
+  const toolActivityLimit = Math.max(1, Number.parseInt(pageParams.get("tools"), 10) || 200);
+  const toolRowHeight = 150;
+  const toolRowOverscan = 4;
+  const toolPageSize = 100;
+  const toolPageCacheLimit = 8;
 
   const statusClasses = {
     idle: "studio-node--idle",
@@ -37,6 +74,34 @@
 
   const nodeBase = "studio-node";
 
+  // Large payloads arrive as `{$blob, size, preview}` references; the full JSON is served from
+  // `/api/blobs/{hash}` and only fetched when the user opens it.
+  function isBlobRef(value) {
+    return Boolean(value) && typeof value === "object" && typeof value.$blob === "string";
+  }
+
+  function formatBytes(size) {
+    if (size < 1024) return `${size} B`;
+    if (size < 1024 * 1024) return `${(size / 1024).toFixed(1)} KiB`;
+    return `${(size / (1024 * 1024)).toFixed(1)} MiB`;
+  }
+
+  function PayloadView({ value, className }) {
+    if (!isBlobRef(value)) {
+      return e("pre", { className }, JSON.stringify(value, null, 2));
+    }
+    return e(
+      "div",
+      { className: "studio-blob" },
+      e("pre", { className }, value.preview),
+      e(
+        "a",
+        { className: "studio-blob-link", href: `/api/blobs/${value.$blob}`, target: "_blank", rel: "noreferrer" },
+        `Open full payload (${formatBytes(value.size)})`,
+      ),
+    );
+  }
+
   function formatApprovalContext(context) {
     if (context === null || context === undefined) {
       return "";
@@ -51,19 +116,6 @@
     }
   }
 
-  function extractNumber(value) {
-    if (typeof value === "number" && Number.isFinite(value)) {
-      return value;
-    }
-    if (typeof value === "string") {
-      const parsed = Number(value);
-      if (Number.isFinite(parsed)) {
-        return parsed;
-      }
-    }
-    return null;
-  }
-
   function StudioNode({ data }) {
     const statusClass = statusClasses[data.status || "idle"] || statusClasses.idle;
     const badges = [];
@@ -85,7 +137,10 @@
 
     return e(
       "div",
-      { className: `${nodeBase} ${statusClass}` },
+      {
+        className: `${nodeBase} ${statusClass}${data.isCluster ? " studio-node--cluster" : ""}`,
+        title: data.isCluster ? "Double-click to expand" : undefined,
+      },
       e(Handle, { type: "target", position: "top", style: { opacity: 0 } }),
       e("div", { className: "text-sm font-semibold" }, data.label || data.id),
       badges.length
@@ -141,14 +196,12 @@
     return { width, height };
   }
 
-  function buildFlowGraphDagre(graph) {
-    const nodes = [];
-    const edges = [];
+  function collectFlowElements(graph) {
     const nodeData = new Map();
-    const sizeById = new Map();
     const dynamicNodesBySource = new Map();
     const entrySet = new Set(graph.entry_nodes || []);
     const terminalSet = new Set(graph.terminal_nodes || []);
+    const clusterSet = graph.clusterIds || new Set();
 
     graph.nodes.forEach((node) => {
       nodeData.set(node.node_id, {
@@ -157,6 +210,7 @@
         isEntry: entrySet.has(node.node_id),
         isTerminal: terminalSet.has(node.node_id),
         isDynamic: false,
+        isCluster: clusterSet.has(node.node_id),
       });
     });
 
@@ -174,6 +228,7 @@
             isEntry: false,
             isTerminal: false,
             isDynamic: true,
+            isCluster: false,
           });
         }
         target = dynamicId;
@@ -185,6 +240,68 @@
       });
     });
 
+    return { nodeData, edgesInput };
+  }
+
+  function flowNode(nodeId, data, position) {
+    return {
+      id: nodeId,
+      type: "studio",
+      position,
+      sourcePosition: "bottom",
+      targetPosition: "top",
+      data: {
+        id: nodeId,
+        label: data.label || nodeId,
+        status: "idle",
+        isEntry: data.isEntry,
+        isTerminal: data.isTerminal,
+        isDynamic: data.isDynamic,
+        isCluster: Boolean(data.isCluster),
+      },
+    };
+  }
+
+  function flowEdge(edge, index, routeX) {
+    return {
+      id: `e-${edge.source}-${edge.target}-${index}`,
+      source: edge.source,
+      target: edge.target,
+      type: "studio",
+      animated: false,
+      style: {
+        ...edgeBaseStyle,
+        ...(edge.dynamic ? { strokeDasharray: "4 3" } : null),
+      },
+      data: {
+        dynamic: edge.dynamic,
+        routeX,
+      },
+    };
+  }
+
+  function buildFlowGraphFromLayout(graph) {
+    const { nodeData, edgesInput } = collectFlowElements(graph);
+    const positions = new Map(
+      graph.layout.nodes.map((item) => [item.node_id, { x: item.x, y: item.y }]),
+    );
+    const routes = graph.layout.edge_route_x || [];
+    const nodes = [];
+    nodeData.forEach((data, nodeId) => {
+      nodes.push(flowNode(nodeId, data, positions.get(nodeId) || { x: 0, y: 0 }));
+    });
+    const edges = edgesInput.map((edge, index) => {
+      const routeX = routes[index];
+      return flowEdge(edge, index, typeof routeX === "number" ? routeX : undefined);
+    });
+    return { nodes, edges };
+  }
+
+  function buildFlowGraphDagre(graph) {
+    const { nodeData, edgesInput } = collectFlowElements(graph);
+    const nodes = [];
+    const sizeById = new Map();
+
     const dagreGraph = new dagreLib.graphlib.Graph();
     dagreGraph.setGraph({
       rankdir: "TB",
@@ -210,42 +327,15 @@
     nodeData.forEach((data, nodeId) => {
       const layout = dagreGraph.node(nodeId) || { x: 0, y: 0 };
       const size = sizeById.get(nodeId) || { width: 180, height: 72 };
-      nodes.push({
-        id: nodeId,
-        type: "studio",
-        position: {
+      nodes.push(
+        flowNode(nodeId, data, {
           x: layout.x - size.width / 2,
           y: layout.y - size.height / 2,
-        },
-        sourcePosition: "bottom",
-        targetPosition: "top",
-        data: {
-          id: nodeId,
-          label: data.label || nodeId,
-          status: "idle",
-          isEntry: data.isEntry,
-          isTerminal: data.isTerminal,
-          isDynamic: data.isDynamic,
-        },
-      });
+        }),
+      );
     });
 
-    edgesInput.forEach((edge, index) => {
-      edges.push({
-        id: `e-${edge.source}-${edge.target}-${index}`,
-        source: edge.source,
-        target: edge.target,
-        type: "studio",
-        animated: false,
-        style: {
-          ...edgeBaseStyle,
-          ...(edge.dynamic ? { strokeDasharray: "4 3" } : null),
-        },
-        data: {
-          dynamic: edge.dynamic,
-        },
-      });
-    });
+    const edges = edgesInput.map((edge, index) => flowEdge(edge, index, undefined));
 
     return { nodes, edges };
   }
@@ -426,6 +516,7 @@
             status: "idle",
             isEntry: graph.entry_nodes.includes(nodeId),
             isTerminal: graph.terminal_nodes.includes(nodeId),
+            isCluster: Boolean(graph.clusterIds?.has(nodeId)),
           },
         });
       });
@@ -525,25 +616,184 @@
     return { nodes, edges };
   }
 
-  function buildFlowGraph(graph) {
-    if (hasDagre) {
+  async function buildFlowGraph(graph) {
+    if (graph.layout) {
+      return buildFlowGraphFromLayout(graph);
+    }
+    if (await loadDagre()) {
       return buildFlowGraphDagre(graph);
     }
     return buildFlowGraphHeuristic(graph);
   }
 
+  function toolFromServer(item) {
+    return {
+      index: item.index,
+      callId: item.call_id,
+      nodeId: item.node_id,
+      toolName: item.tool_name,
+      arguments: item.arguments,
+      output: item.completed ? item.output : null,
+      success: item.success,
+    };
+  }
+
+  function ToolActivityRow({ item, top }) {
+    const style = { top, height: toolRowHeight - 10 };
+    if (!item) {
+      return e(
+        "article",
+        { className: "studio-tool-item", style },
+        e("p", { className: "studio-tool-pending" }, "Loading…"),
+      );
+    }
+    return e(
+      "article",
+      { className: "studio-tool-item", style },
+      e("p", { className: "studio-tool-name" }, item.toolName),
+      e("p", { className: "studio-tool-meta" }, `#${item.index + 1} · node ${item.nodeId}`),
+      item.arguments !== undefined ? e(PayloadView, { value: item.arguments, className: "studio-tool-json" }) : null,
+      item.output !== null
+        ? e(PayloadView, { value: item.output, className: "studio-tool-json" })
+        : e("p", { className: "studio-tool-pending" }, "Waiting for result…"),
+    );
+  }
+
+  // Newest-first list of every tool call in the run that only renders the rows in view. The newest
+  // calls come from the bounded in-memory ring; older ones are fetched a page at a time from
+  // `/api/runs/{run_id}/tools` and kept in a small page cache.
+  function ToolActivityList({ activity, runId }) {
+    const containerRef = useRef(null);
+    const pagesRef = useRef(new Map());
+    const [viewport, setViewport] = useState({ scrollTop: 0, height: 0 });
+    const [, setPagesVersion] = useState(0);
+
+    useEffect(() => {
+      pagesRef.current = new Map();
+      setPagesVersion((version) => version + 1);
+    }, [runId]);
+
+    useEffect(() => {
+      const element = containerRef.current;
+      if (!element) return undefined;
+      const measure = () => setViewport({ scrollTop: element.scrollTop, height: element.clientHeight });
+      measure();
+      if (typeof ResizeObserver === "undefined") return undefined;
+      const observer = new ResizeObserver(measure);
+      observer.observe(element);
+      return () => observer.disconnect();
+    }, []);
+
+    const total = activity.total;
+    const height = viewport.height || toolRowHeight * 4;
+    const first = Math.max(0, Math.floor(viewport.scrollTop / toolRowHeight) - toolRowOverscan);
+    const last = Math.min(total, Math.ceil((viewport.scrollTop + height) / toolRowHeight) + toolRowOverscan);
+    const rows = [];
+    const missingPages = [];
+    for (let row = first; row < last; row += 1) {
+      const index = total - 1 - row;
+      let item = null;
+      if (index >= activity.base) {
+        item = activity.items[index - activity.base] || null;
+      } else {
+        const pageNumber = Math.floor(index / toolPageSize);
+        const page = pagesRef.current.get(pageNumber);
+        if (Array.isArray(page)) {
+          item = page[index - pageNumber * toolPageSize] || null;
+        } else if (page === undefined && !missingPages.includes(pageNumber)) {
+          missingPages.push(pageNumber);
+        }
+      }
+      rows.push(e(ToolActivityRow, { key: index, item, top: row * toolRowHeight }));
+    }
+
+    const missingKey = missingPages.join(",");
+    useEffect(() => {
+      if (!runId || !missingPages.length) return;
+      const pages = pagesRef.current;
+      missingPages.forEach(async (pageNumber) => {
+        pages.set(pageNumber, "loading");
+        try {
+          const params = new URLSearchParams({ offset: pageNumber * toolPageSize, limit: toolPageSize });
+          const response = await fetch(`/api/runs/${runId}/tools?${params}`);
+          if (!response.ok) throw new Error(`Failed to load tool activity (${response.status})`);
+          const payload = await response.json();
+          if (pagesRef.current !== pages) return;
+          pages.set(pageNumber, payload.items.map(toolFromServer));
+          while (pages.size > toolPageCacheLimit) {
+            pages.delete(pages.keys().next().value);
+          }
+        } catch (_error) {
+          if (pagesRef.current !== pages) return;
+          pages.set(pageNumber, []);
+        }
+        setPagesVersion((version) => version + 1);
+      });
+    }, [runId, missingKey]);
+
+    return e(
+      "div",
+      {
+        ref: containerRef,
+        className: "studio-tool-list",
+        onScroll: (event) =>
+          setViewport({ scrollTop: event.currentTarget.scrollTop, height: event.currentTarget.clientHeight }),
+      },
+      e("div", { className: "studio-tool-spacer", style: { height: total * toolRowHeight } }, rows),
+    );
+  }
+
+  async function fetchGraphView(expand) {
+    const params = new URLSearchParams({ strategy: clusterStrategy, layout: "true" });
+    (expand || []).forEach((clusterId) => params.append("expand", clusterId));
+    const response = await fetch(`/api/graph/view?${params}`);
+    if (!response.ok) {
+      throw new Error(`Failed to load graph (${response.status})`);
+    }
+    const view = await response.json();
+    const graph = { ...view.graph, clusterIds: new Set(view.clusters.map((item) => item.cluster_id)) };
+    return {
+      graph,
+      view: {
+        expanded: view.expanded,
+        isDefault: expand === null,
+        visible: new Set(view.graph.nodes.map((node) => node.node_id)),
+        members: new Map(),
+      },
+    };
+  }
+
   function App() {
     const [graph, setGraph] = useState(null);
     const [nodes, setNodes, onNodesChange] = useNodesState([]);
     const [edges, setEdges, onEdgesChange] = useEdgesState([]);
-    const [status, setStatus] = useState({ phase: "idle", runId: null, error: null });
-    const [toolActivity, setToolActivity] = useState([]);
+    const [status, setStatus] = useState({ phase: "idle", runId: null, replay: false, error: null });
+    const [timeline, setTimeline] = useState(null);
+    const [toolActivity, setToolActivity] = useState(RunState.emptyToolActivity);
     const [pendingInput, setPendingInput] = useState(null);
     const [streaming, setStreaming] = useState({ current: 0, total: null, chunks: [] });
-    const eventSourceRef = useRef(null);
+    const streamRef = useRef(null);
+    const viewRef = useRef(null);
+    const runStateRef = useRef(RunState.createRunState({ toolLimit: toolActivityLimit }));
+    const pendingEventsRef = useRef([]);
+    const frameRef = useRef(null);
+    const nodeIndexRef = useRef(new Map());
+    const edgeIndexRef = useRef(new Map());
+    const ancestorsRef = useRef(new Map());
+    const lookupsRef = useRef({
+      pending: new Set(),
+      inFlight: false,
+      deferredNodes: new Set(),
+      deferredEdges: new Set(),
+    });
 
     const statusLabel = useMemo(() => {
-      if (status.phase === "running") return `Running ${status.runId || ""}`.trim();
+      if (status.phase === "running" && status.queuePosition) {
+        return `Queued #${status.queuePosition} ${status.runId || ""}`.trim();
+      }
+      if (status.phase === "running") {
+        return `${status.replay ? "Replaying" : "Running"} ${status.runId || ""}`.trim();
+      }
       if (status.phase === "error") return "Error";
       if (status.phase === "loading") return "Loading";
       if (status.phase === "ready") return "Ready";
@@ -556,16 +806,11 @@
       const load = async () => {
         setStatus((current) => ({ ...current, phase: "loading", error: null }));
         try {
-          const response = await fetch("/api/graph");
-          if (!response.ok) {
-            throw new Error(`Failed to load graph (${response.status})`);
-          }
-          const data = await response.json();
+          const { graph: data, view } = await fetchGraphView(null);
           if (!active) return;
-          const { nodes: nextNodes, edges: nextEdges } = buildFlowGraph(data);
-          setGraph(data);
-          setNodes(nextNodes);
-          setEdges(nextEdges);
+          const { nodes: nextNodes, edges: nextEdges } = await buildFlowGraph(data);
+          if (!active) return;
+          showView(view, data, nextNodes, nextEdges);
           setStatus((current) => ({ ...current, phase: "ready", error: null }));
         } catch (error) {
           if (!active) return;
@@ -577,14 +822,170 @@
 
       return () => {
         active = false;
-        if (eventSourceRef.current) {
-          eventSourceRef.current.close();
-          eventSourceRef.current = null;
+        if (frameRef.current !== null) {
+          cancelAnimationFrame(frameRef.current);
+          frameRef.current = null;
+        }
+        if (streamRef.current) {
+          streamRef.current.close();
+          streamRef.current = null;
         }
       };
     }, [setNodes, setEdges]);
 
+    const showView = (view, data, nextNodes, nextEdges) => {
+      viewRef.current = view;
+      nodeIndexRef.current = RunState.indexNodes(nextNodes);
+      edgeIndexRef.current = RunState.indexEdges(nextEdges);
+      setGraph(data);
+      setNodes(nextNodes);
+      setEdges(nextEdges);
+    };
+
+    // Map a graph node id to the element drawn for it: itself, its collapsed cluster, null when it is
+    // not drawn at all, or undefined while its clusters are still being looked up.
+    const visibleOf = (nodeId) => {
+      const view = viewRef.current;
+      if (!view) return null;
+      if (view.visible.has(nodeId)) return nodeId;
+      const ancestors = ancestorsRef.current.get(nodeId);
+      if (!ancestors) {
+        lookupsRef.current.pending.add(nodeId);
+        return undefined;
+      }
+      const target = ancestors.find((clusterId) => view.visible.has(clusterId)) || null;
+      if (target) {
+        if (!view.members.has(target)) view.members.set(target, new Set());
+        view.members.get(target).add(nodeId);
+      }
+      return target;
+    };
+
+    const rollupStatus = (clusterId) => {
+      const { nodeStatus } = runStateRef.current;
+      let rolled = "idle";
+      (viewRef.current?.members.get(clusterId) || []).forEach((nodeId) => {
+        const memberStatus = nodeStatus.get(nodeId) || "idle";
+        if (RunState.statusPriority[memberStatus] > RunState.statusPriority[rolled]) rolled = memberStatus;
+      });
+      return rolled;
+    };
+
+    const lookupAncestors = async () => {
+      const lookups = lookupsRef.current;
+      if (lookups.inFlight || !lookups.pending.size) return;
+      const nodeIds = [...lookups.pending].slice(0, ancestorLookupBatch);
+      nodeIds.forEach((nodeId) => lookups.pending.delete(nodeId));
+      lookups.inFlight = true;
+      let ancestors = {};
+      try {
+        const params = new URLSearchParams({ strategy: clusterStrategy });
+        nodeIds.forEach((nodeId) => params.append("node_id", nodeId));
+        const response = await fetch(`/api/graph/clusters?${params}`);
+        if (response.ok) {
+          ancestors = (await response.json()).ancestors;
+        }
+      } catch (_error) {
+        // Unresolvable nodes are simply not drawn.
+      }
+      nodeIds.forEach((nodeId) => ancestorsRef.current.set(nodeId, ancestors[nodeId] || []));
+      lookups.inFlight = false;
+      const state = runStateRef.current;
+      lookups.deferredNodes.forEach((nodeId) => state.dirtyNodes.add(nodeId));
+      lookups.deferredEdges.forEach((key) => state.dirtyEdges.add(key));
+      lookups.deferredNodes.clear();
+      lookups.deferredEdges.clear();
+      scheduleFlush();
+    };
+
+    // Apply every event received since the previous animation frame in one pass: each changed node or
+    // edge is patched through its index, so a frame costs O(changes) plus a single array copy.
+    const flushEvents = () => {
+      frameRef.current = null;
+      const state = runStateRef.current;
+      const events = pendingEventsRef.current;
+      pendingEventsRef.current = [];
+      events.forEach((payload) => RunState.reduceEvent(state, payload));
+      const diff = RunState.takeDiff(state);
+      const lookups = lookupsRef.current;
+
+      const nodeUpdates = new Map();
+      diff.nodes.forEach(([nodeId, nodeStatus]) => {
+        const target = visibleOf(nodeId);
+        if (target === undefined) {
+          lookups.deferredNodes.add(nodeId);
+        } else if (target) {
+          nodeUpdates.set(target, target === nodeId ? nodeStatus : rollupStatus(target));
+        }
+      });
+
+      const edgeKeys = [];
+      diff.edges.forEach(([sourceId, targetId]) => {
+        const source = visibleOf(sourceId);
+        const target = targetId ? visibleOf(targetId) : null;
+        if (source === undefined || target === undefined) {
+          lookups.deferredEdges.add(RunState.edgeKey(sourceId, targetId));
+        } else if (source && (!targetId || target) && !(target === source && source !== sourceId)) {
+          edgeKeys.push(RunState.edgeKey(source, target));
+        }
+      });
+
+      if (nodeUpdates.size) {
+        setNodes((current) => {
+          const next = RunState.patchNodes(current, nodeIndexRef.current, nodeUpdates);
+          if (next !== null) return next;
+          nodeIndexRef.current = RunState.indexNodes(current);
+          return RunState.patchNodes(current, nodeIndexRef.current, nodeUpdates) || current;
+        });
+      }
+      if (edgeKeys.length) {
+        setEdges((current) => {
+          const next = RunState.patchEdges(current, edgeIndexRef.current, edgeKeys, edgeActiveStyle);
+          if (next !== null) return next;
+          edgeIndexRef.current = RunState.indexEdges(current);
+          return RunState.patchEdges(current, edgeIndexRef.current, edgeKeys, edgeActiveStyle) || current;
+        });
+      }
+      if (diff.tools.length) {
+        setToolActivity((current) => RunState.patchTools(current, diff.tools, toolActivityLimit));
+      }
+      if (diff.streaming) setStreaming(diff.streaming);
+      lookupAncestors();
+    };
+
+    const scheduleFlush = () => {
+      if (frameRef.current === null) {
+        frameRef.current = requestAnimationFrame(flushEvents);
+      }
+    };
+
+    const enqueueEvent = (payload) => {
+      pendingEventsRef.current.push(payload);
+      scheduleFlush();
+    };
+
+    const changeView = async (expand) => {
+      try {
+        const { graph: data, view } = await fetchGraphView(expand);
+        const { nodes: nextNodes, edges: nextEdges } = await buildFlowGraph(data);
+        showView(view, data, nextNodes, nextEdges);
+        RunState.markAllDirty(runStateRef.current);
+        scheduleFlush();
+      } catch (error) {
+        setStatus((current) => ({ ...current, error: error.message }));
+      }
+    };
+
+    const expandCluster = (_event, node) => {
+      if (!node.data?.isCluster || !viewRef.current) return;
+      changeView([...viewRef.current.expanded, node.id]);
+    };
+
     const resetRunVisuals = () => {
+      runStateRef.current = RunState.createRunState({ toolLimit: toolActivityLimit });
+      pendingEventsRef.current = [];
+      lookupsRef.current.deferredNodes.clear();
+      lookupsRef.current.deferredEdges.clear();
       setNodes((current) =>
         current.map((node) => ({
           ...node,
@@ -602,11 +1003,53 @@
           },
         })),
       );
-      setToolActivity([]);
+      setToolActivity(RunState.emptyToolActivity());
       setPendingInput(null);
       setStreaming({ current: 0, total: null, chunks: [] });
     };
 
+    const seekRef = useRef({ inFlight: false, pending: null });
+
+    const loadTimeline = async (runId) => {
+      try {
+        const response = await fetch(`/api/runs/${runId}/state`);
+        if (!response.ok) return;
+        const snapshot = await response.json();
+        setTimeline({ runId, total: snapshot.seq, seq: snapshot.seq });
+      } catch (_error) {
+        // Without a timeline the finished run simply cannot be scrubbed.
+      }
+    };
+
+    // Show the run as it was after `seq` events. Seeks issued while one is loading collapse into the
+    // latest, so dragging the scrubber never queues more than one request.
+    const seekTimeline = async (runId, seq) => {
+      const seek = seekRef.current;
+      if (seek.inFlight) {
+        seek.pending = seq;
+        return;
+      }
+      seek.inFlight = true;
+      try {
+        const response = await fetch(`/api/runs/${runId}/state?seq=${seq}`);
+        if (!response.ok) throw new Error(`Failed to load run state (${response.status})`);
+        const snapshot = await response.json();
+        resetRunVisuals();
+        setTimeline((current) => (current && current.runId === runId ? { ...current, seq: snapshot.seq } : current));
+        runStateRef.current = RunState.fromSnapshot(snapshot, { toolLimit: toolActivityLimit });
+        scheduleFlush();
+      } catch (error) {
+        setStatus((current) => ({ ...current, error: error.message }));
+      } finally {
+        seek.inFlight = false;
+        if (seek.pending !== null) {
+          const next = seek.pending;
+          seek.pending = null;
+          seekTimeline(runId, next);
+        }
+      }
+    };
+
     const submitInput = async (response) => {
       if (!status.runId || !pendingInput) {
         return;
@@ -619,18 +1062,26 @@
         return { ...current, submitting: true, error: null };
       });
       try {
-        const httpResponse = await fetch("/api/input", {
-          method: "POST",
-          headers: { "Content-Type": "application/json" },
-          body: JSON.stringify({
-            run_id: status.runId,
-            request_id: requestId,
-            response,
-          }),
-        });
-        if (!httpResponse.ok) {
-          const message = await httpResponse.text();
-          throw new Error(message || `Failed to submit input (${httpResponse.status})`);
+        const handle = streamRef.current;
+        if (handle && handle.sendInput) {
+          const ack = await handle.sendInput(status.runId, requestId, response);
+          if (!ack.accepted) {
+            throw new Error(ack.detail || "Failed to submit input");
+          }
+        } else {
+          const httpResponse = await fetch("/api/input", {
+            method: "POST",
+            headers: { "Content-Type": "application/json" },
+            body: JSON.stringify({
+              run_id: status.runId,
+              request_id: requestId,
+              response,
+            }),
+          });
+          if (!httpResponse.ok) {
+            const message = await httpResponse.text();
+            throw new Error(message || `Failed to submit input (${httpResponse.status})`);
+          }
         }
         setPendingInput(null);
       } catch (error) {
@@ -647,99 +1098,9 @@
       }
     };
 
-    const handleEvent = (payload) => {
+    // Node, edge, tool and stream events are batched per frame; these control events act immediately.
+    const handleControlEvent = (payload) => {
       switch (payload.event_type) {
-        case "node_start":
-          setNodes((current) =>
-            current.map((node) =>
-              node.id === payload.node_id
-                ? { ...node, data: { ...node.data, status: "active" } }
-                : node,
-            ),
-          );
-          break;
-        case "node_end":
-          setNodes((current) =>
-            current.map((node) =>
-              node.id === payload.node_id
-                ? { ...node, data: { ...node.data, status: "done" } }
-                : node,
-            ),
-          );
-          break;
-        case "edge_taken":
-          setEdges((current) =>
-            current.map((edge) => {
-              if (edge.source !== payload.source_node_id) {
-                return edge;
-              }
-              if (payload.target_node_id && edge.target !== payload.target_node_id) {
-                return edge;
-              }
-              if (!payload.target_node_id && !edge.data?.dynamic) {
-                return edge;
-              }
-              return {
-                ...edge,
-                animated: true,
-                style: { ...edge.style, ...edgeActiveStyle },
-              };
-            }),
-          );
-          break;
-        case "tool_call":
-          setToolActivity((current) => {
-            const existingIndex = current.findIndex((item) => item.callId === payload.call_id);
-            const entry = {
-              callId: payload.call_id,
-              nodeId: payload.node_id,
-              toolName: payload.tool_name,
-              arguments: payload.arguments,
-              output: null,
-              success: null,
-            };
-            if (existingIndex >= 0) {
-              const next = [...current];
-              next[existingIndex] = { ...next[existingIndex], ...entry };
-              return next;
-            }
-            return [entry, ...current];
-          });
-          break;
-        case "tool_result":
-          setToolActivity((current) => {
-            const existingIndex = current.findIndex((item) => item.callId === payload.call_id);
-            const entry = {
-              callId: payload.call_id,
-              nodeId: payload.node_id,
-              toolName: payload.tool_name,
-              output: payload.output,
-              success: payload.success,
-            };
-            if (existingIndex >= 0) {
-              const next = [...current];
-              next[existingIndex] = { ...next[existingIndex], ...entry };
-              return next;
-            }
-            return [entry, ...current];
-          });
-          if (payload.tool_name === "stream_chunk") {
-            setStreaming((current) => {
-              const output = payload.output && typeof payload.output === "object" ? payload.output : {};
-              const tick = extractNumber(output.tick) ?? current.current;
-              const total = extractNumber(output.total) ?? current.total;
-              const chunkText = typeof output.chunk === "string" ? output.chunk : null;
-              const chunks = chunkText
-                ? [chunkText, ...current.chunks.filter((item) => item !== chunkText)].slice(0, 8)
-                : current.chunks;
-              return {
-                current: Math.max(current.current, tick || 0),
-                total,
-                chunks,
-              };
-            });
-          }
-          break;
         case "input_request":
           setPendingInput({
             requestId: payload.request_id,
@@ -756,33 +1117,41 @@
             current && current.requestId === payload.request_id ? null : current,
           );
           break;
+        case "run_queued":
+          setStatus((current) => ({ ...current, queuePosition: payload.position }));
+          break;
+        case "run_admitted":
+          setStatus((current) => ({ ...current, queuePosition: null }));
+          break;
         case "run_end":
           setStatus((current) => ({ ...current, phase: "ready" }));
           setPendingInput(null);
-          if (eventSourceRef.current) {
-            eventSourceRef.current.close();
-            eventSourceRef.current = null;
+          loadTimeline(payload.run_id);
+          if (streamRef.current) {
+            streamRef.current.close();
+            streamRef.current = null;
           }
           break;
-        case "error":
-          if (payload.node_id) {
-            setNodes((current) =>
-              current.map((node) =>
-                node.id === payload.node_id
-                  ? { ...node, data: { ...node.data, status: "error" } }
-                  : node,
-              ),
-            );
+        case "cancelled":
+          setStatus((current) => ({ ...current, phase: "ready", queuePosition: null }));
+          setPendingInput(null);
+          loadTimeline(payload.run_id);
+          if (streamRef.current) {
+            streamRef.current.close();
+            streamRef.current = null;
           }
+          break;
+        case "error":
           setStatus((current) => ({
             ...current,
             phase: "error",
             error: payload.message || "Execution error",
           }));
           setPendingInput(null);
-          if (eventSourceRef.current) {
-            eventSourceRef.current.close();
-            eventSourceRef.current = null;
+          loadTimeline(payload.run_id);
+          if (streamRef.current) {
+            streamRef.current.close();
+            streamRef.current = null;
           }
           break;
         default:
@@ -790,46 +1159,163 @@
       }
     };
 
+    const reportMalformedEvent = () => {
+      setStatus((current) => ({
+        ...current,
+        phase: "error",
+        error: "Malformed event payload",
+      }));
+    };
+
+    const reportDisconnect = () => {
+      setStatus((current) => ({
+        ...current,
+        phase: current.phase === "running" ? "error" : current.phase,
+        error: current.phase === "running" ? "Event stream disconnected" : current.error,
+      }));
+      if (streamRef.current) {
+        streamRef.current.close();
+        streamRef.current = null;
+      }
+    };
+
+    const connectEventsDirect = (url) => {
+      const decoder = compactWire ? window.PGraphRunWire.createCompactDecoder() : null;
+      const stream = new EventSource(url);
+      stream.onmessage = (event) => {
+        try {
+          let data = JSON.parse(event.data);
+          if (decoder) data = decoder.decode(data);
+          if (!data) return;
+          enqueueEvent(data);
+          handleControlEvent(data);
+        } catch (error) {
+          reportMalformedEvent();
+        }
+      };
+      stream.onerror = reportDisconnect;
+      return stream;
+    };
+
+    const connectSocketDirect = (runId) =>
+      window.PGraphRunWire.openRunSocket(
+        window.location.href,
+        runId,
+        {
+          onEvent: (data) => {
+            enqueueEvent(data);
+            handleControlEvent(data);
+          },
+          onError: (message) =>
+            message === "Malformed event payload" ? reportMalformedEvent() : reportDisconnect(),
+        },
+        { format: socketFormat },
+      );
+
+    // Decode and reduce the event stream off the main thread; the page only applies frame-rate diffs.
+    // Falls back to a page-owned EventSource when workers are unavailable or fail to start. With a
+    // `socketRunId` the run is followed over `/api/ws`, and input responses go over the same socket.
+    const connectEvents = (url, socketRunId = null) => {
+      const connectDirect = () => (socketRunId ? connectSocketDirect(socketRunId) : connectEventsDirect(url));
+      if (!eventWorkerSupported) {
+        return connectDirect();
+      }
+      let worker;
+      try {
+        worker = new Worker(assetUrls.runWorker);
+      } catch (_error) {
+        return connectDirect();
+      }
+      let received = false;
+      const pendingAcks = new Map();
+      const handle = {
+        close: () => {
+          worker.postMessage({ type: "stop" });
+          worker.terminate();
+        },
+        sendInput: socketRunId
+          ? (runId, requestId, response) =>
+              new Promise((resolve) => {
+                pendingAcks.set(requestId, resolve);
+                worker.postMessage({ type: "input", runId, requestId, response });
+              })
+          : null,
+      };
+      worker.onmessage = (message) => {
+        received = true;
+        const data = message.data;
+        if (data.type === "diff") {
+          RunState.absorbDiff(runStateRef.current, data.diff);
+          scheduleFlush();
+        } else if (data.type === "control") {
+          handleControlEvent(data.payload);
+        } else if (data.type === "input_ack") {
+          const resolve = pendingAcks.get(data.ack.request_id);
+          pendingAcks.delete(data.ack.request_id);
+          if (resolve) resolve(data.ack);
+        } else if (data.type === "malformed") {
+          reportMalformedEvent();
+        } else if (data.type === "disconnected") {
+          reportDisconnect();
+        }
+      };
+      worker.onerror = () => {
+        worker.terminate();
+        if (!received && streamRef.current === handle) {
+          streamRef.current = connectDirect();
+        } else {
+          reportDisconnect();
+        }
+      };
+      const runStateUrl = new URL(assetUrls.runState, window.location.href).href;
+      const runWireUrl = new URL(assetUrls.runWire, window.location.href).href;
+      if (socketRunId) {
+        worker.postMessage({
+          type: "startSocket",
+          base: window.location.href,
+          runId: socketRunId,
+          format: socketFormat,
+          runStateUrl,
+          runWireUrl,
+          toolLimit: toolActivityLimit,
+        });
+      } else {
+        worker.postMessage({
+          type: "start",
+          url: new URL(url, window.location.href).href,
+          compact: compactWire,
+          runStateUrl,
+          runWireUrl,
+          toolLimit: toolActivityLimit,
+        });
+      }
+      return handle;
+    };
+
     const startRun = async () => {
       if (!graph || status.phase === "loading") {
         return;
       }
       resetRunVisuals();
-      setStatus((current) => ({ ...current, phase: "running", error: null }));
+      setTimeline(null);
+      setStatus((current) => ({ ...current, phase: "running", replay: false, error: null, queuePosition: null }));
       try {
         const response = await fetch("/api/run", { method: "POST" });
+        if (response.status === 429) {
+          const retryAfter = response.headers.get("Retry-After");
+          throw new Error(`Too many runs queued, retry in ${retryAfter || "a few"}s`);
+        }
         if (!response.ok) {
           throw new Error(`Failed to start run (${response.status})`);
         }
         const payload = await response.json();
         const runId = payload.run_id;
         setStatus((current) => ({ ...current, runId, phase: "running" }));
-        if (eventSourceRef.current) {
-          eventSourceRef.current.close();
+        if (streamRef.current) {
+          streamRef.current.close();
         }
-        const stream = new EventSource(`/api/events?run_id=${runId}`);
-        eventSourceRef.current = stream;
-        stream.onmessage = (event) => {
-          try {
-            const data = JSON.parse(event.data);
-            handleEvent(data);
-          } catch (error) {
-            setStatus((current) => ({
-              ...current,
-              phase: "error",
-              error: "Malformed event payload",
-            }));
-          }
-        };
-        stream.onerror = () => {
-          setStatus((current) => ({
-            ...current,
-            phase: current.phase === "running" ? "error" : current.phase,
-            error: current.phase === "running" ? "Event stream disconnected" : current.error,
-          }));
-          stream.close();
-          eventSourceRef.current = null;
-        };
+        const wire = compactWire ? "&wire=compact" : "";
+        streamRef.current = connectEvents(`/api/events?run_id=${runId}${wire}`, socketTransport ? runId : null);
       } catch (error) {
         setStatus((current) => ({
           ...current,
@@ -839,6 +1325,40 @@
       }
     };
 
+    // The run's `cancelled` event, not this request, moves the studio out of the running phase.
+    const cancelRun = async () => {
+      if (!status.runId) {
+        return;
+      }
+      try {
+        const response = await fetch(`/api/runs/${status.runId}`, { method: "DELETE" });
+        if (!response.ok && response.status !== 409) {
+          throw new Error(`Failed to stop run (${response.status})`);
+        }
+      } catch (error) {
+        setStatus((current) => ({ ...current, error: error.message }));
+      }
+    };
+
+    // Replays reuse the live event pipeline; only the stream URL differs.
+    const startReplay = (runId, speed) => {
+      resetRunVisuals();
+      setTimeline(null);
+      setStatus((current) => ({ ...current, phase: "running", runId, replay: true, error: null, queuePosition: null }));
+      if (streamRef.current) {
+        streamRef.current.close();
+      }
+      const params = new URLSearchParams({ speed, wire: compactWire ? "compact" : "json" });
+      streamRef.current = connectEvents(`/api/runs/${runId}/replay?${params}`);
+    };
+
+    const replayStartedRef = useRef(false);
+    useEffect(() => {
+      if (!graph || !replayRunId || replayStartedRef.current) return;
+      replayStartedRef.current = true;
+      startReplay(replayRunId, replaySpeed);
+    }, [graph]);
+
     const graphCanvas = graph
       ? e(
           Flow,
@@ -847,6 +1367,7 @@
             edges,
             onNodesChange,
             onEdgesChange,
+            onNodeDoubleClick: expandCluster,
             nodeTypes,
             edgeTypes,
             fitView: true,
@@ -896,33 +1417,8 @@
           : e("p", { className: "studio-sidebar-empty" }, "No stream chunks yet"),
       ),
       e("p", { className: "studio-sidebar-title" }, "Tool Activity"),
-      toolActivity.length
-        ? e(
-            "div",
-            { className: "studio-tool-list" },
-            toolActivity.map((item) =>
-              e(
-                "article",
-                { key: item.callId, className: "studio-tool-item" },
-                e("p", { className: "studio-tool-name" }, item.toolName),
-                e("p", { className: "studio-tool-meta" }, `node ${item.nodeId}`),
-                item.arguments !== undefined
-                  ? e(
-                      "pre",
-                      { className: "studio-tool-json" },
-                      JSON.stringify(item.arguments, null, 2),
-                    )
-                  : null,
-                item.output !== null
-                  ? e(
-                      "pre",
-                      { className: "studio-tool-json" },
-                      JSON.stringify(item.output, null, 2),
-                    )
-                  : e("p", { className: "studio-tool-pending" }, "Waiting for result…"),
-              ),
-            ),
-          )
+      toolActivity.total
+        ? e(ToolActivityList, { activity: toolActivity, runId: status.runId })
         : e("p", { className: "studio-sidebar-empty" }, "No tool calls yet"),
     );
 
@@ -959,6 +1455,46 @@
                 status.error,
               )
             : null,
+          timeline && status.phase !== "running"
+            ? e(
+                "label",
+                { className: "studio-timeline" },
+                `Event ${timeline.seq} / ${timeline.total}`,
+                e("input", {
+                  type: "range",
+                  className: "studio-timeline-range",
+                  min: 0,
+                  max: timeline.total,
+                  value: timeline.seq,
+                  onChange: (event) => {
+                    const seq = Number(event.target.value);
+                    setTimeline((current) => ({ ...current, seq }));
+                    seekTimeline(timeline.runId, seq);
+                  },
+                }),
+              )
+            : null,
+          graph && viewRef.current && !viewRef.current.isDefault
+            ? e(
+                "button",
+                {
+                  className: "rounded-md px-4 py-2 text-sm font-semibold studio-button--secondary",
+                  onClick: () => changeView(null),
+                  disabled: status.phase === "loading",
+                },
+                "Collapse",
+              )
+            : null,
+          status.phase === "running" && status.runId && !status.replay
+            ? e(
+                "button",
+                {
+                  className: "rounded-md px-4 py-2 text-sm font-semibold studio-button--secondary",
+                  onClick: cancelRun,
+                },
+                "Stop",
+              )
+            : null,
           e(
             "button",
             {
@@ -975,7 +1511,7 @@
         { className: "flex-1" },
         content,
       ),
-      pendingInput
+      pendingInput && !status.replay
         ? e(
             "div",
             { className: "studio-modal-backdrop" },
@@ -986,11 +1522,13 @@
               e("p", { className: "studio-modal-node" }, `Node: ${pendingInput.nodeId}`),
               e("p", { className: "studio-modal-prompt" }, pendingInput.prompt),
               pendingInput.context !== null && pendingInput.context !== undefined
-                ? e(
-                    "pre",
-                    { className: "studio-modal-context" },
-                    formatApprovalContext(pendingInput.context),
-                  )
+                ? isBlobRef(pendingInput.context)
+                  ? e(PayloadView, { value: pendingInput.context, className: "studio-modal-context" })
+                  : e(
+                      "pre",
+                      { className: "studio-modal-context" },
+                      formatApprovalContext(pendingInput.context),
+                    )
                 : null,
               pendingInput.error
                 ? e("p", { className: "studio-modal-error" }, pendingInput.error)
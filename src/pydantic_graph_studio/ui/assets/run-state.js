@@ -0,0 +1,312 @@
+// Run-state reduction for the studio UI: folds runtime events into compact per-node, per-edge and
+// per-tool state and hands out only what changed since the last frame.
+((root) => {
+  const statusPriority = { idle: 0, done: 1, active: 2, error: 3 };
+  const maxStreamChunks = 8;
+  const defaultToolLimit = 200;
+
+  // Tool calls live in a ring of `toolLimit` slots: call number `index` sits in slot
+  // `index % toolLimit`, and older calls are left to the server's paged tool-activity endpoint.
+  function createRunState(options = {}) {
+    return {
+      nodeStatus: new Map(),
+      takenEdges: new Set(),
+      toolLimit: options.toolLimit || defaultToolLimit,
+      toolSlots: [],
+      toolCount: 0,
+      toolIndex: new Map(),
+      streaming: { current: 0, total: null, chunks: [] },
+      dirtyNodes: new Set(),
+      dirtyEdges: new Set(),
+      dirtyTools: new Set(),
+      streamingDirty: false,
+    };
+  }
+
+  function edgeKey(source, target) {
+    return `${source}\u0000${target || ""}`;
+  }
+
+  function splitEdgeKey(key) {
+    const [source, target] = key.split("\u0000");
+    return [source, target || null];
+  }
+
+  function extractNumber(value) {
+    if (typeof value === "number" && Number.isFinite(value)) {
+      return value;
+    }
+    if (typeof value === "string") {
+      const parsed = Number(value);
+      if (Number.isFinite(parsed)) {
+        return parsed;
+      }
+    }
+    return null;
+  }
+
+  function setNodeStatus(state, nodeId, status) {
+    if (state.nodeStatus.get(nodeId) === status) return;
+    state.nodeStatus.set(nodeId, status);
+    state.dirtyNodes.add(nodeId);
+  }
+
+  function storeTool(state, index, entry) {
+    const slot = index % state.toolLimit;
+    const evicted = state.toolSlots[slot];
+    if (evicted && evicted.index !== index) {
+      state.toolIndex.delete(evicted.callId);
+    }
+    state.toolSlots[slot] = entry;
+    state.toolIndex.set(entry.callId, index);
+    state.toolCount = Math.max(state.toolCount, index + 1);
+    state.dirtyTools.add(index);
+  }
+
+  function upsertTool(state, entry) {
+    const index = state.toolIndex.get(entry.callId);
+    if (index === undefined) {
+      const fresh = { arguments: undefined, output: null, success: null, ...entry, index: state.toolCount };
+      storeTool(state, state.toolCount, fresh);
+    } else {
+      storeTool(state, index, { ...state.toolSlots[index % state.toolLimit], ...entry });
+    }
+  }
+
+  function reduceStreamChunk(state, output) {
+    const current = state.streaming;
+    const payload = output && typeof output === "object" ? output : {};
+    const tick = extractNumber(payload.tick) ?? current.current;
+    const total = extractNumber(payload.total) ?? current.total;
+    const chunkText = typeof payload.chunk === "string" ? payload.chunk : null;
+    const chunks = chunkText
+      ? [chunkText, ...current.chunks.filter((item) => item !== chunkText)].slice(0, maxStreamChunks)
+      : current.chunks;
+    state.streaming = { current: Math.max(current.current, tick || 0), total, chunks };
+    state.streamingDirty = true;
+  }
+
+  // Fold one event into `state`. Returns false for events that only the caller acts on.
+  function reduceEvent(state, payload) {
+    switch (payload.event_type) {
+      case "node_start":
+        setNodeStatus(state, payload.node_id, "active");
+        return true;
+      case "node_end":
+        setNodeStatus(state, payload.node_id, "done");
+        return true;
+      case "edge_taken": {
+        const key = edgeKey(payload.source_node_id, payload.target_node_id);
+        state.takenEdges.add(key);
+        state.dirtyEdges.add(key);
+        return true;
+      }
+      case "tool_call":
+        upsertTool(state, {
+          callId: payload.call_id,
+          nodeId: payload.node_id,
+          toolName: payload.tool_name,
+          arguments: payload.arguments,
+          output: null,
+          success: null,
+        });
+        return true;
+      case "tool_result":
+        upsertTool(state, {
+          callId: payload.call_id,
+          nodeId: payload.node_id,
+          toolName: payload.tool_name,
+          output: payload.output,
+          success: payload.success,
+        });
+        if (payload.tool_name === "stream_chunk") {
+          reduceStreamChunk(state, payload.output);
+        }
+        return true;
+      case "error":
+        if (payload.node_id) {
+          setNodeStatus(state, payload.node_id, "error");
+        }
+        return false;
+      default:
+        return false;
+    }
+  }
+
+  // Mark everything dirty again, e.g. after the visible graph changed underneath the run state.
+  function markAllDirty(state) {
+    state.nodeStatus.forEach((_, nodeId) => state.dirtyNodes.add(nodeId));
+    state.takenEdges.forEach((key) => state.dirtyEdges.add(key));
+    for (let index = Math.max(0, state.toolCount - state.toolLimit); index < state.toolCount; index += 1) {
+      state.dirtyTools.add(index);
+    }
+    state.streamingDirty = true;
+  }
+
+  // Fold a diff produced by `takeDiff` elsewhere (e.g. in the event worker) into a mirror state.
+  function absorbDiff(state, diff) {
+    diff.nodes.forEach(([nodeId, status]) => setNodeStatus(state, nodeId, status));
+    diff.edges.forEach(([source, target]) => {
+      const key = edgeKey(source, target);
+      state.takenEdges.add(key);
+      state.dirtyEdges.add(key);
+    });
+    diff.tools.forEach(([index, entry]) => storeTool(state, index, entry));
+    if (diff.streaming) {
+      state.streaming = diff.streaming;
+      state.streamingDirty = true;
+    }
+  }
+
+  // Rebuild a run state from a server snapshot (`/api/runs/{run_id}/state`), e.g. after seeking.
+  // Everything in it is dirty, so the next `takeDiff` paints the snapshot in full.
+  function fromSnapshot(snapshot, options = {}) {
+    const state = createRunState(options);
+    Object.entries(snapshot.node_status).forEach(([nodeId, status]) => setNodeStatus(state, nodeId, status));
+    if (snapshot.last_edge) {
+      const key = edgeKey(snapshot.last_edge.source_node_id, snapshot.last_edge.target_node_id);
+      state.takenEdges.add(key);
+      state.dirtyEdges.add(key);
+    }
+    snapshot.open_tool_calls.forEach((call) =>
+      storeTool(state, call.index, {
+        index: call.index,
+        callId: call.call_id,
+        nodeId: call.node_id,
+        toolName: call.tool_name,
+        arguments: call.arguments,
+        output: null,
+        success: null,
+      }),
+    );
+    return state;
+  }
+
+  function isEmptyDiff(diff) {
+    return !diff.nodes.length && !diff.edges.length && !diff.tools.length && !diff.streaming;
+  }
+
+  // Collect and clear everything that changed since the previous call.
+  function takeDiff(state) {
+    const nodes = [];
+    state.dirtyNodes.forEach((nodeId) => nodes.push([nodeId, state.nodeStatus.get(nodeId) || "idle"]));
+    const edges = [];
+    state.dirtyEdges.forEach((key) => edges.push(splitEdgeKey(key)));
+    const tools = [];
+    const oldest = state.toolCount - state.toolLimit;
+    state.dirtyTools.forEach((index) => {
+      if (index >= oldest) tools.push([index, state.toolSlots[index % state.toolLimit]]);
+    });
+    const diff = {
+      nodes,
+      edges,
+      tools,
+      streaming: state.streamingDirty ? state.streaming : null,
+    };
+    state.dirtyNodes = new Set();
+    state.dirtyEdges = new Set();
+    state.dirtyTools = new Set();
+    state.streamingDirty = false;
+    return diff;
+  }
+
+  function indexNodes(nodes) {
+    const index = new Map();
+    nodes.forEach((node, position) => index.set(node.id, position));
+    return index;
+  }
+
+  function indexEdges(edges) {
+    const index = new Map();
+    edges.forEach((edge, position) => {
+      const key = edgeKey(edge.source, edge.data?.dynamic ? null : edge.target);
+      const positions = index.get(key);
+      if (positions) {
+        positions.push(position);
+      } else {
+        index.set(key, [position]);
+      }
+    });
+    return index;
+  }
+
+  // Apply `updates` (node id -> status) with a single array copy. Returns `nodes` untouched when
+  // nothing changed, or null when the index no longer matches and must be rebuilt.
+  function patchNodes(nodes, index, updates) {
+    let next = null;
+    for (const [nodeId, status] of updates) {
+      const position = index.get(nodeId);
+      if (position === undefined) continue;
+      const node = nodes[position];
+      if (!node || node.id !== nodeId) return null;
+      if (node.data.status === status) continue;
+      if (!next) next = nodes.slice();
+      next[position] = { ...node, data: { ...node.data, status } };
+    }
+    return next || nodes;
+  }
+
+  // Mark the edges for `keys` as taken with a single array copy; same contract as `patchNodes`.
+  function patchEdges(edges, index, keys, activeStyle) {
+    let next = null;
+    for (const key of keys) {
+      const positions = index.get(key);
+      if (!positions) continue;
+      for (const position of positions) {
+        const edge = edges[position];
+        if (!edge || edgeKey(edge.source, edge.data?.dynamic ? null : edge.target) !== key) return null;
+        if (edge.animated) continue;
+        if (!next) next = edges.slice();
+        next[position] = { ...edge, animated: true, style: { ...edge.style, ...activeStyle } };
+      }
+    }
+    return next || edges;
+  }
+
+  function emptyToolActivity() {
+    return { total: 0, base: 0, items: [] };
+  }
+
+  // Apply `[index, entry]` tool updates to `{total, base, items}`, where `items[i]` holds call number
+  // `base + i`, keeping at most `limit` of the newest calls.
+  function patchTools(activity, updates, limit) {
+    if (!updates.length) return activity;
+    let { total, base } = activity;
+    let items = activity.items.slice();
+    updates.forEach(([index, entry]) => {
+      if (index < base) return;
+      while (base + items.length <= index) items.push(null);
+      items[index - base] = entry;
+      total = Math.max(total, index + 1);
+    });
+    if (items.length > limit) {
+      const dropped = items.length - limit;
+      items = items.slice(dropped);
+      base += dropped;
+    }
+    return { total, base, items };
+  }
+
+  const api = {
+    statusPriority,
+    createRunState,
+    edgeKey,
+    extractNumber,
+    reduceEvent,
+    markAllDirty,
+    absorbDiff,
+    fromSnapshot,
+    isEmptyDiff,
+    takeDiff,
+    indexNodes,
+    indexEdges,
+    patchNodes,
+    patchEdges,
+    emptyToolActivity,
+    patchTools,
+  };
+  root.PGraphRunState = api;
+  if (typeof module !== "undefined" && module.exports) {
+    module.exports = api;
+  }
+})(typeof globalThis !== "undefined" ? globalThis : self);
@@ -0,0 +1,191 @@
+// Client side of the compact wire encodings (see `wire.py`): the `/api/ws` WebSocket transport, with
+// its length-prefixed binary event records and input responses, and the `wire=compact` SSE mode.
+((root) => {
+  // channel u16, seq u32, event type u8, node i32, target i32 (little-endian), then optional JSON.
+  const recordSize = 15;
+  const noNode = -1;
+  const textDecoder = new TextDecoder();
+
+  function inlineEvent(hello, runId, kind, node, target) {
+    const eventType = hello.event_types[kind];
+    if (eventType === "run_end") {
+      return { run_id: runId, event_type: eventType };
+    }
+    if (eventType === "edge_taken") {
+      return {
+        run_id: runId,
+        event_type: eventType,
+        source_node_id: hello.nodes[node],
+        target_node_id: target === noNode ? null : hello.nodes[target],
+      };
+    }
+    return { run_id: runId, event_type: eventType, node_id: hello.nodes[node] };
+  }
+
+  // Decode one binary message into `{channel, seq, event}` records. `hello` is the server's hello
+  // message (node ids and event types) and `runIds` maps channels to run ids.
+  function decodeRecords(buffer, hello, runIds) {
+    const view = new DataView(buffer);
+    const bytes = new Uint8Array(buffer);
+    const records = [];
+    let offset = 0;
+    while (offset < view.byteLength) {
+      const length = view.getUint32(offset, true);
+      offset += 4;
+      const channel = view.getUint16(offset, true);
+      const seq = view.getUint32(offset + 2, true);
+      const event =
+        length > recordSize
+          ? JSON.parse(textDecoder.decode(bytes.subarray(offset + recordSize, offset + length)))
+          : inlineEvent(
+              hello,
+              runIds.get(channel),
+              view.getUint8(offset + 6),
+              view.getInt32(offset + 7, true),
+              view.getInt32(offset + 11, true),
+            );
+      records.push({ channel, seq, event });
+      offset += length;
+    }
+    return records;
+  }
+
+  function socketUrl(base, format) {
+    const url = new URL("/api/ws", base);
+    url.protocol = url.protocol === "https:" ? "wss:" : "ws:";
+    url.searchParams.set("format", format);
+    return url.href;
+  }
+
+  // Follow one run over a new socket. `handlers.onEvent(event, seq)` sees every event in order,
+  // `handlers.onEnd()` fires once the run is over and `handlers.onError(message)` on any failure.
+  // The returned handle's `sendInput` resolves with the server's `input_ack`.
+  function openRunSocket(base, runId, handlers, options = {}) {
+    const socket = new WebSocket(socketUrl(base, options.format || "binary"));
+    socket.binaryType = "arraybuffer";
+    const runIds = new Map();
+    const pendingAcks = new Map();
+    let hello = null;
+    let closed = false;
+
+    const finish = () => {
+      closed = true;
+      pendingAcks.forEach((resolve, requestId) =>
+        resolve({ request_id: requestId, accepted: false, detail: "Event stream disconnected" }),
+      );
+      pendingAcks.clear();
+    };
+    const fail = (message) => {
+      if (closed) return;
+      finish();
+      socket.close();
+      handlers.onError(message);
+    };
+
+    socket.onopen = () => {
+      socket.send(JSON.stringify({ type: "subscribe", run_id: runId, after: options.after || 0 }));
+    };
+    socket.onmessage = (message) => {
+      let data;
+      try {
+        if (typeof message.data !== "string") {
+          decodeRecords(message.data, hello, runIds).forEach((record) => handlers.onEvent(record.event, record.seq));
+          return;
+        }
+        data = JSON.parse(message.data);
+      } catch (_error) {
+        fail("Malformed event payload");
+        return;
+      }
+      switch (data.type) {
+        case "hello":
+          hello = data;
+          break;
+        case "subscribed":
+          runIds.set(data.channel, data.run_id);
+          break;
+        case "events":
+          data.events.forEach((item) => handlers.onEvent(item.event, item.seq));
+          break;
+        case "input_ack": {
+          const resolve = pendingAcks.get(data.request_id);
+          pendingAcks.delete(data.request_id);
+          if (resolve) resolve(data);
+          break;
+        }
+        case "end":
+          finish();
+          socket.close();
+          if (handlers.onEnd) handlers.onEnd();
+          break;
+        case "error":
+          if (data.run_id === runId) fail(data.detail);
+          break;
+        default:
+          break;
+      }
+    };
+    socket.onerror = () => fail("Event stream disconnected");
+    socket.onclose = () => fail("Event stream disconnected");
+
+    return {
+      close: () => {
+        if (closed) return;
+        finish();
+        socket.close();
+      },
+      sendInput: (inputRunId, requestId, response) =>
+        new Promise((resolve) => {
+          if (closed || socket.readyState !== WebSocket.OPEN) {
+            resolve({ request_id: requestId, accepted: false, detail: "Event stream disconnected" });
+            return;
+          }
+          pendingAcks.set(requestId, resolve);
+          socket.send(JSON.stringify({ type: "input", run_id: inputRunId, request_id: requestId, response }));
+        }),
+    };
+  }
+
+  // Decoder for `/api/events?wire=compact`: `decode(frame)` absorbs dictionary frames (returning
+  // null) and expands every other frame back into a regular event payload.
+  function createCompactDecoder() {
+    let runId = "";
+    let nodes = [];
+    let eventTypes = [];
+    let fields = {};
+    return {
+      decode(frame) {
+        const dictionary = frame.d;
+        if (dictionary) {
+          if (dictionary.r !== undefined) runId = dictionary.r;
+          if (dictionary.e) eventTypes = dictionary.e;
+          if (dictionary.f) fields = dictionary.f;
+          nodes = nodes.slice(0, dictionary.o).concat(dictionary.n);
+          return null;
+        }
+        const eventType = eventTypes[frame.e];
+        const event = { run_id: runId, event_type: eventType };
+        Object.keys(frame).forEach((key) => {
+          if (key === "e") return;
+          if (key === "n") {
+            event[eventType === "edge_taken" ? "source_node_id" : "node_id"] = nodes[frame.n];
+          } else if (key === "t") {
+            event.target_node_id = nodes[frame.t];
+          } else {
+            event[fields[key] || key] = frame[key];
+          }
+        });
+        if (eventType === "edge_taken" && event.target_node_id === undefined) {
+          event.target_node_id = null;
+        }
+        return event;
+      },
+    };
+  }
+
+  const api = { decodeRecords, openRunSocket, createCompactDecoder };
+  root.PGraphRunWire = api;
+  if (typeof module !== "undefined" && module.exports) {
+    module.exports = api;
+  }
+})(typeof globalThis !== "undefined" ? globalThis : self);
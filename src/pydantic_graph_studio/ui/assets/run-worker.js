@@ -0,0 +1,123 @@
+// Dedicated worker that consumes a run's event stream, reduces it with `run-state.js`, and posts
+// compact diffs to the page at most once per display frame.
+//
+// Messages in:  {type: "start", url, compact, runStateUrl, runWireUrl, toolLimit}
+//               | {type: "startSocket", base, runId, format, runStateUrl, runWireUrl, toolLimit}
+//               | {type: "input", runId, requestId, response} | {type: "stop"}
+// Messages out: {type: "diff", diff} | {type: "control", payload} | {type: "input_ack", ack}
+//               | {type: "malformed"} | {type: "disconnected"}
+const frameInterval = 1000 / 60;
+
+let RunState = null;
+let RunWire = null;
+let stream = null;
+let state = null;
+let timer = null;
+
+function postDiff() {
+  if (timer !== null) {
+    clearTimeout(timer);
+    timer = null;
+  }
+  if (!state) return;
+  const diff = RunState.takeDiff(state);
+  if (!RunState.isEmptyDiff(diff)) {
+    self.postMessage({ type: "diff", diff });
+  }
+}
+
+function scheduleDiff() {
+  if (timer === null) {
+    timer = setTimeout(postDiff, frameInterval);
+  }
+}
+
+function stop() {
+  postDiff();
+  if (stream) {
+    stream.close();
+    stream = null;
+  }
+}
+
+function handlePayload(payload) {
+  if (RunState.reduceEvent(state, payload)) {
+    scheduleDiff();
+    return;
+  }
+  // Control events are rare and must not overtake the node updates before them.
+  postDiff();
+  self.postMessage({ type: "control", payload });
+  if (payload.event_type === "run_end" || payload.event_type === "error" || payload.event_type === "cancelled") {
+    stop();
+  }
+}
+
+// `compact` streams (`wire=compact`) are expanded back into regular events before reduction.
+function start(url, compact, toolLimit) {
+  stop();
+  state = RunState.createRunState({ toolLimit });
+  const decoder = compact ? RunWire.createCompactDecoder() : null;
+  stream = new EventSource(url);
+  stream.onmessage = (event) => {
+    let payload;
+    try {
+      payload = JSON.parse(event.data);
+      if (decoder) payload = decoder.decode(payload);
+    } catch (_error) {
+      self.postMessage({ type: "malformed" });
+      return;
+    }
+    if (payload) handlePayload(payload);
+  };
+  stream.onerror = () => {
+    stop();
+    self.postMessage({ type: "disconnected" });
+  };
+}
+
+// Same as `start`, over the `/api/ws` WebSocket, which also carries input responses.
+function startSocket(base, runId, format, toolLimit) {
+  stop();
+  state = RunState.createRunState({ toolLimit });
+  stream = RunWire.openRunSocket(
+    base,
+    runId,
+    {
+      onEvent: handlePayload,
+      onError: (message) => {
+        stop();
+        self.postMessage({ type: message === "Malformed event payload" ? "malformed" : "disconnected" });
+      },
+    },
+    { format },
+  );
+}
+
+function loadScripts(data) {
+  if (!RunState) {
+    importScripts(data.runStateUrl);
+    RunState = self.PGraphRunState;
+  }
+  if (data.runWireUrl && !RunWire) {
+    importScripts(data.runWireUrl);
+    RunWire = self.PGraphRunWire;
+  }
+}
+
+self.onmessage = (message) => {
+  const data = message.data || {};
+  if (data.type === "start") {
+    loadScripts(data);
+    start(data.url, data.compact, data.toolLimit);
+  } else if (data.type === "startSocket") {
+    loadScripts(data);
+    startSocket(data.base, data.runId, data.format, data.toolLimit);
+  } else if (data.type === "input") {
+    const ack = { request_id: data.requestId, accepted: false, detail: "Event stream disconnected" };
+    const pending = stream && stream.sendInput ? stream.sendInput(data.runId, data.requestId, data.response) : null;
+    Promise.resolve(pending || ack).then((result) => self.postMessage({ type: "input_ack", ack: result }));
+  } else if (data.type === "stop") {
+    stop();
+  }
+};
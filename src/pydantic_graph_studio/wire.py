@@ -0,0 +1,223 @@
+"""Compact encodings of run events: binary records for `/api/ws` and interned JSON for `/api/events`."""
+
+from __future__ import annotations
+
+import struct
+from collections.abc import Iterable, Mapping, Sequence
+from typing import Any, Literal
+
+from pydantic import TypeAdapter
+
+from pydantic_graph_studio.schemas import (
+    EdgeTakenEvent,
+    Event,
+    NodeEndEvent,
+    NodeStartEvent,
+    RunEndEvent,
+)
+from pydantic_graph_studio.trace import EVENT_TYPES, NO_NODE
+
+WIRE_FORMATS = ("binary", "json")
+COMPACT_FIELDS: dict[str, str] = {
+    "tool_name": "tn",
+    "call_id": "c",
+    "arguments": "a",
+    "output": "o",
+    "success": "ok",
+    "request_id": "q",
+    "prompt": "p",
+    "options": "op",
+    "context": "x",
+    "response": "rs",
+    "message": "m",
+}
+WIRE_LENGTH = struct.Struct("<I")
+WIRE_RECORD = struct.Struct("<HIBii")
+
+type WireMode = Literal["json", "compact"]
+
+_EVENT_CODES = {event_type: code for code, event_type in enumerate(EVENT_TYPES)}
+_NODE_START, _NODE_END, _EDGE_TAKEN, _RUN_END = (_EVENT_CODES[name] for name in EVENT_TYPES[:4])
+_EVENT_ADAPTER: TypeAdapter[Event] = TypeAdapter(Event)
+_NODE_FIELDS = {"node_id": "n", "source_node_id": "n", "target_node_id": "t"}
+_LONG_FIELDS = {short: name for name, short in COMPACT_FIELDS.items()}
+
+
+class WireEncoder:
+    """Encodes events as length-prefixed binary records, with node ids replaced by graph node indexes.
+
+    Each record is a little-endian `u32` byte length followed by the channel (`u16`), the event's
+    sequence number (`u32`), its type as an index into `EVENT_TYPES` (`u8`) and the node and target
+    node indexes into `node_ids` (`i32`, `NO_NODE` when absent). Node, edge and run-end events are
+    fully described by those 15 bytes; every other event, and any event naming a node outside
+    `node_ids`, appends its JSON.
+    """
+
+    __slots__ = ("node_ids", "_node_codes")
+
+    def __init__(self, node_ids: Sequence[str]) -> None:
+        self.node_ids = list(node_ids)
+        self._node_codes = {node_id: code for code, node_id in enumerate(self.node_ids)}
+
+    def encode(self, channel: int, seq: int, event: Event) -> bytes:
+        """Return one length-prefixed record for `event`."""
+
+        code = _EVENT_CODES[event.event_type]
+        node = target = NO_NODE
+        inline = code <= _RUN_END
+        if isinstance(event, EdgeTakenEvent):
+            node = self._node_codes.get(event.source_node_id, NO_NODE)
+            inline = inline and node != NO_NODE
+            if event.target_node_id is not None:
+                target = self._node_codes.get(event.target_node_id, NO_NODE)
+                inline = inline and target != NO_NODE
+        elif code != _RUN_END:
+            node_id = getattr(event, "node_id", None)
+            if node_id is not None:
+                node = self._node_codes.get(node_id, NO_NODE)
+                inline = inline and node != NO_NODE
+        body = WIRE_RECORD.pack(channel, seq, code, node, target)
+        if not inline:
+            body += event.model_dump_json().encode()
+        return WIRE_LENGTH.pack(len(body)) + body
+
+    def encode_batch(self, channel: int, first_seq: int, events: Iterable[Event]) -> bytes:
+        """Return the records for consecutive events starting at sequence number `first_seq`."""
+
+        return b"".join(self.encode(channel, seq, event) for seq, event in enumerate(events, start=first_seq))
+
+
+def decode_records(
+    data: bytes,
+    node_ids: Sequence[str],
+    run_ids: Mapping[int, str],
+) -> list[tuple[int, int, Event]]:
+    """Decode a binary message into `(channel, seq, event)` tuples; `run_ids` maps channels to runs."""
+
+    records: list[tuple[int, int, Event]] = []
+    offset = 0
+    view = memoryview(data)
+    while offset < len(view):
+        (length,) = WIRE_LENGTH.unpack_from(view, offset)
+        offset += WIRE_LENGTH.size
+        channel, seq, code, node, target = WIRE_RECORD.unpack_from(view, offset)
+        payload = view[offset + WIRE_RECORD.size : offset + length]
+        offset += length
+        if payload:
+            event = _EVENT_ADAPTER.validate_json(bytes(payload))
+        else:
+            event = _inline_event(run_ids[channel], code, node, target, node_ids)
+        records.append((channel, seq, event))
+    return records
+
+
+def _inline_event(run_id: str, code: int, node: int, target: int, node_ids: Sequence[str]) -> Event:
+    if code == _RUN_END:
+        return RunEndEvent(run_id=run_id, event_type="run_end")
+    if code == _NODE_START:
+        return NodeStartEvent(run_id=run_id, event_type="node_start", node_id=node_ids[node])
+    if code == _NODE_END:
+        return NodeEndEvent(run_id=run_id, event_type="node_end", node_id=node_ids[node])
+    if code != _EDGE_TAKEN:
+        raise ValueError(f"Event type {EVENT_TYPES[code]!r} cannot be decoded without its payload")
+    return EdgeTakenEvent(
+        run_id=run_id,
+        event_type="edge_taken",
+        source_node_id=node_ids[node],
+        target_node_id=None if target == NO_NODE else node_ids[target],
+    )
+
+
+class CompactEncoder:
+    """Encodes one run's events as small JSON objects against an interned dictionary.
+
+    `dictionary()` is sent first: it maps node codes (from `o` on) to node ids and carries the run
+    id, `EVENT_TYPES` and the short field names. Events then become `{"e": type code, "n": node,
+    "t": target, ...}` with the remaining fields under their `COMPACT_FIELDS` names. A node missing
+    from the dictionary is interned on first use and `encode` returns a dictionary extension first.
+    """
+
+    __slots__ = ("run_id", "node_ids", "_node_codes")
+
+    def __init__(self, run_id: str, node_ids: Sequence[str]) -> None:
+        self.run_id = run_id
+        self.node_ids = list(node_ids)
+        self._node_codes = {node_id: code for code, node_id in enumerate(self.node_ids)}
+
+    def dictionary(self) -> dict[str, Any]:
+        """Return the dictionary frame that starts every compact stream."""
+
+        return {
+            "d": {
+                "r": self.run_id,
+                "o": 0,
+                "n": list(self.node_ids),
+                "e": list(EVENT_TYPES),
+                "f": _LONG_FIELDS,
+            }
+        }
+
+    def encode(self, event: Event) -> list[dict[str, Any]]:
+        """Return the frames for `event`: a dictionary extension if it names new nodes, then the event."""
+
+        known = len(self.node_ids)
+        frame: dict[str, Any] = {"e": _EVENT_CODES[event.event_type]}
+        if isinstance(event, NodeStartEvent | NodeEndEvent):
+            frame["n"] = self._intern(event.node_id)
+        elif isinstance(event, EdgeTakenEvent):
+            frame["n"] = self._intern(event.source_node_id)
+            if event.target_node_id is not None:
+                frame["t"] = self._intern(event.target_node_id)
+        elif not isinstance(event, RunEndEvent):
+            for name, value in event.model_dump(mode="json", exclude={"run_id", "event_type"}).items():
+                if name in _NODE_FIELDS:
+                    if value is not None:
+                        frame[_NODE_FIELDS[name]] = self._intern(value)
+                else:
+                    frame[COMPACT_FIELDS.get(name, name)] = value
+        if len(self.node_ids) == known:
+            return [frame]
+        return [{"d": {"o": known, "n": self.node_ids[known:]}}, frame]
+
+    def _intern(self, node_id: str) -> int:
+        code = self._node_codes.get(node_id)
+        if code is None:
+            code = self._node_codes[node_id] = len(self.node_ids)
+            self.node_ids.append(node_id)
+        return code
+
+
+class CompactDecoder:
+    """Rebuilds events from the frames of a compact stream; the inverse of `CompactEncoder`."""
+
+    __slots__ = ("run_id", "node_ids", "event_types", "fields")
+
+    def __init__(self) -> None:
+        self.run_id = ""
+        self.node_ids: list[str] = []
+        self.event_types: list[str] = list(EVENT_TYPES)
+        self.fields: dict[str, str] = dict(_LONG_FIELDS)
+
+    def decode(self, frame: Mapping[str, Any]) -> Event | None:
+        """Return the event in `frame`, or None after absorbing a dictionary frame."""
+
+        dictionary = frame.get("d")
+        if dictionary is not None:
+            self.run_id = dictionary.get("r", self.run_id)
+            self.event_types = dictionary.get("e", self.event_types)
+            self.fields = dictionary.get("f", self.fields)
+            del self.node_ids[dictionary["o"] :]
+            self.node_ids.extend(dictionary["n"])
+            return None
+        event_type = self.event_types[frame["e"]]
+        data: dict[str, Any] = {"run_id": self.run_id, "event_type": event_type}
+        for key, value in frame.items():
+            if key == "e":
+                continue
+            if key == "n":
+                data["source_node_id" if event_type == "edge_taken" else "node_id"] = self.node_ids[value]
+            elif key == "t":
+                data["target_node_id"] = self.node_ids[value]
+            else:
+                data[self.fields.get(key, key)] = value
+        return _EVENT_ADAPTER.validate_python(data)
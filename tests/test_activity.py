@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+from pydantic_graph_studio.activity import ToolActivityLog
+from pydantic_graph_studio.schemas import NodeStartEvent, ToolCallEvent, ToolResultEvent
+
+
+def _call(call_id: str, arguments: object = None) -> ToolCallEvent:
+    return ToolCallEvent(
+        run_id="run",
+        event_type="tool_call",
+        node_id="Node",
+        tool_name="lookup",
+        call_id=call_id,
+        arguments=arguments,
+    )
+
+
+def _result(call_id: str, output: object, *, success: bool = True) -> ToolResultEvent:
+    return ToolResultEvent(
+        run_id="run",
+        event_type="tool_result",
+        node_id="Node",
+        tool_name="lookup",
+        call_id=call_id,
+        output=output,
+        success=success,
+    )
+
+
+def test_tool_activity_log_updates_calls_in_place() -> None:
+    log = ToolActivityLog()
+    log.apply(NodeStartEvent(run_id="run", event_type="node_start", node_id="Node"))
+    log.apply(_call("a", {"q": 1}))
+    log.apply(_call("b", {"q": 2}))
+    log.apply(_result("a", "first", success=False))
+
+    assert len(log) == 2
+    first, second = log.page(0, 10)
+    assert (first.index, first.arguments, first.output, first.success, first.completed) == (
+        0,
+        {"q": 1},
+        "first",
+        False,
+        True,
+    )
+    assert (second.index, second.completed, second.output) == (1, False, None)
+
+
+def test_tool_activity_log_records_results_without_a_call() -> None:
+    log = ToolActivityLog()
+    log.apply(_result("orphan", 3))
+    log.apply(_call("next"))
+
+    assert [entry.call_id for entry in log.page(0, 10)] == ["orphan", "next"]
+    assert log.page(0, 10)[0].arguments is None
+    assert [entry.index for entry in log.page(1, 1)] == [1]
+
+
+def test_tool_activity_log_counts_the_bytes_of_its_payloads() -> None:
+    log = ToolActivityLog()
+    log.apply(_call("a", {"text": "x" * 10_000}))
+    after_call = log.nbytes
+    assert after_call > 10_000
+
+    log.apply(_result("a", "y" * 5_000))
+    assert log.nbytes > after_call + 5_000
@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from pydantic_graph_studio.admission import AdmissionController, AdmissionPolicy, AdmissionRejected
+
+
+def test_admission_policy_validates_limits() -> None:
+    with pytest.raises(ValueError):
+        AdmissionPolicy(max_running=0)
+    with pytest.raises(ValueError):
+        AdmissionPolicy(max_running=1, max_queued=-1)
+    with pytest.raises(ValueError):
+        AdmissionPolicy(max_running=1, priorities=("high", "high"))
+    with pytest.raises(ValueError):
+        AdmissionPolicy(max_running=1, priorities=("high", "low"))
+
+
+def test_freed_slots_go_to_the_oldest_run_of_the_highest_priority() -> None:
+    async def scenario() -> None:
+        policy = AdmissionPolicy(max_running=1, max_queued=3, priorities=("high", "normal"))
+        controller = AdmissionController(policy)
+        running = controller.request("a")
+        assert running.admitted_at is not None
+
+        first = controller.request("b")
+        second = controller.request("c")
+        urgent = controller.request("d", "high")
+        assert [controller.position(ticket) for ticket in (urgent, first, second)] == [1, 2, 3]
+        with pytest.raises(AdmissionRejected) as exc_info:
+            controller.request("e", "high")
+        assert exc_info.value.retry_after >= 1
+        with pytest.raises(ValueError):
+            controller.request("f", "low")
+
+        controller.release(running)
+        assert await controller.wait(urgent) >= 0
+        assert first.admitted_at is None
+
+        controller.release(first)
+        controller.release(urgent)
+        assert second.admitted_at is not None
+
+        metrics = controller.metrics()
+        assert metrics.running == 1
+        assert metrics.queued == 0
+        assert metrics.queued_by_priority == {"high": 0, "normal": 0}
+        assert metrics.admitted_total == 3
+        assert metrics.queued_total == 3
+        assert metrics.rejected_total == 1
+
+    asyncio.run(scenario())
+
+
+def test_releasing_twice_frees_a_single_slot() -> None:
+    controller = AdmissionController(AdmissionPolicy(max_running=2))
+    ticket = controller.request("a")
+    controller.request("b")
+    controller.release(ticket)
+    controller.release(ticket)
+    assert controller.metrics().running == 1
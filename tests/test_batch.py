@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from pydantic_graph_studio.admission import AdmissionRejected
+from pydantic_graph_studio.batch import RunBatch
+from pydantic_graph_studio.schemas import BatchRunSummary
+
+
+def test_batch_caps_concurrency_and_summarizes_every_run() -> None:
+    running: set[str] = set()
+    peak = 0
+
+    async def start(index: int) -> str:
+        nonlocal peak
+        if index == 3:
+            raise ValueError("bad item")
+        running.add(f"run-{index}")
+        peak = max(peak, len(running))
+        return f"run-{index}"
+
+    async def finish(run_id: str) -> BatchRunSummary:
+        await asyncio.sleep(0.01)
+        running.discard(run_id)
+        return BatchRunSummary(index=0, status="failed" if run_id == "run-1" else "completed")
+
+    async def scenario() -> None:
+        batch = RunBatch("batch", 5, concurrency=2)
+        assert batch.progress().pending == 5
+        await batch.run(start, finish)
+
+        assert peak == 2
+        progress = batch.progress()
+        assert progress.done
+        assert (progress.completed, progress.failed, progress.pending) == (3, 2, 0)
+        assert [run.run_id for run in progress.runs] == ["run-0", "run-1", "run-2", None, "run-4"]
+        assert progress.runs[3].error == "bad item"
+        assert all(run.duration is not None for run in progress.runs if run.run_id is not None)
+
+        messages = [message async for messages in batch.follow() for message in messages]
+        assert [message["type"] for message in messages].count("run_started") == 4
+        assert [message["type"] for message in messages].count("run_finished") == 5
+        assert messages[-1] == {
+            "type": "batch_finished",
+            "pending": 0,
+            "running": 0,
+            "completed": 3,
+            "failed": 2,
+            "cancelled": 0,
+        }
+
+    asyncio.run(scenario())
+
+
+def test_batch_retries_runs_the_admission_queue_rejects() -> None:
+    attempts = 0
+
+    async def start(index: int) -> str:
+        nonlocal attempts
+        attempts += 1
+        if attempts == 1:
+            raise AdmissionRejected(retry_after=0)
+        return "run"
+
+    async def finish(run_id: str) -> BatchRunSummary:
+        return BatchRunSummary(index=0, status="completed")
+
+    async def scenario() -> None:
+        batch = RunBatch("batch", 1)
+        follower = batch.follow(heartbeat=0.01)
+        await batch.run(start, finish)
+        assert attempts == 2
+        assert batch.progress().completed == 1
+        assert [message["type"] for message in await anext(follower)][-1] == "batch_finished"
+
+    asyncio.run(scenario())
+
+
+def test_batch_rejects_bad_sizes() -> None:
+    with pytest.raises(ValueError):
+        RunBatch("batch", 0)
+    with pytest.raises(ValueError):
+        RunBatch("batch", 1, concurrency=0)
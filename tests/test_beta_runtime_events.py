@@ -64,3 +64,40 @@ def test_beta_iter_run_events_parallel_edges() -> None:
     assert ("Planner", "FetchFork") in edge_pairs
     assert ("FetchFork", "FetchFast") in edge_pairs
     assert ("FetchFork", "FetchSlow") in edge_pairs
+
+
+def test_beta_cancelled_error_raised_inside_a_step_is_a_failure() -> None:
+    builder: GraphBuilder[None, None, None, None] = GraphBuilder()
+
+    @builder.step(node_id="Lookup")
+    async def lookup(ctx: StepContext[None, None, None]) -> None:
+        request = asyncio.create_task(asyncio.sleep(10))
+        request.cancel()
+        await request
+
+    builder.add(builder.edge_from(builder.start_node).to(lookup))
+    builder.add_edge(lookup, builder.end_node)
+
+    events = _collect_events(builder.build())
+    assert events[-1].event_type == "error"
+    assert events[-1].message == "CancelledError"
+    assert events[-1].node_id == "Lookup"
+
+
+def test_beta_iter_run_events_reports_the_output() -> None:
+    builder: GraphBuilder[None, None, None, int] = GraphBuilder()
+
+    @builder.step(node_id="Answer")
+    async def answer(ctx: StepContext[None, None, None]) -> int:
+        return 7
+
+    builder.add(builder.edge_from(builder.start_node).to(answer))
+    builder.add_edge(answer, builder.end_node)
+    outputs: list[int] = []
+
+    async def run() -> None:
+        async for _event in iter_run_events(builder.build(), None, on_output=outputs.append):
+            pass
+
+    asyncio.run(run())
+    assert outputs == [7]
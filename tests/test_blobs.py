@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+from pathlib import Path
+
+from pydantic_graph_studio.blobs import BLOB_PREVIEW_CHARS, BlobStore
+from pydantic_graph_studio.schemas import InputRequestEvent, NodeStartEvent, ToolResultEvent
+
+
+def _result(output: object) -> ToolResultEvent:
+    return ToolResultEvent(
+        run_id="run",
+        event_type="tool_result",
+        node_id="Node",
+        tool_name="generate",
+        call_id="call",
+        output=output,
+    )
+
+
+def test_blob_store_deduplicates_by_content_hash() -> None:
+    store = BlobStore()
+    first = store.put(b'"payload"')
+    assert first == hashlib.sha256(b'"payload"').hexdigest()
+    assert store.put(b'"payload"') == first
+    assert store.get(first) == b'"payload"'
+    assert store.get("0" * 64) is None
+    assert store.get("../etc/passwd") is None
+
+
+def test_offload_keeps_small_payloads_inline() -> None:
+    store = BlobStore(threshold=64)
+    event = _result({"text": "short"})
+    assert asyncio.run(store.offload(event)) is event
+    start = NodeStartEvent(run_id="run", event_type="node_start", node_id="Node")
+    assert asyncio.run(store.offload(start)) is start
+
+
+def test_offload_replaces_large_payloads_with_a_reference() -> None:
+    store = BlobStore(threshold=64)
+    output = {"text": "x" * 1000}
+    event = asyncio.run(store.offload(_result(output)))
+
+    assert isinstance(event, ToolResultEvent)
+    ref = event.output
+    data = json.dumps(output, separators=(",", ":")).encode()
+    assert ref["$blob"] == hashlib.sha256(data).hexdigest()
+    assert ref["size"] == len(data)
+    assert ref["preview"].startswith('{"text":"xxx')
+    assert len(ref["preview"]) == BLOB_PREVIEW_CHARS + 1
+    assert json.loads(store.get(ref["$blob"]) or b"") == output
+
+    request = InputRequestEvent(
+        run_id="run",
+        event_type="input_request",
+        node_id="Node",
+        request_id="request",
+        prompt="Approve?",
+        options=["yes", "no"],
+        context=output,
+    )
+    offloaded = asyncio.run(store.offload(request))
+    assert isinstance(offloaded, InputRequestEvent)
+    assert offloaded.context == ref
+
+
+def test_blob_store_spills_to_disk_over_its_memory_limit() -> None:
+    store = BlobStore(memory_limit=100)
+    hashes = [store.put(bytes([index]) * 60) for index in range(3)]
+    for index, blob_hash in enumerate(hashes):
+        assert store.get(blob_hash) == bytes([index]) * 60
+    spill_dir = store._spill_dir
+    assert spill_dir is not None
+    assert (spill_dir / hashes[0]).exists()
+
+    store.close()
+    assert not spill_dir.exists()
+    assert store.get(hashes[0]) is None
+
+
+def test_blob_store_persists_a_given_spill_dir_on_close(tmp_path: Path) -> None:
+    spill_dir = tmp_path / "blobs"
+    store = BlobStore(spill_dir=spill_dir)
+    blob_hash = store.put(b'{"kept": true}')
+    store.close()
+
+    reopened = BlobStore(spill_dir=spill_dir)
+    assert reopened.get(blob_hash) == b'{"kept": true}'
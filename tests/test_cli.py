@@ -11,6 +11,7 @@ import pytest
 from pydantic_graph import BaseNode, End, Graph, GraphRunContext
 
 from pydantic_graph_studio import cli
+from pydantic_graph_studio.admission import AdmissionPolicy
 from pydantic_graph_studio.cli import (
     CLIError,
     _has_explicit_port,
@@ -24,6 +25,7 @@ from pydantic_graph_studio.cli import (
     _run_server,
     _select_port,
 )
+from pydantic_graph_studio.factories import ResourcePool, RunFactories
 
 
 @dataclass
@@ -65,10 +67,39 @@ def test_parse_args_defaults() -> None:
     assert args.port == 8000
     assert args.start is None
     assert args.no_open is False
+    assert args.history is None
+    assert args.max_runs is None
+
+
+def test_admission_flags_build_a_policy() -> None:
+    args = _parse_args(["module:graph", "--max-runs", "4", "--max-queued", "10"])
+    assert cli._admission_policy(args) == AdmissionPolicy(max_running=4, max_queued=10)
+    assert cli._admission_policy(_parse_args(["module:graph"])) is None
+    with pytest.raises(CLIError, match="max_running"):
+        cli._admission_policy(_parse_args(["module:graph", "--max-runs", "0"]))
+
+
+def test_factory_flags_load_callables(tmp_path: Path) -> None:
+    module_path = tmp_path / "run_factories.py"
+    module_path.write_text("def make_deps():\n    return {}\n\nstate = 1\n", encoding="utf-8")
+    args = _parse_args(["module:graph", "--deps-factory", f"{module_path}:make_deps", "--deps-pool", "2"])
+    factories = cli._run_factories(args)
+    assert factories is not None
+    assert isinstance(factories.deps, ResourcePool)
+    assert factories.deps.max_size == 2
+    assert factories.state is None
+    assert cli._run_factories(_parse_args(["module:graph"])) is None
+    with pytest.raises(CLIError, match="did not resolve to a callable"):
+        cli._run_factories(_parse_args(["module:graph", "--state-factory", f"{module_path}:state"]))
+    with pytest.raises(CLIError, match="requires --deps-factory"):
+        cli._run_factories(_parse_args(["module:graph", "--deps-pool", "2"]))
 
 
 def test_parse_args_overrides() -> None:
-    args = _parse_args(["module:graph", "--host", "0.0.0.0", "--port", "9000", "--start", "Start", "--no-open"])
+    args = _parse_args(
+        ["module:graph", "--host", "0.0.0.0", "--port", "9000", "--start", "Start", "--no-open", "--history", "runs.db"]
+    )
+    assert args.history == "runs.db"
     assert args.host == "0.0.0.0"
     assert args.port == 9000
     assert args.start == "Start"
@@ -81,6 +112,8 @@ def test_parse_example_args_defaults() -> None:
     assert args.host == "127.0.0.1"
     assert args.port == 8000
     assert args.no_open is False
+    assert args.size is None
+    assert args.beta is False
 
 
 def test_has_explicit_port() -> None:
@@ -303,6 +336,9 @@ graph = Graph(nodes=[Start])
         host: str,
         port: int,
         open_browser: bool,
+        history: str | None = None,
+        admission: AdmissionPolicy | None = None,
+        factories: RunFactories | None = None,
     ) -> None:
         called["graph"] = graph
         called["start_node"] = start_node
@@ -328,6 +364,8 @@ def test_main_example_list(capsys: pytest.CaptureFixture[str]) -> None:
         "tool-usage",
         "streaming-events",
         "human-in-the-loop",
+        "stress-chain",
+        "stress-loop",
     ]:
         assert name in out
 
@@ -341,6 +379,9 @@ def test_main_example_run(monkeypatch: pytest.MonkeyPatch) -> None:
         host: str,
         port: int,
         open_browser: bool,
+        history: str | None = None,
+        admission: AdmissionPolicy | None = None,
+        factories: RunFactories | None = None,
     ) -> None:
         called["host"] = host
         called["port"] = port
@@ -355,6 +396,38 @@ def test_main_example_run(monkeypatch: pytest.MonkeyPatch) -> None:
     assert called["open_browser"] is False
 
 
+def test_main_example_sized_run(monkeypatch: pytest.MonkeyPatch) -> None:
+    called: dict[str, object] = {}
+
+    def fake_run_server(
+        graph: object,
+        start_node: object,
+        host: str,
+        port: int,
+        open_browser: bool,
+        history: str | None = None,
+        admission: AdmissionPolicy | None = None,
+        factories: RunFactories | None = None,
+    ) -> None:
+        called["graph"] = graph
+        called["start_node"] = start_node
+
+    monkeypatch.setattr(cli, "_run_server", fake_run_server)
+    monkeypatch.setattr(cli, "_select_port", lambda *args, **kwargs: 8010)
+    cli.main(["example", "stress-chain", "--size", "25", "--no-open"])
+
+    graph = cast(Any, called["graph"])
+    assert len(graph.node_defs) == 25
+    assert called["start_node"] is not None
+
+
+def test_main_example_rejects_size_for_fixed_example(capsys: pytest.CaptureFixture[str]) -> None:
+    with pytest.raises(SystemExit) as exc_info:
+        cli.main(["example", "graph", "--size", "10", "--no-open"])
+    assert exc_info.value.code == 2
+    assert "does not accept --size" in capsys.readouterr().err
+
+
 def test_main_example_unknown(capsys: pytest.CaptureFixture[str]) -> None:
     with pytest.raises(SystemExit) as exc_info:
         cli.main(["example", "nope"])
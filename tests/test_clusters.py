@@ -0,0 +1,108 @@
+from __future__ import annotations
+
+import pytest
+
+from pydantic_graph_studio.clusters import MAX_CLUSTER_CHILDREN, MAX_VISIBLE_ELEMENTS, build_hierarchy
+from pydantic_graph_studio.examples.synthetic import build_synthetic_graph
+from pydantic_graph_studio.introspection import build_cluster_hierarchy
+from pydantic_graph_studio.schemas import GraphEdge, GraphModel, GraphNode
+
+
+def _model(node_ids: list[str], edges: list[tuple[str, str | None]]) -> GraphModel:
+    return GraphModel(
+        nodes=[GraphNode(node_id=node_id, label=node_id) for node_id in node_ids],
+        edges=[
+            GraphEdge(source_node_id=source, target_node_id=target, dynamic=target is None) for source, target in edges
+        ],
+        entry_nodes=[node_ids[0]],
+        terminal_nodes=[node_ids[-1]],
+    )
+
+
+def test_view_aggregates_edges_between_collapsed_clusters() -> None:
+    model = _model(
+        ["A1", "A2", "B1", "B2", "C"],
+        [("A1", "A2"), ("A1", "B1"), ("A2", "B2"), ("B1", "B2"), ("B2", "C"), ("B2", None)],
+    )
+    hierarchy = build_hierarchy(model, "test", {"A1": ("a",), "A2": ("a",), "B1": ("b",), "B2": ("b",)})
+
+    view = hierarchy.view([])
+    assert [node.node_id for node in view.graph.nodes] == ["cluster:a", "cluster:b", "C"]
+    assert [(edge.source_node_id, edge.target_node_id) for edge in view.graph.edges] == [
+        ("cluster:a", "cluster:b"),
+        ("cluster:b", "C"),
+        ("cluster:b", None),
+    ]
+    assert view.edge_counts == [2, 1, 1]
+    assert view.graph.entry_nodes == ["cluster:a"]
+    assert {cluster.cluster_id: cluster.node_count for cluster in view.clusters} == {"cluster:a": 2, "cluster:b": 2}
+
+    expanded = hierarchy.view(["cluster:b", "cluster:unknown"])
+    assert [node.node_id for node in expanded.graph.nodes] == ["cluster:a", "B1", "B2", "C"]
+    assert expanded.expanded == ["cluster:b"]
+    assert view.graph.nodes[2] == expanded.graph.nodes[3]
+
+
+def test_hierarchy_inlines_single_nodes_and_merges_single_child_chains() -> None:
+    model = _model(["A", "B", "C"], [("A", "B"), ("B", "C")])
+    hierarchy = build_hierarchy(
+        model,
+        "module",
+        {"A": ("pkg", "alone"), "B": ("pkg", "sub", "deep"), "C": ("pkg", "sub", "deep")},
+    )
+
+    assert hierarchy.ancestors("A") == []
+    assert hierarchy.ancestors("B") == ["cluster:pkg/sub"]
+    view = hierarchy.view([])
+    assert [cluster.label for cluster in view.clusters] == ["sub.deep"]
+    with pytest.raises(KeyError):
+        hierarchy.ancestors("missing")
+
+
+def test_large_levels_are_chunked_and_top_level_stays_bounded() -> None:
+    hierarchy = build_cluster_hierarchy(build_synthetic_graph("chain", 5000), "module")
+
+    view = hierarchy.view()
+    assert len(view.graph.nodes) <= MAX_VISIBLE_ELEMENTS
+    assert sum(cluster.node_count for cluster in view.clusters) == 5000
+    assert all(cluster.node_count <= MAX_CLUSTER_CHILDREN for cluster in view.clusters)
+    assert view.clusters[0].label == f"Chain00000 … Chain{MAX_CLUSTER_CHILDREN - 1:05d}"
+
+    path = hierarchy.ancestors("Chain00070")
+    assert len(path) == 2
+    assert hierarchy.view([]).graph.nodes[0].node_id == path[-1]
+    deeper = hierarchy.view([path[0]])
+    assert "Chain00070" in {node.node_id for node in deeper.graph.nodes}
+    assert len(deeper.graph.nodes) == 2 * MAX_CLUSTER_CHILDREN
+
+
+def test_small_graphs_are_fully_expanded_by_default() -> None:
+    graph = build_synthetic_graph("broadcast", 5, beta=True)
+    view = build_cluster_hierarchy(graph, "prefix").view()
+
+    assert view.clusters == []
+    assert len(view.graph.nodes) == len(build_cluster_hierarchy(graph, "prefix").model.nodes)
+
+
+def test_region_strategy_groups_fork_join_regions() -> None:
+    graph = build_synthetic_graph("broadcast", 3, beta=True)
+    hierarchy = build_cluster_hierarchy(graph, "region")
+
+    assert hierarchy.ancestors("Branch00001") == ["cluster:FanoutFork..FanoutJoin"]
+    assert hierarchy.ancestors("Fanout") == []
+    view = hierarchy.view([])
+    assert [cluster.label for cluster in view.clusters] == ["FanoutFork → FanoutJoin"]
+    assert view.clusters[0].node_count == 5
+
+    with pytest.raises(ValueError, match="beta graph"):
+        build_cluster_hierarchy(build_synthetic_graph("broadcast", 3), "region")
+    with pytest.raises(ValueError, match="Unknown cluster strategy"):
+        build_cluster_hierarchy(graph, "bogus")
+
+
+def test_rollup_status_prefers_error_then_active() -> None:
+    model = _model(["A1", "A2", "A3", "B"], [("A1", "A2"), ("A2", "A3"), ("A3", "B")])
+    hierarchy = build_hierarchy(model, "test", {"A1": ("a",), "A2": ("a",), "A3": ("a",)})
+
+    assert hierarchy.rollup_status({"A1": "done", "A2": "active"}) == {"cluster:a": "active"}
+    assert hierarchy.rollup_status({"A1": "error", "A2": "active", "B": "done"}) == {"cluster:a": "error"}
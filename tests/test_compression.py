@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+import asyncio
+import gzip
+import zlib
+from collections.abc import AsyncIterator
+
+import pytest
+
+from pydantic_graph_studio.compression import (
+    StreamCompression,
+    StreamCompressor,
+    compress_stream,
+    select_stream_encoding,
+)
+
+
+def test_select_stream_encoding_prefers_gzip() -> None:
+    assert select_stream_encoding("gzip, deflate, br") == "gzip"
+    assert select_stream_encoding("deflate") == "deflate"
+    assert select_stream_encoding("gzip;q=0, deflate") == "deflate"
+    assert select_stream_encoding("*") == "gzip"
+    assert select_stream_encoding("identity") is None
+    assert select_stream_encoding(None) is None
+
+
+def test_stream_compression_validates_settings() -> None:
+    with pytest.raises(ValueError):
+        StreamCompression(level=0)
+    with pytest.raises(ValueError):
+        StreamCompression(flush_interval=-1)
+    with pytest.raises(ValueError):
+        StreamCompressor("br")
+
+
+def test_sync_flush_makes_every_chunk_decodable_immediately() -> None:
+    compressor = StreamCompressor("deflate", level=9)
+    decompressor = zlib.decompressobj()
+    for index in range(3):
+        frame = f"data: {index}\n\n".encode()
+        assert decompressor.decompress(compressor.compress(frame) + compressor.flush()) == frame
+    assert decompressor.decompress(compressor.finish()) == b""
+    assert decompressor.eof
+
+
+def test_compress_stream_flushes_when_the_source_goes_quiet() -> None:
+    resumed = asyncio.Event()
+
+    async def source() -> AsyncIterator[bytes]:
+        yield b"data: first\n\n"
+        await resumed.wait()
+        yield b"data: second\n\n"
+
+    async def consume() -> bytes:
+        # The second chunk is only produced once the first one has been decoded by the client.
+        decompressor = zlib.decompressobj(31)
+        compressed = b""
+        async for chunk in compress_stream(source(), StreamCompressor("gzip"), flush_interval=0.01):
+            compressed += chunk
+            if decompressor.decompress(chunk) == b"data: first\n\n":
+                resumed.set()
+        return compressed
+
+    assert gzip.decompress(asyncio.run(consume())) == b"data: first\n\ndata: second\n\n"
+
+
+def test_compress_stream_reads_with_one_task_and_raises_source_errors() -> None:
+    async def source() -> AsyncIterator[bytes]:
+        for index in range(100):
+            yield f"data: {index}\n\n".encode()
+        raise OSError("source failed")
+
+    async def consume() -> tuple[bytes, int]:
+        compressed = b""
+        tasks = 0
+        with pytest.raises(OSError, match="source failed"):
+            async for chunk in compress_stream(source(), StreamCompressor("gzip"), flush_interval=0.0):
+                compressed += chunk
+                tasks = max(tasks, len(asyncio.all_tasks()))
+        return compressed, tasks
+
+    compressed, tasks = asyncio.run(consume())
+    assert tasks == 2
+    assert zlib.decompressobj(31).decompress(compressed).count(b"data: ") == 100
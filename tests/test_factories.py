@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+import asyncio
+from itertools import count
+
+import pytest
+
+from pydantic_graph_studio.factories import ResourcePool, RunFactories
+
+
+def test_factories_build_fresh_values_per_run_and_keep_the_rest() -> None:
+    async def make_deps() -> dict[str, int]:
+        return {"calls": 0}
+
+    async def scenario() -> None:
+        factories = RunFactories(state=list, deps=make_deps)
+        first = await factories.create(inputs="shared")
+        second = await factories.create(inputs="shared")
+        assert first.state == [] and first.state is not second.state
+        assert first.deps == {"calls": 0} and first.deps is not second.deps
+        assert first.inputs == second.inputs == "shared"
+
+    asyncio.run(scenario())
+
+
+def test_pool_reuses_objects_but_never_shares_them_between_runs() -> None:
+    created = count()
+    closed: list[int] = []
+
+    async def scenario() -> None:
+        pool = ResourcePool(lambda: next(created), max_size=2, close=closed.append)
+        factories = RunFactories(deps=pool)
+        first = await factories.create()
+        second = await factories.create()
+        assert {first.deps, second.deps} == {0, 1}
+
+        waiting = asyncio.ensure_future(factories.create())
+        await asyncio.sleep(0)
+        assert not waiting.done()
+        await first.release()
+        third = await waiting
+        assert third.deps == first.deps
+
+        await pool.aclose()
+        assert closed == []
+        await second.release()
+        await third.release()
+        assert sorted(closed) == [0, 1]
+        with pytest.raises(RuntimeError):
+            await pool.acquire()
+
+    asyncio.run(scenario())
+
+
+def test_pool_frees_its_slot_when_the_factory_fails() -> None:
+    def broken() -> object:
+        raise OSError("connection refused")
+
+    async def scenario() -> None:
+        pool = ResourcePool(broken, max_size=1)
+        for _ in range(2):
+            with pytest.raises(OSError):
+                await RunFactories(deps=pool).create()
+
+    asyncio.run(scenario())
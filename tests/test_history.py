@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+from pydantic_graph_studio.history import RunHistoryStore, RunQuery
+from pydantic_graph_studio.schemas import ErrorEvent, NodeEndEvent, NodeStartEvent, RunEndEvent
+from pydantic_graph_studio.snapshot import KEYFRAME_INTERVAL, state_at
+
+
+def _record_run(
+    store: RunHistoryStore,
+    run_id: str,
+    *,
+    started_at: float,
+    duration: float,
+    nodes: list[str],
+    error: str | None = None,
+) -> None:
+    store.run_started(run_id, started_at=started_at)
+    for seq, node_id in enumerate(nodes, start=1):
+        store.record(run_id, seq, NodeStartEvent(run_id=run_id, event_type="node_start", node_id=node_id))
+    if error is None:
+        store.record(run_id, len(nodes) + 1, RunEndEvent(run_id=run_id, event_type="run_end"))
+    else:
+        store.record(run_id, len(nodes) + 1, ErrorEvent(run_id=run_id, event_type="error", message=error))
+    store.run_finished(
+        run_id,
+        status="completed" if error is None else "failed",
+        error=error,
+        event_count=len(nodes) + 1,
+        visit_counts={node_id: nodes.count(node_id) for node_id in nodes},
+        ended_at=started_at + duration,
+    )
+
+
+def test_history_store_indexes_runs_for_search(tmp_path: Path) -> None:
+    store = RunHistoryStore(tmp_path / "history.db")
+    store.open()
+    try:
+        _record_run(store, "a", started_at=100.0, duration=1.0, nodes=["Start", "Next"])
+        _record_run(store, "b", started_at=200.0, duration=5.0, nodes=["Start"], error="Timeout talking to API")
+        _record_run(store, "c", started_at=300.0, duration=2.0, nodes=["Start", "Next", "Next"])
+        store.flush()
+
+        page = store.search()
+        assert page.total == 3
+        assert [run.run_id for run in page.items] == ["c", "b", "a"]
+        assert page.items[0].duration == 2.0
+        assert page.items[0].event_count == 4
+
+        assert [run.run_id for run in store.search(RunQuery(sort="duration", limit=2)).items] == ["b", "c"]
+        assert [run.run_id for run in store.search(RunQuery(offset=2)).items] == ["a"]
+        assert [run.run_id for run in store.search(RunQuery(status="failed")).items] == ["b"]
+        assert [run.run_id for run in store.search(RunQuery(node_id="Next")).items] == ["c", "a"]
+        assert [run.run_id for run in store.search(RunQuery(error="timeout")).items] == ["b"]
+        assert store.search(RunQuery(error="%")).total == 0
+        assert [run.run_id for run in store.search(RunQuery(started_after=150, started_before=300)).items] == ["b"]
+        assert [run.run_id for run in store.search(RunQuery(min_duration=1.5, max_duration=3)).items] == ["c"]
+
+        events = store.load_events("c", after=1)
+        assert [item.seq for item in events] == [2, 3, 4]
+        assert [item.event.event_type for item in events] == ["node_start", "node_start", "run_end"]
+    finally:
+        store.close()
+
+    reopened = RunHistoryStore(tmp_path / "history.db")
+    reopened.open()
+    try:
+        summary = reopened.get_run("b")
+        assert summary is not None
+        assert (summary.status, summary.error) == ("failed", "Timeout talking to API")
+        assert reopened.get_run("missing") is None
+    finally:
+        reopened.close()
+
+
+def test_history_store_seeks_through_keyframes(tmp_path: Path) -> None:
+    events = []
+    for index in range(KEYFRAME_INTERVAL * 2):
+        node_id = f"N{index % 7}"
+        events.append(NodeStartEvent(run_id="long", event_type="node_start", node_id=node_id))
+        events.append(NodeEndEvent(run_id="long", event_type="node_end", node_id=node_id))
+    store = RunHistoryStore(tmp_path / "history.db")
+    store.open()
+    try:
+        store.run_started("long")
+        for seq, event in enumerate(events, start=1):
+            store.record("long", seq, event)
+        store.flush()
+
+        connection = store._connect()
+        try:
+            keyframe_seqs = [seq for (seq,) in connection.execute("SELECT seq FROM keyframes ORDER BY seq")]
+        finally:
+            connection.close()
+        assert keyframe_seqs == [KEYFRAME_INTERVAL * n for n in range(1, 5)]
+
+        for seq in (0, 1, KEYFRAME_INTERVAL, KEYFRAME_INTERVAL * 3 + 5, len(events)):
+            assert store.state_at("long", seq) == state_at("long", None, events[:seq])
+        latest = store.state_at("long")
+        assert latest is not None
+        assert latest.seq == len(events)
+        assert store.state_at("long", len(events) + 10) == latest
+        assert store.state_at("missing", 1) is None
+    finally:
+        store.close()
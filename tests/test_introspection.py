@@ -1,10 +1,18 @@
 from __future__ import annotations
 
+import gc
+import json
 from dataclasses import dataclass
 
 from pydantic_graph import BaseNode, End, Graph, GraphRunContext
 
-from pydantic_graph_studio.introspection import build_graph_model
+from pydantic_graph_studio import introspection
+from pydantic_graph_studio.introspection import (
+    build_graph_model,
+    serialize_graph,
+    serialize_graph_json,
+    serialize_graph_view_json,
+)
 
 
 @dataclass
@@ -51,3 +59,44 @@ def test_node_ids_deterministic_across_runs() -> None:
     model_two = build_graph_model(graph)
 
     assert [node.node_id for node in model_one.nodes] == [node.node_id for node in model_two.nodes]
+
+
+def test_serialize_graph_json_is_cached_per_graph() -> None:
+    nodes: list[type[BaseNode[None, None, int]]] = [Start, Dynamic, Middle]
+    graph = Graph[None, None, int](nodes=nodes)
+    first = serialize_graph_json(graph)
+    second = serialize_graph_json(graph)
+
+    assert first is second
+    assert json.loads(first.body) == serialize_graph(graph)
+
+    other = serialize_graph_json(Graph[None, None, int](nodes=nodes))
+    assert other is not first
+    assert other.etag == first.etag
+
+
+def test_serialize_graph_json_cache_released_with_graph() -> None:
+    nodes: list[type[BaseNode[None, None, int]]] = [Start, Dynamic, Middle]
+    graph = Graph[None, None, int](nodes=nodes)
+    serialize_graph_json(graph)
+    key = (id(graph), False)
+    assert key in introspection._serialized_graphs
+
+    del graph
+    gc.collect()
+    assert key not in introspection._serialized_graphs
+
+
+def test_serialize_graph_view_json_is_cached_per_view() -> None:
+    nodes: list[type[BaseNode[None, None, int]]] = [Start, Dynamic, Middle]
+    graph = Graph[None, None, int](nodes=nodes)
+    first = serialize_graph_view_json(graph, expanded=["a", "b"], layout=True)
+
+    assert serialize_graph_view_json(graph, expanded=("b", "a"), layout=True) is first
+    assert serialize_graph_view_json(graph, expanded=["a", "b"]) is not first
+    assert serialize_graph_view_json(graph) is not serialize_graph_view_json(graph, expanded=[])
+
+    for index in range(introspection.GRAPH_VIEW_CACHE_LIMIT + 1):
+        serialize_graph_view_json(graph, expanded=[str(index)])
+    assert len(introspection._graph_views) <= introspection.GRAPH_VIEW_CACHE_LIMIT
+    assert serialize_graph_view_json(graph, expanded=["a", "b"], layout=True) is not first
@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+from pydantic_graph import BaseNode, End, Graph, GraphRunContext
+
+from pydantic_graph_studio.examples.synthetic import build_synthetic_graph
+from pydantic_graph_studio.introspection import build_graph_model
+from pydantic_graph_studio.layout import compute_layout, dynamic_target_id
+from pydantic_graph_studio.schemas import GraphEdge, GraphModel, GraphNode
+
+
+@dataclass
+class Start(BaseNode[None, None, int]):
+    async def run(self, ctx: GraphRunContext) -> Dynamic | Middle:
+        return Dynamic()
+
+
+@dataclass
+class Dynamic(BaseNode[None, None, int]):
+    async def run(self, ctx: GraphRunContext) -> BaseNode[None, None, int]:
+        return Middle()
+
+
+@dataclass
+class Middle(BaseNode[None, None, int]):
+    async def run(self, ctx: GraphRunContext) -> End[int]:
+        return End(1)
+
+
+def test_layout_positions_every_node_including_dynamic_targets() -> None:
+    nodes: list[type[BaseNode[None, None, int]]] = [Start, Dynamic, Middle]
+    model = build_graph_model(Graph[None, None, int](nodes=nodes), layout=True)
+
+    assert model.layout is not None
+    positioned = {node.node_id for node in model.layout.nodes}
+    assert positioned == {node.node_id for node in model.nodes} | {dynamic_target_id(Dynamic.get_node_id())}
+    assert len(model.layout.edge_route_x) == len(model.edges)
+
+    by_id = {node.node_id: node for node in model.layout.nodes}
+    assert by_id[Start.get_node_id()].y < by_id[Dynamic.get_node_id()].y
+    assert by_id[Dynamic.get_node_id()].y < by_id[dynamic_target_id(Dynamic.get_node_id())].y
+
+
+def test_layout_separates_nodes_within_a_layer() -> None:
+    model = build_graph_model(build_synthetic_graph("broadcast", 40, beta=True), layout=True)
+    assert model.layout is not None
+
+    rows: dict[float, list[tuple[float, float]]] = {}
+    for node in model.layout.nodes:
+        rows.setdefault(node.y + node.height / 2, []).append((node.x, node.x + node.width))
+    widest = max(rows.values(), key=len)
+    assert len(widest) == 40
+    widest.sort()
+    assert all(left[1] < right[0] for left, right in zip(widest, widest[1:], strict=False))
+
+
+def test_layout_routes_long_edges_around_intermediate_layers() -> None:
+    model = GraphModel(
+        nodes=[GraphNode(node_id=node_id, label=node_id) for node_id in ("A", "B", "C")],
+        edges=[
+            GraphEdge(source_node_id="A", target_node_id="B"),
+            GraphEdge(source_node_id="B", target_node_id="C"),
+            GraphEdge(source_node_id="A", target_node_id="C"),
+            GraphEdge(source_node_id="C", target_node_id="A"),
+        ],
+        entry_nodes=["A"],
+        terminal_nodes=["C"],
+    )
+    layout = compute_layout(model)
+
+    assert layout.edge_route_x[0] is None
+    assert layout.edge_route_x[1] is None
+    assert layout.edge_route_x[2] is not None
+    assert layout.edge_route_x[3] is not None
+
+
+def test_layout_is_deterministic() -> None:
+    graph = build_synthetic_graph("tree", 6)
+    first = build_graph_model(graph, layout=True).layout
+    second = build_graph_model(graph, layout=True).layout
+    assert first == second
@@ -0,0 +1,57 @@
+from __future__ import annotations
+
+import pytest
+
+from pydantic_graph_studio.retention import RetainedRun, RetentionPolicy, plan_evictions
+
+
+def _run(run_id: str, *, finished: bool, last_access: float, nbytes: int = 100, subscribers: int = 0) -> RetainedRun:
+    return RetainedRun(run_id, finished, subscribers, last_access, nbytes)
+
+
+def test_retention_policy_validates_limits() -> None:
+    with pytest.raises(ValueError):
+        RetentionPolicy(idle_ttl=-1)
+    with pytest.raises(ValueError):
+        RetentionPolicy(memory_budget=-1)
+    with pytest.raises(ValueError):
+        RetentionPolicy(reap_interval=0)
+
+
+def test_unwatched_runs_expire_after_their_ttl() -> None:
+    policy = RetentionPolicy(idle_ttl=60, finished_ttl=10, memory_budget=None)
+    runs = [
+        _run("idle", finished=False, last_access=0),
+        _run("watched", finished=False, last_access=0, subscribers=1),
+        _run("recent", finished=False, last_access=50),
+        _run("unread", finished=True, last_access=80),
+        _run("read", finished=True, last_access=95),
+    ]
+    assert plan_evictions(runs, policy, now=100) == [("idle", "idle"), ("unread", "expired")]
+
+
+def test_memory_budget_only_drops_finished_runs() -> None:
+    policy = RetentionPolicy(idle_ttl=None, finished_ttl=None, memory_budget=250)
+    runs = [
+        _run("active", finished=False, last_access=1),
+        _run("watched", finished=False, last_access=0, subscribers=1),
+        _run("newer", finished=True, last_access=5),
+        _run("older", finished=True, last_access=2),
+    ]
+    assert plan_evictions(runs, policy, now=10) == [("older", "memory"), ("newer", "memory")]
+    tight = RetentionPolicy(idle_ttl=None, finished_ttl=None, memory_budget=0)
+    assert [run_id for run_id, _reason in plan_evictions(runs, tight, now=10)] == ["older", "newer"]
+
+
+def test_max_finished_drops_the_least_recently_read_finished_runs() -> None:
+    policy = RetentionPolicy(idle_ttl=None, finished_ttl=None, memory_budget=None, max_finished=2)
+    runs = [
+        _run("active", finished=False, last_access=0),
+        _run("watched", finished=True, last_access=0, subscribers=1),
+        _run("oldest", finished=True, last_access=1),
+        _run("older", finished=True, last_access=2),
+        _run("newest", finished=True, last_access=3),
+    ]
+    assert plan_evictions(runs, policy, now=10) == [("oldest", "count"), ("older", "count")]
+    with pytest.raises(ValueError):
+        RetentionPolicy(max_finished=-1)
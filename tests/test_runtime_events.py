@@ -27,6 +27,15 @@ class Boom(BaseNode[None, None, int]):
         raise RuntimeError("boom")
 
 
+@dataclass
+class InnerCancel(BaseNode[None, None, int]):
+    async def run(self, ctx: GraphRunContext) -> End[int]:
+        lookup = asyncio.create_task(asyncio.sleep(10))
+        lookup.cancel()
+        await lookup
+        return End(1)
+
+
 @dataclass
 class AskApproval(BaseNode[None, None, int]):
     async def run(self, ctx: GraphRunContext) -> End[int]:
@@ -86,6 +95,15 @@ def test_iter_run_events_error_emits_error_event() -> None:
     assert "run_end" not in event_types
 
 
+def test_cancelled_error_raised_inside_a_node_is_a_failure() -> None:
+    graph = Graph[None, None, int](nodes=[InnerCancel])
+    events = _collect_events(graph, InnerCancel())
+
+    assert [event.event_type for event in events] == ["node_start", "error"]
+    assert events[-1].message == "CancelledError"
+    assert events[-1].node_id == InnerCancel.get_node_id()
+
+
 def test_iter_run_events_interactive_input() -> None:
     nodes: list[type[BaseNode[None, None, int]]] = [AskApproval]
     graph = Graph[None, None, int](nodes=nodes)
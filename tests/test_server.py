@@ -1,15 +1,31 @@
 from __future__ import annotations
 
+import asyncio
 import json
+import re
 import time
 from dataclasses import dataclass
+from pathlib import Path
 from typing import Any, cast
 
+import pytest
 from fastapi.testclient import TestClient
 from pydantic_graph import BaseNode, End, Graph, GraphRunContext
-
+from pydantic_graph.beta.graph_builder import GraphBuilder
+from pydantic_graph.beta.step import StepContext
+
+from pydantic_graph_studio import server
+from pydantic_graph_studio.admission import AdmissionPolicy
+from pydantic_graph_studio.blobs import BlobStore
+from pydantic_graph_studio.examples.synthetic import build_synthetic_graph
+from pydantic_graph_studio.factories import ResourcePool, RunFactories
+from pydantic_graph_studio.history import RunHistoryStore
+from pydantic_graph_studio.retention import RetentionPolicy
 from pydantic_graph_studio.runtime import resolve_interaction
-from pydantic_graph_studio.server import create_app
+from pydantic_graph_studio.server import RunRegistry, _follow, create_app
+from pydantic_graph_studio.snapshot import KEYFRAME_INTERVAL
+from pydantic_graph_studio.static import IMMUTABLE_CACHE_CONTROL
+from pydantic_graph_studio.wire import CompactDecoder, decode_records
 
 
 @dataclass
@@ -37,6 +53,45 @@ class AwaitApproval(BaseNode[None, None, int]):
         return End(1 if choice == "yes" else 0)
 
 
+@dataclass
+class CallTools(BaseNode[None, None, int]):
+    async def run(self, ctx: GraphRunContext) -> End[int]:
+        interaction = resolve_interaction(ctx.deps)
+        assert interaction is not None
+        for index in range(5):
+            call_id = await interaction.emit_tool_call(
+                node_id=self.get_node_id(),
+                tool_name="lookup",
+                arguments={"index": index},
+            )
+            await interaction.emit_tool_result(
+                node_id=self.get_node_id(),
+                tool_name="lookup",
+                call_id=call_id,
+                output=index * 10,
+            )
+        return End(5)
+
+
+@dataclass
+class Pause(BaseNode[None, None, int]):
+    async def run(self, ctx: GraphRunContext) -> End[int]:
+        await asyncio.sleep(0.2)
+        return End(1)
+
+
+@dataclass
+class Counter:
+    visits: int = 0
+
+
+@dataclass
+class CountVisit(BaseNode[Counter, None, int]):
+    async def run(self, ctx: GraphRunContext[Counter]) -> End[int]:
+        ctx.state.visits += 1
+        return End(ctx.state.visits)
+
+
 def _make_client() -> TestClient:
     nodes: list[type[BaseNode[None, None, int]]] = [Start, Next]
     graph = Graph[None, None, int](nodes=nodes)
@@ -61,6 +116,31 @@ def test_api_graph_returns_payload() -> None:
         assert payload["entry_nodes"] == [Start.get_node_id()]
 
 
+def test_api_graph_includes_layout_on_request() -> None:
+    with _make_client() as client:
+        assert client.get("/api/graph").json()["layout"] is None
+
+        payload = client.get("/api/graph?layout=true").json()
+        positioned = {node["node_id"] for node in payload["layout"]["nodes"]}
+        assert positioned == {node["node_id"] for node in payload["nodes"]}
+
+
+def test_api_graph_supports_etag_revalidation() -> None:
+    with _make_client() as client:
+        response = client.get("/api/graph")
+        etag = response.headers.get("etag")
+        assert etag
+
+        cached = client.get("/api/graph", headers={"If-None-Match": etag})
+        assert cached.status_code == 304
+        assert cached.content == b""
+        assert cached.headers.get("etag") == etag
+
+        stale = client.get("/api/graph", headers={"If-None-Match": '"stale"'})
+        assert stale.status_code == 200
+        assert stale.json() == response.json()
+
+
 def test_start_run_and_stream_events() -> None:
     with _make_client() as client:
         run_response = client.post("/api/run")
@@ -94,6 +174,141 @@ def test_start_run_and_stream_events() -> None:
         assert {event["run_id"] for event in events} == {run_id}
 
 
+def test_compact_wire_mode_interns_node_ids() -> None:
+    graph = build_synthetic_graph("loop", 50, beta=True)
+    with TestClient(create_app(graph, None)) as client:
+        run_id = client.post("/api/run").json()["run_id"]
+        plain = client.get(f"/api/events?run_id={run_id}")
+        compact = client.get(f"/api/events?run_id={run_id}&wire=compact")
+        assert client.get(f"/api/events?run_id={run_id}&wire=xml").status_code == 422
+
+    frames = [json.loads(line[len("data: ") :]) for line in compact.text.splitlines() if line.startswith("data: ")]
+    assert frames[0]["d"]["r"] == run_id
+    decoder = CompactDecoder()
+    decoded = [event for frame in frames if (event := decoder.decode(frame)) is not None]
+    expected = [line[len("data: ") :] for line in plain.text.splitlines() if line.startswith("data: ")]
+    assert [event.model_dump(mode="json") for event in decoded] == [json.loads(line) for line in expected]
+    assert _sse_ids(compact.text) == _sse_ids(plain.text)
+    assert len(compact.content) * 3 < len(plain.content)
+
+
+def _sse_ids(text: str) -> list[int]:
+    return [int(line[len("id: ") :]) for line in text.splitlines() if line.startswith("id: ")]
+
+
+def test_event_streams_are_compressed_on_request() -> None:
+    nodes: list[type[BaseNode[None, None, int]]] = [Start, Next]
+    graph = Graph[None, None, int](nodes=nodes)
+    with TestClient(create_app(graph, Start())) as client:
+        run_id = client.post("/api/run").json()["run_id"]
+        plain = client.get(f"/api/events?run_id={run_id}", headers={"Accept-Encoding": "identity"})
+        for encoding in ("gzip", "deflate"):
+            response = client.get(f"/api/events?run_id={run_id}", headers={"Accept-Encoding": encoding})
+            assert response.headers["content-encoding"] == encoding
+            assert response.headers["vary"] == "Accept-Encoding"
+            assert response.text == plain.text
+        assert "content-encoding" not in plain.headers
+
+    with TestClient(create_app(graph, Start(), compression=None)) as client:
+        run_id = client.post("/api/run").json()["run_id"]
+        response = client.get(f"/api/events?run_id={run_id}", headers={"Accept-Encoding": "gzip"})
+        assert "content-encoding" not in response.headers
+
+
+def test_idle_event_streams_send_heartbeat_comments() -> None:
+    graph = Graph[None, None, int](nodes=[Pause])
+    with TestClient(create_app(graph, Pause(), heartbeat_interval=0.02)) as client:
+        run_id = client.post("/api/run").json()["run_id"]
+        response = client.get(f"/api/events?run_id={run_id}")
+        assert response.headers["x-accel-buffering"] == "no"
+        assert response.text.count(": heartbeat\n\n") >= 3
+        assert [event_type for _seq, event_type in _sse_events(response.text)] == ["node_start", "node_end", "run_end"]
+
+
+def test_stream_multiplexes_listed_runs() -> None:
+    with _make_client() as client:
+        first = client.post("/api/run").json()["run_id"]
+        second = client.post("/api/run").json()["run_id"]
+        response = client.get(f"/api/stream?runs={first},{second}")
+        assert response.status_code == 200
+        messages = _sse_messages(response.text)
+
+        for run_id in (first, second):
+            own = [message for message in messages if message["run_id"] == run_id]
+            assert own[0] == {"type": "run_started", "run_id": run_id, "seq": 0}
+            assert own[-1] == {"type": "run_finished", "run_id": run_id, "seq": 6, "status": "completed"}
+            assert [message["seq"] for message in own[1:-1]] == [1, 2, 3, 4, 5, 6]
+            assert all(message["event"]["run_id"] == run_id for message in own[1:-1])
+
+        filtered = _sse_messages(client.get(f"/api/stream?runs={first}&event_type=node_start&node_id=Next").text)
+        assert [message["type"] for message in filtered] == ["run_started", "event", "run_finished"]
+        assert filtered[1]["event"] == {"run_id": first, "event_type": "node_start", "node_id": "Next"}
+
+        tailed = _sse_messages(client.get(f"/api/stream?runs={first}&tail=true").text)
+        assert [message["type"] for message in tailed] == ["run_started", "run_finished"]
+        assert tailed[0]["seq"] == 6
+
+        assert client.get("/api/stream").status_code == 400
+        assert client.get(f"/api/stream?runs={first}&event_type=bogus").status_code == 400
+        assert client.get("/api/stream?runs=missing").status_code == 404
+
+
+def test_stream_all_follows_runs_started_while_connected() -> None:
+    nodes: list[type[BaseNode[None, None, int]]] = [Start, Next]
+    app = create_app(Graph[None, None, int](nodes=nodes), Start())
+
+    async def scenario() -> list[dict[str, Any]]:
+        async with app.router.lifespan_context(app):
+            received: asyncio.Queue[bytes] = asyncio.Queue()
+            disconnected = asyncio.Event()
+
+            async def receive() -> dict[str, Any]:
+                await disconnected.wait()
+                return {"type": "http.disconnect"}
+
+            async def send(message: dict[str, Any]) -> None:
+                if message["type"] == "http.response.body":
+                    received.put_nowait(message.get("body", b""))
+
+            scope = {
+                "type": "http",
+                "asgi": {"version": "3.0"},
+                "http_version": "1.1",
+                "method": "GET",
+                "scheme": "http",
+                "path": "/api/stream",
+                "raw_path": b"/api/stream",
+                "query_string": b"all=1",
+                "root_path": "",
+                "headers": [],
+                "client": ("test", 1),
+                "server": ("test", 80),
+                "app": app,
+            }
+            request = asyncio.create_task(app(scope, receive, send))
+            await asyncio.sleep(0.05)
+            run_id = await app.state.registry.start_run(app.state.graph, app.state.start_node)
+
+            text = ""
+            while '"run_finished"' not in text:
+                text += (await asyncio.wait_for(received.get(), timeout=2.0)).decode()
+            disconnected.set()
+            await asyncio.wait_for(request, timeout=2.0)
+            messages = _sse_messages(text)
+            assert {message["run_id"] for message in messages} == {run_id}
+            return messages
+
+    messages = asyncio.run(scenario())
+    assert messages[0]["type"] == "run_started"
+    assert messages[-1]["type"] == "run_finished"
+    assert len(messages) == 8
+
+
+def _sse_messages(text: str) -> list[dict[str, Any]]:
+    messages = [json.loads(line[len("data: ") :]) for line in text.splitlines() if line.startswith("data: ")]
+    return [{**message, "run_id": message.get("run_id") or message["event"]["run_id"]} for message in messages]
+
+
 def test_events_unknown_run_id_returns_404() -> None:
     with _make_client() as client:
         response = client.get("/api/events?run_id=missing")
@@ -166,8 +381,573 @@ def test_interactive_input_flow() -> None:
         assert event_types[-1] == "run_end"
 
 
+def _pending_request(client: TestClient, run_id: str) -> str:
+    deadline = time.monotonic() + 2.0
+    while time.monotonic() < deadline:
+        pending = client.get(f"/api/runs/{run_id}/snapshot").json()["pending_inputs"]
+        if pending:
+            return pending[0]["request_id"]
+        time.sleep(0.01)
+    raise AssertionError(f"Run {run_id} never requested input")
+
+
+def test_runs_beyond_the_limit_queue_and_are_rejected_once_the_queue_is_full() -> None:
+    graph = Graph[None, None, int](nodes=[AwaitApproval])
+    app = create_app(graph, AwaitApproval(), admission=AdmissionPolicy(max_running=1, max_queued=1))
+    with TestClient(app) as client:
+        first = client.post("/api/run").json()["run_id"]
+        second = client.post("/api/run").json()["run_id"]
+        rejected = client.post("/api/run")
+        assert rejected.status_code == 429
+        assert int(rejected.headers["Retry-After"]) >= 1
+        assert client.post("/api/run?priority=urgent").status_code == 400
+
+        first_request = _pending_request(client, first)
+        assert client.get(f"/api/runs/{second}/snapshot").json()["status"] == "queued"
+        metrics = client.get("/api/metrics").json()
+        assert metrics["active_runs"] == 2
+        assert metrics["admission"]["running"] == 1
+        assert metrics["admission"]["queued"] == 1
+        assert metrics["admission"]["rejected_total"] == 1
+
+        client.post("/api/input", json={"run_id": first, "request_id": first_request, "response": "yes"})
+        second_request = _pending_request(client, second)
+        client.post("/api/input", json={"run_id": second, "request_id": second_request, "response": "no"})
+        response = client.get(f"/api/events?run_id={second}")
+        event_types = [event_type for _seq, event_type in _sse_events(response.text)]
+        assert event_types[:2] == ["run_queued", "run_admitted"]
+        assert event_types[-1] == "run_end"
+
+        metrics = client.get("/api/metrics").json()["admission"]
+        assert metrics["admitted_total"] == 2
+        assert metrics["queued_total"] == 1
+
+
+def test_reaper_evicts_runs_nobody_subscribes_to() -> None:
+    graph = Graph[None, None, int](nodes=[AwaitApproval])
+    retention = RetentionPolicy(idle_ttl=0.05, reap_interval=0.01)
+    with TestClient(create_app(graph, AwaitApproval(), retention=retention)) as client:
+        run_id = client.post("/api/run").json()["run_id"]
+        deadline = time.monotonic() + 2.0
+        metrics = client.get("/api/metrics").json()
+        while metrics["evictions"]["idle"] == 0 and time.monotonic() < deadline:
+            time.sleep(0.01)
+            metrics = client.get("/api/metrics").json()
+
+        assert metrics["evictions"] == {"idle": 1, "expired": 0, "count": 0, "memory": 0}
+        assert metrics["active_runs"] == 0
+        assert client.get(f"/api/runs/{run_id}/snapshot").status_code == 404
+
+
+def test_finished_runs_are_kept_until_the_retention_policy_drops_them() -> None:
+    with _make_client() as client:
+        run_ids = [client.post("/api/run").json()["run_id"] for _ in range(40)]
+        for run_id in run_ids:
+            client.get(f"/api/events?run_id={run_id}")
+        assert _sse_events(client.get(f"/api/events?run_id={run_ids[0]}").text)[-1][1] == "run_end"
+        metrics = client.get("/api/metrics").json()
+        assert metrics["finished_runs"] == 40
+        assert sum(metrics["evictions"].values()) == 0
+
+    graph = Graph[None, None, int](nodes=[Start, Next])
+    retention = RetentionPolicy(max_finished=5, reap_interval=0.01)
+    with TestClient(create_app(graph, Start(), retention=retention)) as client:
+        run_ids = [client.post("/api/run").json()["run_id"] for _ in range(8)]
+        for run_id in run_ids:
+            client.get(f"/api/events?run_id={run_id}")
+        deadline = time.monotonic() + 2.0
+        metrics = client.get("/api/metrics").json()
+        while metrics["evictions"]["count"] < 3 and time.monotonic() < deadline:
+            time.sleep(0.01)
+            metrics = client.get("/api/metrics").json()
+        assert metrics["evictions"]["count"] == 3
+        assert metrics["finished_runs"] == 5
+
+
+def test_delete_cancels_a_run_with_a_terminal_event() -> None:
+    with _make_interactive_client() as client:
+        run_id = client.post("/api/run").json()["run_id"]
+        _pending_request(client, run_id)
+
+        response = client.delete(f"/api/runs/{run_id}")
+        assert response.status_code == 200
+        assert response.json() == {"run_id": run_id, "status": "cancelled"}
+        events = client.get(f"/api/events?run_id={run_id}").text
+        last = json.loads([line for line in events.splitlines() if line.startswith("data: ")][-1][len("data: ") :])
+        assert last == {"run_id": run_id, "event_type": "cancelled", "reason": "requested"}
+        assert client.get(f"/api/runs/{run_id}/snapshot").json()["status"] == "cancelled"
+
+        assert client.delete(f"/api/runs/{run_id}").status_code == 409
+        assert client.delete("/api/runs/missing").status_code == 404
+
+
+def test_runs_are_cancelled_once_their_last_subscriber_is_gone() -> None:
+    async def scenario() -> None:
+        graph = Graph[None, None, int](nodes=[AwaitApproval])
+        registry = RunRegistry(retention=RetentionPolicy(abandon_grace=0.05))
+        run_state = await registry.find(await registry.start_run(graph, AwaitApproval()))
+        assert run_state is not None
+
+        stream = _follow(run_state, 0)
+        await anext(stream)
+        await stream.aclose()
+        resumed = _follow(run_state, 0)
+        await anext(resumed)
+        await asyncio.sleep(0.1)
+        assert not run_state.done.is_set()
+
+        await resumed.aclose()
+        await asyncio.wait_for(run_state.done.wait(), timeout=2.0)
+        assert run_state.reducer.status == "cancelled"
+        assert run_state.trace[-1].model_dump() == {
+            "run_id": run_state.run_id,
+            "event_type": "cancelled",
+            "reason": "abandoned",
+        }
+        await registry.shutdown()
+
+    asyncio.run(scenario())
+
+
+def test_factories_give_every_run_its_own_state_and_pooled_deps() -> None:
+    graph = Graph[Counter, None, int](nodes=[CountVisit])
+    shared = Counter()
+    pool = ResourcePool(object, max_size=1)
+    factories = RunFactories(state=Counter, deps=pool)
+    with TestClient(create_app(graph, CountVisit(), state=shared, factories=factories)) as client:
+        run_ids = [client.post("/api/run").json()["run_id"] for _ in range(3)]
+        for run_id in run_ids:
+            assert _sse_events(client.get(f"/api/events?run_id={run_id}").text)[-1][1] == "run_end"
+        assert shared.visits == 0
+        assert pool.idle == 1
+
+    failing = RunFactories(deps=lambda: 1 / 0)
+    with TestClient(create_app(graph, CountVisit(), factories=failing)) as client:
+        run_id = client.post("/api/run").json()["run_id"]
+        client.get(f"/api/events?run_id={run_id}")
+        snapshot = client.get(f"/api/runs/{run_id}/snapshot").json()
+        assert snapshot["status"] == "failed"
+        assert "division by zero" in snapshot["error"]
+
+
+def _index(message: dict[str, Any]) -> int:
+    return message["index"]
+
+
+def test_batch_runs_are_not_evicted_as_idle() -> None:
+    graph = Graph[None, None, int](nodes=[Pause])
+    retention = RetentionPolicy(idle_ttl=0.05, reap_interval=0.01)
+    app = create_app(graph, Pause(), retention=retention, admission=AdmissionPolicy(max_running=1))
+    with TestClient(app) as client:
+        batch_id = client.post("/api/runs/batch", json={"items": [{}, {}], "concurrency": 2}).json()["batch_id"]
+        client.get(f"/api/runs/batch/{batch_id}/stream")
+
+        progress = client.get(f"/api/runs/batch/{batch_id}").json()
+        assert [run["status"] for run in progress["runs"]] == ["completed", "completed"]
+        assert client.get("/api/metrics").json()["evictions"]["idle"] == 0
+
+
+def test_batch_reports_the_output_of_beta_graph_runs() -> None:
+    builder: GraphBuilder[None, None, int, int] = GraphBuilder()
+
+    @builder.step(node_id="Double")
+    async def double(ctx: StepContext[None, None, int]) -> int:
+        return ctx.inputs * 2
+
+    builder.add(builder.edge_from(builder.start_node).to(double))
+    builder.add_edge(double, builder.end_node)
+
+    with TestClient(create_app(builder.build(), None)) as client:
+        items = [{"inputs": value} for value in (1, 2, 3)]
+        batch_id = client.post("/api/runs/batch", json={"items": items}).json()["batch_id"]
+        client.get(f"/api/runs/batch/{batch_id}/stream")
+        runs = client.get(f"/api/runs/batch/{batch_id}").json()["runs"]
+        assert [run["status"] for run in runs] == ["completed"] * 3
+        assert [client.get(f"/api/blobs/{run['output']['$blob']}").json() for run in runs] == [2, 4, 6]
+
+
+def test_batch_runs_items_with_their_own_state_and_streams_summaries() -> None:
+    graph = Graph[Counter, None, int](nodes=[CountVisit])
+    app = create_app(graph, CountVisit(), state=Counter(), admission=AdmissionPolicy(max_running=1, max_queued=1))
+    with TestClient(app) as client:
+        items = [{"state": {"visits": visits}} for visits in (0, 10, 20)]
+        started = client.post("/api/runs/batch", json={"items": items, "concurrency": 2})
+        assert started.status_code == 200
+        batch_id = started.json()["batch_id"]
+        assert started.json()["total"] == 3
+
+        stream = client.get(f"/api/runs/batch/{batch_id}/stream").text
+        messages = [json.loads(line[len("data: ") :]) for line in stream.splitlines() if line.startswith("data: ")]
+        finished = sorted((message for message in messages if message["type"] == "run_finished"), key=_index)
+        assert [summary["status"] for summary in finished] == ["completed"] * 3
+        assert all(summary["duration"] >= 0 for summary in finished)
+        outputs = [client.get(f"/api/blobs/{summary['output']['$blob']}").json() for summary in finished]
+        assert outputs == [1, 11, 21]
+        assert messages[-1]["type"] == "batch_finished"
+        assert messages[-1]["completed"] == 3
+
+        progress = client.get(f"/api/runs/batch/{batch_id}").json()
+        assert progress["done"] is True
+        assert [run["run_id"] for run in progress["runs"]] == [summary["run_id"] for summary in finished]
+
+        assert client.post("/api/runs/batch", json={"items": [{"state": {"visits": "many"}}]}).status_code == 400
+        assert client.post("/api/runs/batch", json={"items": [{}], "priority": "urgent"}).status_code == 400
+        assert client.post("/api/runs/batch", json={"items": []}).status_code == 422
+        assert client.get("/api/runs/batch/missing").status_code == 404
+
+
+def test_websocket_streams_binary_events() -> None:
+    with _make_client() as client, client.websocket_connect("/api/ws") as socket:
+        hello = socket.receive_json()
+        assert hello["type"] == "hello"
+        assert hello["format"] == "binary"
+        assert hello["nodes"] == ["Next", "Start"]
+
+        run_id = client.post("/api/run").json()["run_id"]
+        socket.send_json({"type": "subscribe", "run_id": run_id})
+        subscribed = socket.receive_json()
+        assert subscribed == {"type": "subscribed", "channel": 0, "run_id": run_id}
+
+        events: list[Any] = []
+        while True:
+            message = socket.receive()
+            if message.get("bytes") is not None:
+                events.extend(decode_records(message["bytes"], hello["nodes"], {0: run_id}))
+                continue
+            end = json.loads(message["text"])
+            assert end["type"] == "end"
+            break
+
+    assert [seq for _channel, seq, _event in events] == list(range(1, len(events) + 1))
+    assert end["seq"] == len(events)
+    assert [event.event_type for _channel, _seq, event in events] == [
+        "node_start",
+        "node_end",
+        "edge_taken",
+        "node_start",
+        "node_end",
+        "run_end",
+    ]
+    assert all(event.run_id == run_id for _channel, _seq, event in events)
+
+
+def test_websocket_json_fallback_answers_input_requests() -> None:
+    with _make_interactive_client() as client, client.websocket_connect("/api/ws?format=json") as socket:
+        assert socket.receive_json()["format"] == "json"
+        run_id = client.post("/api/run").json()["run_id"]
+        socket.send_json({"type": "subscribe", "run_id": run_id})
+        assert socket.receive_json()["type"] == "subscribed"
+
+        event_types: list[str] = []
+        while True:
+            message = socket.receive_json()
+            if message["type"] == "end":
+                break
+            if message["type"] == "input_ack":
+                assert message["accepted"] is True
+                continue
+            for item in message["events"]:
+                event = item["event"]
+                event_types.append(event["event_type"])
+                if event["event_type"] == "input_request":
+                    socket.send_json(
+                        {"type": "input", "run_id": run_id, "request_id": event["request_id"], "response": "yes"}
+                    )
+
+        assert "input_response" in event_types
+        assert event_types[-1] == "run_end"
+
+        socket.send_json({"type": "input", "run_id": run_id, "request_id": "missing", "response": "yes"})
+        ack = socket.receive_json()
+        assert ack["accepted"] is False
+        socket.send_json({"type": "subscribe", "run_id": "unknown"})
+        assert socket.receive_json() == {"type": "error", "run_id": "unknown", "detail": "Unknown run_id"}
+        socket.send_text("not json")
+        assert socket.receive_json()["type"] == "error"
+
+
+def test_websocket_channels_wrap_around_without_reusing_open_ones(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(server, "SOCKET_CHANNEL_LIMIT", 2)
+    with _make_interactive_client() as client, client.websocket_connect("/api/ws?format=json") as socket:
+        socket.receive_json()
+
+        def subscribe(run_id: str) -> dict[str, Any]:
+            socket.send_json({"type": "subscribe", "run_id": run_id})
+            while (message := socket.receive_json())["type"] == "events":
+                pass
+            return message
+
+        # Every run waits for approval, so its channel stays open until it is unsubscribed.
+        run_ids = [client.post("/api/run").json()["run_id"] for _ in range(4)]
+        assert subscribe(run_ids[0])["channel"] == 0
+        assert subscribe(run_ids[1])["channel"] == 1
+        socket.send_json({"type": "unsubscribe", "channel": 1})
+        assert subscribe(run_ids[2])["channel"] == 1
+        assert subscribe(run_ids[3]) == {"type": "error", "run_id": run_ids[3], "detail": "Too many open channels"}
+
+
+def test_tool_activity_is_paged_after_the_stream_ends() -> None:
+    nodes: list[type[BaseNode[None, None, int]]] = [CallTools]
+    graph = Graph[None, None, int](nodes=nodes)
+    with TestClient(create_app(graph, CallTools())) as client:
+        run_id = client.post("/api/run").json()["run_id"]
+        with client.stream("GET", f"/api/events?run_id={run_id}") as response:
+            for _line in response.iter_lines():
+                pass
+
+        page = client.get(f"/api/runs/{run_id}/tools?offset=1&limit=2").json()
+        assert page["run_id"] == run_id
+        assert page["total"] == 5
+        assert page["offset"] == 1
+        assert [item["index"] for item in page["items"]] == [1, 2]
+        assert [item["arguments"] for item in page["items"]] == [{"index": 1}, {"index": 2}]
+        assert [item["output"] for item in page["items"]] == [10, 20]
+        assert all(item["completed"] and item["success"] for item in page["items"])
+
+        assert client.get(f"/api/runs/{run_id}/tools?offset=10").json()["items"] == []
+        assert client.get(f"/api/runs/{run_id}/tools?limit=0").status_code == 422
+        assert client.get("/api/runs/unknown/tools").status_code == 404
+
+
+def test_large_tool_payloads_are_served_from_the_blob_store() -> None:
+    nodes: list[type[BaseNode[None, None, int]]] = [CallTools]
+    graph = Graph[None, None, int](nodes=nodes)
+    with TestClient(create_app(graph, CallTools(), blobs=BlobStore(threshold=8))) as client:
+        run_id = client.post("/api/run").json()["run_id"]
+        with client.stream("GET", f"/api/events?run_id={run_id}") as response:
+            events = [json.loads(line[6:]) for line in response.iter_lines() if line.startswith("data: ")]
+
+        calls = [event for event in events if event["event_type"] == "tool_call"]
+        results = [event for event in events if event["event_type"] == "tool_result"]
+        ref = calls[1]["arguments"]
+        assert set(ref) == {"$blob", "size", "preview"}
+        assert ref["size"] == len(b'{"index":1}')
+        assert [result["output"] for result in results] == [0, 10, 20, 30, 40]
+
+        page = client.get(f"/api/runs/{run_id}/tools?offset=1&limit=1").json()
+        assert page["items"][0]["arguments"] == ref
+
+        blob = client.get(f"/api/blobs/{ref['$blob']}")
+        assert blob.status_code == 200
+        assert blob.json() == {"index": 1}
+        assert blob.headers["cache-control"] == IMMUTABLE_CACHE_CONTROL
+        revalidated = client.get(f"/api/blobs/{ref['$blob']}", headers={"If-None-Match": blob.headers["etag"]})
+        assert revalidated.status_code == 304
+        assert client.get(f"/api/blobs/{'0' * 64}").status_code == 404
+        assert client.get("/api/blobs/not-a-hash").status_code == 404
+
+
+def test_snapshot_lets_a_late_client_resume_the_stream() -> None:
+    with _make_interactive_client() as client:
+        run_id = client.post("/api/run").json()["run_id"]
+
+        deadline = time.monotonic() + 2.0
+        snapshot: dict[str, Any] = {}
+        while time.monotonic() < deadline:
+            snapshot = client.get(f"/api/runs/{run_id}/snapshot").json()
+            if snapshot["pending_inputs"]:
+                break
+            time.sleep(0.01)
+
+        node_id = AwaitApproval.get_node_id()
+        assert snapshot["status"] == "running"
+        assert snapshot["node_status"] == {node_id: "active"}
+        assert snapshot["visit_counts"] == {node_id: 1}
+        request_id = snapshot["pending_inputs"][0]["request_id"]
+        client.post("/api/input", json={"run_id": run_id, "request_id": request_id, "response": "yes"})
+
+        ids: list[int] = []
+        event_types: list[str] = []
+        with client.stream("GET", f"/api/events?run_id={run_id}&after={snapshot['seq']}") as response:
+            for line in response.iter_lines():
+                if line.startswith("id: "):
+                    ids.append(int(line[len("id: ") :]))
+                elif line.startswith("data: "):
+                    event_types.append(json.loads(line[len("data: ") :])["event_type"])
+
+        assert event_types == ["input_response", "node_end", "run_end"]
+        assert ids == [snapshot["seq"] + 1, snapshot["seq"] + 2, snapshot["seq"] + 3]
+
+        final = client.get(f"/api/runs/{run_id}/snapshot").json()
+        assert (final["seq"], final["status"], final["pending_inputs"]) == (ids[-1], "completed", [])
+
+        resumed = client.get(f"/api/events?run_id={run_id}", headers={"Last-Event-ID": str(ids[-2])})
+        data_lines = [line for line in resumed.text.splitlines() if line.startswith("data: ")]
+        assert [json.loads(line[len("data: ") :])["event_type"] for line in data_lines] == ["run_end"]
+        assert client.get("/api/runs/unknown/snapshot").status_code == 404
+
+
+def test_history_records_runs_after_their_stream_ends(tmp_path: Path) -> None:
+    nodes: list[type[BaseNode[None, None, int]]] = [Start, Next]
+    graph = Graph[None, None, int](nodes=nodes)
+    store = RunHistoryStore(tmp_path / "history.db")
+    with TestClient(create_app(graph, Start(), history=store)) as client:
+        run_ids = []
+        for _ in range(3):
+            run_id = client.post("/api/run").json()["run_id"]
+            with client.stream("GET", f"/api/events?run_id={run_id}") as response:
+                for _line in response.iter_lines():
+                    pass
+            run_ids.append(run_id)
+        store.flush()
+
+        listing = client.get("/api/history/runs?limit=2").json()
+        assert listing["total"] == 3
+        assert [item["run_id"] for item in listing["items"]] == run_ids[::-1][:2]
+        assert {item["status"] for item in listing["items"]} == {"completed"}
+        assert listing["items"][0]["event_count"] == 6
+
+        found = client.get(f"/api/history/runs/search?status=completed&node_id={Next.get_node_id()}&offset=2").json()
+        assert (found["total"], found["offset"]) == (3, 2)
+        assert [item["run_id"] for item in found["items"]] == run_ids[:1]
+        assert client.get("/api/history/runs/search?status=failed").json()["total"] == 0
+        assert client.get("/api/history/runs?limit=0").status_code == 422
+
+    with _make_client() as client:
+        assert client.get("/api/history/runs").status_code == 404
+
+
+def _sse_events(text: str) -> list[tuple[int, str]]:
+    ids = [int(line[len("id: ") :]) for line in text.splitlines() if line.startswith("id: ")]
+    types = [json.loads(line[len("data: ") :])["event_type"] for line in text.splitlines() if line.startswith("data: ")]
+    return list(zip(ids, types, strict=True))
+
+
+def test_replay_reemits_a_finished_run(tmp_path: Path) -> None:
+    nodes: list[type[BaseNode[None, None, int]]] = [Start, Next]
+    graph = Graph[None, None, int](nodes=nodes)
+    store = RunHistoryStore(tmp_path / "history.db")
+    with TestClient(create_app(graph, Start(), history=store)) as client:
+        run_id = client.post("/api/run").json()["run_id"]
+        live = client.get(f"/api/events?run_id={run_id}")
+        store.flush()
+
+        replayed = client.get(f"/api/runs/{run_id}/replay?speed=max")
+        assert replayed.status_code == 200
+        assert replayed.headers["content-type"].startswith("text/event-stream")
+        assert _sse_events(replayed.text) == _sse_events(live.text)
+        assert client.get(f"/api/runs/{run_id}/replay?speed=1000").status_code == 200
+        assert client.get(f"/api/runs/{run_id}/replay?speed=0").status_code == 400
+        assert client.get(f"/api/runs/{run_id}/replay?speed=fast").status_code == 400
+        assert client.get("/api/runs/unknown/replay").status_code == 404
+
+    # A fresh server only has the history store to replay from.
+    with TestClient(create_app(graph, Start(), history=store)) as client:
+        replayed = client.get(f"/api/runs/{run_id}/replay?speed=max")
+        assert _sse_events(replayed.text) == _sse_events(live.text)
+
+
+def test_replay_rejects_runs_in_progress() -> None:
+    with _make_interactive_client() as client:
+        run_id = client.post("/api/run").json()["run_id"]
+        assert client.get(f"/api/runs/{run_id}/replay").status_code == 409
+
+
+def test_run_state_seeks_to_any_sequence_number(tmp_path: Path) -> None:
+    graph = build_synthetic_graph("loop", 200, beta=True)
+    store = RunHistoryStore(tmp_path / "history.db")
+    with TestClient(create_app(graph, None, history=store)) as client:
+        run_id = client.post("/api/run").json()["run_id"]
+        client.get(f"/api/events?run_id={run_id}")
+        store.flush()
+
+        final = client.get(f"/api/runs/{run_id}/state").json()
+        assert final["seq"] > 2 * KEYFRAME_INTERVAL
+        assert final == client.get(f"/api/runs/{run_id}/snapshot").json()
+        assert client.get(f"/api/runs/{run_id}/state?seq=100000").json() == final
+
+        early = client.get(f"/api/runs/{run_id}/state?seq=1").json()
+        assert (early["seq"], early["progress"]["nodes_started"]) == (1, 1)
+        middle = client.get(f"/api/runs/{run_id}/state?seq={KEYFRAME_INTERVAL + 3}").json()
+        assert middle["seq"] == KEYFRAME_INTERVAL + 3
+        assert middle["status"] == "running"
+        assert client.get(f"/api/runs/{run_id}/state?seq=-1").status_code == 422
+        assert client.get("/api/runs/unknown/state").status_code == 404
+
+    with TestClient(create_app(graph, None, history=store)) as client:
+        assert client.get(f"/api/runs/{run_id}/state").json() == final
+        assert client.get(f"/api/runs/{run_id}/state?seq={KEYFRAME_INTERVAL + 3}").json() == middle
+
+
 def test_index_route_serves_html() -> None:
     with _make_client() as client:
         response = client.get("/")
         assert response.status_code == 200
         assert "<html" in response.text.lower()
+
+
+def test_index_references_content_hashed_assets() -> None:
+    with _make_client() as client:
+        html = client.get("/").text
+        urls = re.findall(r'(?:href|src)="(/assets/[^"]+)"', html)
+        assert urls
+        assert all("?v=" not in url for url in urls)
+
+        app_url = next(url for url in urls if url.startswith("/assets/app."))
+        response = client.get(app_url, headers={"Accept-Encoding": "gzip"})
+        assert response.status_code == 200
+        assert response.headers.get("content-encoding") == "gzip"
+        assert "immutable" in response.headers.get("cache-control", "")
+        assert response.headers.get("vary") == "Accept-Encoding"
+
+
+def test_index_points_the_event_worker_at_hashed_scripts() -> None:
+    with _make_client() as client:
+        html = client.get("/").text
+        worker_url = re.search(r'runWorker: "(/assets/run-worker\.[0-9a-f]{12}\.js)"', html)
+        state_url = re.search(r'runState: "(/assets/run-state\.[0-9a-f]{12}\.js)"', html)
+        wire_url = re.search(r'runWire: "(/assets/run-wire\.[0-9a-f]{12}\.js)"', html)
+        assert worker_url is not None
+        assert state_url is not None
+        assert wire_url is not None
+        for url in (worker_url.group(1), state_url.group(1), wire_url.group(1)):
+            response = client.get(url)
+            assert response.status_code == 200
+            assert response.headers["content-type"].startswith(("text/javascript", "application/javascript"))
+
+
+def test_assets_fall_back_to_identity_and_revalidate() -> None:
+    with _make_client() as client:
+        response = client.get("/assets/app.js", headers={"Accept-Encoding": "identity"})
+        assert response.status_code == 200
+        assert "content-encoding" not in response.headers
+        assert response.headers.get("cache-control") == "no-cache"
+        assert response.text.startswith("(() =>")
+
+        etag = response.headers["etag"]
+        cached = client.get("/assets/app.js", headers={"If-None-Match": etag, "Accept-Encoding": "identity"})
+        assert cached.status_code == 304
+
+        gzipped = client.get("/assets/app.js", headers={"If-None-Match": etag, "Accept-Encoding": "gzip"})
+        assert gzipped.status_code == 200
+        assert gzipped.headers["content-encoding"] == "gzip"
+        assert gzipped.headers["etag"] == etag.removesuffix('"') + '-gzip"'
+        revalidated = client.get("/assets/app.js", headers={"If-None-Match": gzipped.headers["etag"]})
+        assert revalidated.status_code == 304
+
+        assert client.get("/assets/missing.js").status_code == 404
+
+
+def test_api_graph_view_expands_clusters_on_demand() -> None:
+    app = create_app(build_synthetic_graph("chain", 1000), None)
+    with TestClient(app) as client:
+        response = client.get("/api/graph/view?layout=true")
+        assert response.status_code == 200
+        view = response.json()
+        assert view["strategy"] == "module"
+        assert len(view["graph"]["nodes"]) == len(view["clusters"]) == 16
+        assert len(view["graph"]["layout"]["nodes"]) == 16
+
+        cluster_id = view["clusters"][0]["cluster_id"]
+        expanded = client.get("/api/graph/view", params={"expand": cluster_id}).json()
+        assert expanded["expanded"] == [cluster_id]
+        assert "Chain00000" in {node["node_id"] for node in expanded["graph"]["nodes"]}
+
+        cached = client.get("/api/graph/view?layout=true", headers={"If-None-Match": response.headers["etag"]})
+        assert cached.status_code == 304
+
+        located = client.get("/api/graph/clusters", params={"node_id": ["Chain00999", "missing"]}).json()
+        assert located["ancestors"] == {"Chain00999": [view["clusters"][-1]["cluster_id"]]}
+
+        assert client.get("/api/graph/view?strategy=region").status_code == 400
+        assert client.get("/api/graph/clusters?strategy=bogus").status_code == 400
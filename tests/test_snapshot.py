@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+from pydantic_graph_studio.schemas import (
+    EdgeTakenEvent,
+    ErrorEvent,
+    InputRequestEvent,
+    InputResponseEvent,
+    NodeEndEvent,
+    NodeStartEvent,
+    ToolCallEvent,
+    ToolResultEvent,
+)
+from pydantic_graph_studio.snapshot import RunReducer, state_at
+
+
+def test_run_reducer_tracks_progress_and_open_work() -> None:
+    reducer = RunReducer(run_id="run")
+    events = [
+        NodeStartEvent(run_id="run", event_type="node_start", node_id="A"),
+        NodeEndEvent(run_id="run", event_type="node_end", node_id="A"),
+        EdgeTakenEvent(run_id="run", event_type="edge_taken", source_node_id="A", target_node_id="A"),
+        NodeStartEvent(run_id="run", event_type="node_start", node_id="A"),
+        ToolCallEvent(run_id="run", event_type="tool_call", node_id="A", tool_name="t", call_id="1", arguments=1),
+        ToolCallEvent(run_id="run", event_type="tool_call", node_id="A", tool_name="t", call_id="2", arguments=2),
+        ToolResultEvent(run_id="run", event_type="tool_result", node_id="A", tool_name="t", call_id="1", output=3),
+        InputRequestEvent(
+            run_id="run",
+            event_type="input_request",
+            node_id="A",
+            request_id="r1",
+            prompt="ok?",
+            options=["yes"],
+        ),
+    ]
+    assert [reducer.apply(event) for event in events] == list(range(1, 9))
+
+    snapshot = reducer.snapshot()
+    assert snapshot.seq == 8
+    assert snapshot.status == "running"
+    assert snapshot.node_status == {"A": "active"}
+    assert snapshot.visit_counts == {"A": 2}
+    assert snapshot.last_edge is not None
+    assert (snapshot.last_edge.source_node_id, snapshot.last_edge.target_node_id) == ("A", "A")
+    assert [call.call_id for call in snapshot.open_tool_calls] == ["2"]
+    assert [request.request_id for request in snapshot.pending_inputs] == ["r1"]
+    assert snapshot.progress.model_dump() == {
+        "nodes_started": 2,
+        "nodes_finished": 1,
+        "edges_taken": 1,
+        "tool_calls": 2,
+        "tool_results": 1,
+    }
+
+    reducer.apply(
+        InputResponseEvent(run_id="run", event_type="input_response", node_id="A", request_id="r1", response="yes")
+    )
+    reducer.apply(ErrorEvent(run_id="run", event_type="error", message="boom", node_id="A"))
+    final = reducer.snapshot()
+    assert final.pending_inputs == []
+    assert (final.status, final.error, final.node_status) == ("failed", "boom", {"A": "error"})
+    # Earlier snapshots are detached copies.
+    assert snapshot.status == "running"
+    assert snapshot.progress.nodes_started == 2
+
+
+def test_state_at_resumes_from_a_keyframe() -> None:
+    events = []
+    for index in range(40):
+        node_id = f"N{index % 3}"
+        call_id = f"call-{index}"
+        events.append(NodeStartEvent(run_id="run", event_type="node_start", node_id=node_id))
+        events.append(
+            ToolCallEvent(
+                run_id="run",
+                event_type="tool_call",
+                node_id=node_id,
+                tool_name="t",
+                call_id=call_id,
+                arguments=index,
+            )
+        )
+        if index % 4:
+            events.append(
+                ToolResultEvent(
+                    run_id="run",
+                    event_type="tool_result",
+                    node_id=node_id,
+                    tool_name="t",
+                    call_id=call_id,
+                    output=index,
+                )
+            )
+        events.append(NodeEndEvent(run_id="run", event_type="node_end", node_id=node_id))
+
+    for split in (0, 1, 17, 64, len(events) - 1):
+        keyframe = state_at("run", None, events[:split]) if split else None
+        resumed = state_at("run", keyframe, events[split:])
+        assert resumed == state_at("run", None, events)
+    final = state_at("run", None, events)
+    assert final.tools_total == 40
+    assert [call.index for call in final.open_tool_calls] == [0, 4, 8, 12, 16, 20, 24, 28, 32, 36]
@@ -0,0 +1,53 @@
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from pydantic_graph_studio.cli import _resolve_start_node
+from pydantic_graph_studio.examples.synthetic import build_synthetic_graph
+from pydantic_graph_studio.introspection import build_graph_model
+from pydantic_graph_studio.runtime import iter_run_events
+
+
+def _event_types(graph) -> list[str]:
+    start_node = _resolve_start_node(graph, None)
+
+    async def _run() -> list[str]:
+        return [event.event_type async for event in iter_run_events(graph, start_node)]
+
+    return asyncio.run(_run())
+
+
+@pytest.mark.parametrize("beta", [False, True])
+def test_synthetic_chain_scales_with_size(beta: bool) -> None:
+    model = build_graph_model(build_synthetic_graph("chain", 200, beta=beta))
+    chain_nodes = [node for node in model.nodes if node.node_id.startswith("Chain")]
+    assert len(chain_nodes) == 200
+    assert len(model.entry_nodes) == 1
+
+
+@pytest.mark.parametrize("beta", [False, True])
+@pytest.mark.parametrize("shape", ["chain", "broadcast", "tree", "loop"])
+def test_synthetic_graphs_run_to_completion(shape: str, beta: bool) -> None:
+    event_types = _event_types(build_synthetic_graph(shape, 4, beta=beta))
+    assert event_types[-1] == "run_end"
+    assert "error" not in event_types
+
+
+def test_synthetic_tree_depth_controls_node_count() -> None:
+    model = build_graph_model(build_synthetic_graph("tree", 5))
+    assert len(model.nodes) == 2**5 - 1
+    assert len(model.terminal_nodes) == 2**4
+
+
+def test_synthetic_loop_runs_requested_iterations() -> None:
+    event_types = _event_types(build_synthetic_graph("loop", 25))
+    assert event_types.count("node_start") == 25 + 2
+
+
+def test_synthetic_rejects_invalid_arguments() -> None:
+    with pytest.raises(ValueError, match="Unknown synthetic shape"):
+        build_synthetic_graph("spiral", 10)
+    with pytest.raises(ValueError, match="at least 1"):
+        build_synthetic_graph("chain", 0)
@@ -0,0 +1,124 @@
+from __future__ import annotations
+
+import pytest
+
+from pydantic_graph_studio.schemas import (
+    EdgeTakenEvent,
+    ErrorEvent,
+    Event,
+    InputRequestEvent,
+    InputResponseEvent,
+    NodeEndEvent,
+    NodeStartEvent,
+    RunEndEvent,
+    ToolCallEvent,
+    ToolResultEvent,
+)
+from pydantic_graph_studio.trace import EVENT_TYPES, NO_NODE, RunTrace
+
+
+def _events() -> list[Event]:
+    return [
+        NodeStartEvent(run_id="run", event_type="node_start", node_id="Fetch"),
+        ToolCallEvent(
+            run_id="run",
+            event_type="tool_call",
+            node_id="Fetch",
+            tool_name="http",
+            call_id="c1",
+            arguments={"url": "https://example.com"},
+        ),
+        ToolResultEvent(
+            run_id="run",
+            event_type="tool_result",
+            node_id="Fetch",
+            tool_name="http",
+            call_id="c1",
+            output=[1, 2],
+            success=False,
+        ),
+        InputRequestEvent(
+            run_id="run",
+            event_type="input_request",
+            node_id="Fetch",
+            request_id="r1",
+            prompt="Retry?",
+            options=["yes", "no"],
+            context={"attempt": 1},
+        ),
+        InputResponseEvent(
+            run_id="run",
+            event_type="input_response",
+            node_id="Fetch",
+            request_id="r1",
+            response="yes",
+        ),
+        NodeEndEvent(run_id="run", event_type="node_end", node_id="Fetch"),
+        EdgeTakenEvent(run_id="run", event_type="edge_taken", source_node_id="Fetch", target_node_id="Parse"),
+        EdgeTakenEvent(run_id="run", event_type="edge_taken", source_node_id="Parse"),
+        ErrorEvent(run_id="run", event_type="error", message="boom"),
+        RunEndEvent(run_id="run", event_type="run_end"),
+    ]
+
+
+def test_run_trace_round_trips_every_event_type() -> None:
+    events = _events()
+    trace = RunTrace("run")
+    seqs = [trace.append(event, timestamp_ns=1_000_000_000 * index) for index, event in enumerate(events)]
+
+    assert seqs == list(range(1, len(events) + 1))
+    assert len(trace) == len(events)
+    assert [event.model_dump() for event in trace] == [event.model_dump() for event in events]
+    assert trace[-1].event_type == "run_end"
+    assert [event.event_type for event in trace.events(6, 8)] == ["edge_taken", "edge_taken"]
+    assert trace.timestamp(3) == 3.0
+    assert trace.node_ids == ["Fetch", "Parse"]
+    with pytest.raises(IndexError):
+        trace[len(events)]
+
+
+def test_run_trace_columns_copy_while_live_and_are_zero_copy_once_sealed() -> None:
+    trace = RunTrace("run")
+    for event in _events():
+        trace.append(event)
+
+    with trace.columns(5, 9) as live:
+        assert live.timestamps.obj is not trace.timestamps
+        assert list(live.seqs) == [6, 7, 8, 9]
+        assert trace.append(RunEndEvent(run_id="run", event_type="run_end")) == 11
+
+    trace.seal()
+    with pytest.raises(RuntimeError):
+        trace.append(RunEndEvent(run_id="run", event_type="run_end"))
+    with trace.columns(5, 9) as columns:
+        assert [EVENT_TYPES[code] for code in columns.kinds] == ["node_end", "edge_taken", "edge_taken", "error"]
+        assert list(columns.seqs) == [6, 7, 8, 9]
+        assert list(columns.nodes) == [0, 0, 1, NO_NODE]
+        assert list(columns.targets) == [NO_NODE, 1, NO_NODE, NO_NODE]
+        assert columns.timestamps.obj is trace.timestamps
+
+
+def test_run_trace_is_compact_for_node_and_edge_events() -> None:
+    trace = RunTrace("run")
+    for index in range(10_000):
+        trace.append(NodeStartEvent(run_id="run", event_type="node_start", node_id=f"Node{index % 50}"))
+
+    assert trace.nbytes < 40 * len(trace)
+
+
+def test_run_trace_counts_payloads_into_nbytes_as_they_are_appended() -> None:
+    trace = RunTrace("run")
+    trace.append(NodeStartEvent(run_id="run", event_type="node_start", node_id="Fetch"))
+    before = trace.nbytes
+    trace.append(
+        ToolCallEvent(
+            run_id="run",
+            event_type="tool_call",
+            node_id="Fetch",
+            tool_name="lookup",
+            call_id="call-1",
+            arguments={"query": "x" * 10_000},
+        )
+    )
+
+    assert trace.nbytes > before + 10_000
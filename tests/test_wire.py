@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+from pydantic_graph_studio.schemas import (
+    EdgeTakenEvent,
+    Event,
+    NodeEndEvent,
+    NodeStartEvent,
+    RunEndEvent,
+    ToolCallEvent,
+)
+from pydantic_graph_studio.wire import (
+    WIRE_LENGTH,
+    WIRE_RECORD,
+    CompactDecoder,
+    CompactEncoder,
+    WireEncoder,
+    decode_records,
+)
+
+NODE_IDS = ["Fetch", "Parse", "Store"]
+
+
+def _events() -> list[Event]:
+    return [
+        NodeStartEvent(run_id="run", event_type="node_start", node_id="Fetch"),
+        NodeEndEvent(run_id="run", event_type="node_end", node_id="Fetch"),
+        EdgeTakenEvent(run_id="run", event_type="edge_taken", source_node_id="Fetch", target_node_id="Parse"),
+        EdgeTakenEvent(run_id="run", event_type="edge_taken", source_node_id="Parse"),
+        ToolCallEvent(
+            run_id="run",
+            event_type="tool_call",
+            node_id="Parse",
+            tool_name="lookup",
+            call_id="call-1",
+            arguments={"query": "x"},
+        ),
+        NodeStartEvent(run_id="run", event_type="node_start", node_id="Unlisted"),
+        RunEndEvent(run_id="run", event_type="run_end"),
+    ]
+
+
+def test_wire_records_round_trip() -> None:
+    encoder = WireEncoder(NODE_IDS)
+    events = _events()
+    data = encoder.encode_batch(3, 10, events)
+
+    decoded = decode_records(data, NODE_IDS, {3: "run"})
+    assert [(channel, seq) for channel, seq, _event in decoded] == [(3, seq) for seq in range(10, 17)]
+    assert [event for _channel, _seq, event in decoded] == events
+
+
+def test_node_and_edge_events_are_fixed_size_records() -> None:
+    encoder = WireEncoder(NODE_IDS)
+    events = _events()
+    fixed = WIRE_LENGTH.size + WIRE_RECORD.size
+    assert len(encoder.encode(0, 1, events[0])) == fixed
+    assert len(encoder.encode(0, 3, events[2])) == fixed
+    assert len(encoder.encode(0, 7, events[6])) == fixed
+    assert len(encoder.encode(0, 5, events[4])) > fixed
+    assert len(encoder.encode(0, 6, events[5])) > fixed
+
+
+def test_compact_frames_round_trip_and_extend_the_dictionary() -> None:
+    encoder = CompactEncoder("run", NODE_IDS)
+    decoder = CompactDecoder()
+    assert decoder.decode(encoder.dictionary()) is None
+
+    decoded: list[Event] = []
+    frames: list[dict[str, object]] = []
+    for event in _events():
+        for frame in encoder.encode(event):
+            frames.append(frame)
+            result = decoder.decode(frame)
+            if result is not None:
+                decoded.append(result)
+
+    assert decoded == _events()
+    assert frames[0] == {"e": 0, "n": 0}
+    assert frames[2] == {"e": 2, "n": 0, "t": 1}
+    assert frames[4] == {"e": 4, "n": 1, "tn": "lookup", "c": "call-1", "a": {"query": "x"}}
+    assert frames[5] == {"d": {"o": 3, "n": ["Unlisted"]}}
+    assert decoder.node_ids == [*NODE_IDS, "Unlisted"]